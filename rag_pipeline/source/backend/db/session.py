@@ -1,7 +1,11 @@
 """Database engine and session dependency helpers."""
 import os
-from collections.abc import Generator
+from collections.abc import Generator, AsyncGenerator
 from sqlmodel import Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from project_settings import DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT
 
 engine = create_engine(
     os.environ["DATABASE_URL"],
@@ -10,11 +14,30 @@ engine = create_engine(
 )
 
 
+def to_async_database_url(url: str) -> str:
+    """Swap the sync Postgres driver of ``url`` for ``asyncpg``."""
+    scheme, rest = url.split("://", 1)
+    if scheme in ("postgres", "postgresql") or scheme.startswith("postgresql+"):
+        scheme = "postgresql+asyncpg"
+    return f"{scheme}://{rest}"
+
+
+async_engine = create_async_engine(
+    to_async_database_url(os.environ["DATABASE_URL"]),
+    echo=False,
+    pool_pre_ping=True,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+)
+
+
 def get_db() -> Generator[Session, None, None]:
     """Provide a database session for FastAPI dependencies.
     
     This dependency is a sync generator. In async FastAPI endpoints, it is
     executed in the threadpool, and the session is closed in ``finally``.
+    Use it only for endpoints whose work runs in a worker thread anyway.
     
     :yield: Active SQLModel ``Session`` instance for the current request."""
     db = Session(engine)
@@ -22,3 +45,14 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Provide an async database session for FastAPI dependencies.
+
+    Queries run on the event loop through ``asyncpg`` and do not take a
+    thread from the default threadpool.
+
+    :yield: Active SQLModel ``AsyncSession`` instance for the current request."""
+    async with AsyncSession(async_engine, expire_on_commit=False) as db:
+        yield db
@@ -6,20 +6,20 @@ from jwt.exceptions import InvalidTokenError
 from fastapi import Depends
 from fastapi.security import OAuth2PasswordBearer
 from pydantic import ValidationError
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from services.security import SECRET_KEY, ALGORITHM
 from models.schemas.auth import DecodedToken
 from models.orm import User
-from db.session import get_db
+from db.session import get_async_db
 import routes.helpers.response_constants as rc
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 
-def get_current_user_from_token(
-    db: Annotated[Session, Depends(get_db)],
+async def get_current_user_from_token(
+    db: Annotated[AsyncSession, Depends(get_async_db)],
     token: Annotated[str, Depends(oauth2_scheme)],
 ) -> User:
     user_id = None
@@ -31,7 +31,7 @@ def get_current_user_from_token(
         rc.ERR_401_INVALID_TOKEN.raise_exception()
 
     if user_id:
-        user = db.get(User, user_id)
+        user = await db.get(User, user_id)
 
     if not user:
         rc.ERR_401_INVALID_TOKEN.raise_exception()
@@ -0,0 +1,138 @@
+from typing import Any, Iterable, Iterator, Mapping, NamedTuple
+from time import perf_counter
+import threading
+import logging
+
+from aiobreaker import CircuitBreakerError
+from haystack import Document
+
+from logging_setup import log_extra
+from services.common import count_tokens
+from project_settings import (
+    EMBEDDING_BATCH_SIZE,
+    EMBEDDING_TOKEN_BUDGET,
+    EMBEDDING_MIN_TOKEN_BUDGET,
+    EMBEDDING_TARGET_LATENCY,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBatch(NamedTuple):
+    documents: list[Document]
+    tokens: int
+
+
+class TokenBudgetBatcher:
+    """
+    Pack chunks into embedder requests by token count, not by chunk count.
+
+    A request holds chunks until the next one would exceed the token
+    budget or ``max_batch_size`` chunks; a chunk over the budget goes
+    alone. The budget halves after a failed or slow request and grows
+    back by a quarter after a fast, full one, staying between
+    ``min_token_budget`` and ``max_token_budget``.
+    """
+
+    def __init__(self,
+                 max_token_budget: int = EMBEDDING_TOKEN_BUDGET,
+                 min_token_budget: int = EMBEDDING_MIN_TOKEN_BUDGET,
+                 max_batch_size: int = EMBEDDING_BATCH_SIZE,
+                 target_latency: float = EMBEDDING_TARGET_LATENCY,
+                 ):
+        self.max_token_budget = max_token_budget
+        self.min_token_budget = min(min_token_budget, max_token_budget)
+        self.max_batch_size = max_batch_size
+        self.target_latency = target_latency
+        self.token_budget = max_token_budget
+        self._lock = threading.Lock()
+
+    def batches(self, documents: Iterable[Document]) -> Iterator[TokenBatch]:
+        """
+        Yield batches lazily, so each one is packed with the current budget.
+        """
+        batch: list[Document] = []
+        tokens = 0
+        for doc in documents:
+            doc_tokens = count_tokens(doc.content or "")
+            if batch and (tokens + doc_tokens > self.token_budget
+                          or len(batch) >= self.max_batch_size):
+                yield TokenBatch(batch, tokens)
+                batch, tokens = [], 0
+            batch.append(doc)
+            tokens += doc_tokens
+
+        if batch:
+            yield TokenBatch(batch, tokens)
+
+    def record(self, tokens: int, latency: float, failed: bool = False) -> None:
+        """
+        Tune the budget from the outcome of one embedder request.
+        """
+        with self._lock:
+            budget = self.token_budget
+            if failed or latency > self.target_latency:
+                budget = max(self.min_token_budget, budget // 2)
+            elif latency < self.target_latency / 2 and tokens >= budget * 0.8:
+                budget = min(self.max_token_budget, budget + budget // 4)
+
+            if budget == self.token_budget:
+                return
+            self.token_budget = budget
+
+        logger.info(
+            "Embedding token budget changed to %s",
+            budget,
+            extra=log_extra(
+                event="embedding.token_budget.changed",
+                token_budget=budget,
+                tokens=tokens,
+                latency=round(latency, 3),
+                failed=failed,
+            ),
+        )
+
+
+DOCS_EMBEDDING_BATCHER = TokenBudgetBatcher()
+
+
+class LatencyReportingEmbedder:
+    """
+    Document embedder component that reports each request to the batcher.
+
+    Requests are packed by the caller (``embed_chunks_with_progress``), so
+    the documents of one run go to the backend as they are.
+    """
+
+    def __init__(self,
+                 embedder: Any,
+                 batcher: TokenBudgetBatcher = DOCS_EMBEDDING_BATCHER,
+                 ):
+        self._embedder = embedder
+        self._batcher = batcher
+
+        if hasattr(embedder, "__haystack_input__"):
+            self.__haystack_input__ = embedder.__haystack_input__
+        if hasattr(embedder, "__haystack_output__"):
+            self.__haystack_output__ = embedder.__haystack_output__
+
+    def run(self, documents: list[Document], **kwargs: Any) -> Mapping[str, Any]:
+        """
+        Embed the documents in one request, reporting its latency to the batcher.
+        """
+        tokens = sum(count_tokens(doc.content or "") for doc in documents)
+        start = perf_counter()
+        try:
+            result = self._embedder.run(documents=documents, **kwargs)
+        except CircuitBreakerError:
+            # The breaker rejected the call; the backend was not asked.
+            raise
+        except Exception:
+            self._batcher.record(tokens, perf_counter() - start, failed=True)
+            raise
+
+        self._batcher.record(tokens, perf_counter() - start)
+        return result
+
+    def __getattr__(self, item: str) -> Any:
+        return getattr(self._embedder, item)
@@ -0,0 +1,41 @@
+from haystack import Document
+
+from project_settings import CONTEXT_WINDOW
+
+
+def annotate_context_windows(chunks: list[Document],
+                             context_window: int = CONTEXT_WINDOW,
+                             ) -> list[Document]:
+    """
+    Store each chunk's neighbour window in its meta.
+
+    ``window_chunks`` holds the contents of splits ``window_first`` onwards,
+    so ContextExtractor can build contexts without reading the store. The
+    window never crosses a source document, so re-vectorizing a document
+    rebuilds only its own windows.
+
+    :param chunks: Chunks produced by DocumentSplitter.
+    :param context_window: Number of neighbours on each side.
+    """
+    by_source: dict[str, dict[int, str]] = {}
+    for chunk in chunks:
+        if "source_id" in chunk.meta and "split_id" in chunk.meta:
+            by_source.setdefault(chunk.meta["source_id"], {})[chunk.meta["split_id"]] = chunk.content or ""
+
+    for chunk in chunks:
+        contents = by_source.get(chunk.meta.get("source_id", ""))
+        if not contents or "split_id" not in chunk.meta:
+            continue
+
+        split_id = chunk.meta["split_id"]
+        first = last = split_id
+        while first > max(0, split_id - context_window) and first - 1 in contents:
+            first -= 1
+        while last < split_id + context_window and last + 1 in contents:
+            last += 1
+
+        chunk.meta["window_size"] = context_window
+        chunk.meta["window_first"] = first
+        chunk.meta["window_chunks"] = [contents[i] for i in range(first, last + 1)]
+
+    return chunks
@@ -0,0 +1,264 @@
+from typing import Any, Mapping, Optional, Sequence, cast
+from collections import OrderedDict
+from hashlib import sha256
+import threading
+import logging
+import json
+
+from haystack import Document
+from redis.exceptions import RedisError
+
+from logging_setup import log_extra
+from services.storage.redis_pools import get_sync_redis
+from project_settings import (
+    QUERY_EMBEDDING_CACHE_SIZE,
+    QUERY_EMBEDDING_CACHE_TTL,
+    DOC_EMBEDDING_CACHE_ENABLED,
+    DOC_EMBEDDING_CACHE_TTL,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class QueryEmbeddingCache:
+    """In-process LRU of query embeddings backed by Redis with TTL."""
+
+    def __init__(self,
+                 max_items: int = QUERY_EMBEDDING_CACHE_SIZE,
+                 ttl_seconds: int = QUERY_EMBEDDING_CACHE_TTL,
+                 key_prefix: str = "query_embedding",
+                 ):
+        self.max_items = max_items
+        self.ttl = ttl_seconds
+        self.prefix = key_prefix
+        self._items: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    def key(self, model: str, text: str) -> str:
+        digest = sha256(text.encode("utf-8")).hexdigest()
+        return f"{self.prefix}:{model}:{digest}"
+
+    def get(self, key: str) -> Optional[dict]:
+        """
+        Get cached embedder output, promoting Redis hits to the LRU.
+        """
+        with self._lock:
+            result = self._items.get(key)
+            if result is not None:
+                self._items.move_to_end(key)
+                self.local_hits += 1
+                return result
+
+        try:
+            raw = cast(Optional[str], get_sync_redis().get(key))
+        except RedisError as e:
+            self._log_redis_error(e)
+            raw = None
+
+        if raw is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        result = json.loads(raw)
+        with self._lock:
+            self.redis_hits += 1
+            self._remember(key, result)
+        return result
+
+    def set(self, key: str, result: dict) -> None:
+        """
+        Store embedder output in the LRU and in Redis.
+        """
+        with self._lock:
+            self._remember(key, result)
+
+        try:
+            get_sync_redis().set(key, json.dumps(result), ex=self.ttl)
+        except RedisError as e:
+            self._log_redis_error(e)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "size": len(self._items),
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def _remember(self, key: str, result: dict) -> None:
+        self._items[key] = result
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_items:
+            self._items.popitem(last=False)
+
+    def _log_redis_error(self, e: RedisError) -> None:
+        logger.warning(
+            f"Query embedding cache unavailable: {e}",
+            extra=log_extra(event="embedding_cache.redis_unavailable"),
+        )
+
+
+QUERY_EMBEDDING_CACHE = QueryEmbeddingCache()
+
+
+class CachedTextEmbedder:
+    """Text embedder component that skips the embedding call for repeated queries."""
+
+    def __init__(self,
+                 embedder: Any,
+                 model: str,
+                 cache: QueryEmbeddingCache = QUERY_EMBEDDING_CACHE,
+                 ):
+        self._embedder = embedder
+        self._model = model
+        self._cache = cache
+
+        if hasattr(embedder, "__haystack_input__"):
+            self.__haystack_input__ = embedder.__haystack_input__
+        if hasattr(embedder, "__haystack_output__"):
+            self.__haystack_output__ = embedder.__haystack_output__
+
+    def run(self, text: str, **kwargs: Any) -> Mapping[str, Any]:
+        """
+        Execute run.
+        """
+        key = self._cache.key(self._model, text)
+
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        result = self._embedder.run(text=text, **kwargs)
+        self._cache.set(key, {"embedding": result["embedding"], "meta": result.get("meta", {})})
+        return result
+
+    def __getattr__(self, item: str) -> Any:
+        return getattr(self._embedder, item)
+
+
+class DocumentEmbeddingStore:
+    """
+    Content-addressed chunk embeddings in Redis, shared by all documents.
+
+    Keys hash the model together with the chunk text, so identical chunks
+    are embedded once per model and switching models back and forth
+    finds the vectors of the previous one.
+    """
+
+    def __init__(self,
+                 enabled: bool = DOC_EMBEDDING_CACHE_ENABLED,
+                 ttl_seconds: int = DOC_EMBEDDING_CACHE_TTL,
+                 key_prefix: str = "doc_embedding",
+                 ):
+        self.enabled = enabled
+        self.ttl = ttl_seconds or None
+        self.prefix = key_prefix
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, model: str, text: str) -> str:
+        digest = sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+        return f"{self.prefix}:{digest}"
+
+    def get_many(self, keys: Sequence[str]) -> list[Optional[list[float]]]:
+        """
+        Get stored embeddings, ``None`` for the missing ones.
+        """
+        if not self.enabled or not keys:
+            return [None] * len(keys)
+
+        try:
+            raw = cast(list[Optional[str]], get_sync_redis().mget(keys))
+        except RedisError as e:
+            self._log_redis_error(e)
+            raw = [None] * len(keys)
+
+        embeddings = [json.loads(r) if r is not None else None for r in raw]
+        hits = sum(e is not None for e in embeddings)
+        with self._lock:
+            self.hits += hits
+            self.misses += len(keys) - hits
+        return embeddings
+
+    def set_many(self, embeddings: Mapping[str, list[float]]) -> None:
+        if not self.enabled or not embeddings:
+            return
+
+        try:
+            pipe = get_sync_redis().pipeline(transaction=False)
+            for key, embedding in embeddings.items():
+                pipe.set(key, json.dumps(embedding), ex=self.ttl)
+            pipe.execute()
+        except RedisError as e:
+            self._log_redis_error(e)
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+    def _log_redis_error(self, e: RedisError) -> None:
+        logger.warning(
+            f"Document embedding store unavailable: {e}",
+            extra=log_extra(event="doc_embedding_store.redis_unavailable"),
+        )
+
+
+DOC_EMBEDDING_STORE = DocumentEmbeddingStore()
+
+
+class CachedDocumentEmbedder:
+    """Document embedder component that embeds each distinct chunk text once."""
+
+    def __init__(self,
+                 embedder: Any,
+                 model: str,
+                 store: DocumentEmbeddingStore = DOC_EMBEDDING_STORE,
+                 ):
+        self._embedder = embedder
+        self._model = model
+        self._store = store
+
+        if hasattr(embedder, "__haystack_input__"):
+            self.__haystack_input__ = embedder.__haystack_input__
+        if hasattr(embedder, "__haystack_output__"):
+            self.__haystack_output__ = embedder.__haystack_output__
+
+    def run(self, documents: list[Document], **kwargs: Any) -> Mapping[str, Any]:
+        """
+        Embed the documents whose text is not in the store yet.
+        """
+        keys = [self._store.key(self._model, doc.content or "") for doc in documents]
+        stored = self._store.get_many(keys)
+
+        # Identical texts in one batch are embedded once too.
+        to_embed: dict[str, Document] = {}
+        for key, doc, embedding in zip(keys, documents, stored):
+            if embedding is None:
+                to_embed.setdefault(key, doc)
+
+        meta: dict[str, Any] = {}
+        computed: dict[str, list[float]] = {}
+        if to_embed:
+            result = self._embedder.run(documents=list(to_embed.values()), **kwargs)
+            meta = result.get("meta", {})
+            computed = {
+                key: doc.embedding
+                for key, doc in zip(to_embed, result["documents"])
+            }
+            self._store.set_many(computed)
+
+        for key, doc, embedding in zip(keys, documents, stored):
+            doc.embedding = embedding if embedding is not None else computed[key]
+
+        return {"documents": documents, "meta": meta}
+
+    def __getattr__(self, item: str) -> Any:
+        return getattr(self._embedder, item)
@@ -11,38 +11,8 @@ from haystack_integrations.document_stores.pgvector import PgvectorDocumentStore
 
 from project_settings import USE_OLLAMA
 from haystack_pipelines.helpers.common import SafeComponent, DOCS_EMBEDDING_BREAKER
-
-
-def indexing_pipeline(document_store: PgvectorDocumentStore):
-    """
-    Execute indexing pipeline.
-
-    :param document_store: Configured Haystack document store.
-    """
-
-    text_splitter = DocumentSplitter()
-    docs_embedder = OllamaDocumentEmbedder(
-        model="nomic-embed-text",
-        url=os.environ['OLLAMA_BASE_URL'],
-    ) if USE_OLLAMA else CohereDocumentEmbedder(
-        model="embed-multilingual-v3.0",
-        api_key=Secret.from_env_var("COHERE_API_KEY")
-    )
-
-    protected_embedder = SafeComponent(docs_embedder, DOCS_EMBEDDING_BREAKER)
-
-    text_writer = DocumentWriter(
-        document_store=document_store, policy=DuplicatePolicy.SKIP)
-
-    pipeline = Pipeline()
-    pipeline.add_component("splitter", text_splitter)
-    pipeline.add_component("embedder", protected_embedder)
-    pipeline.add_component("writer", text_writer)
-
-    pipeline.connect("splitter", "embedder")
-    pipeline.connect("embedder", "writer")
-
-    return pipeline
+from haystack_pipelines.helpers.embedding_cache import CachedDocumentEmbedder
+from haystack_pipelines.helpers.batching import LatencyReportingEmbedder
 
 
 def splitting_pipeline() -> Pipeline:
@@ -71,10 +41,13 @@ def vectorizing_pipeline(document_store: PgvectorDocumentStore) -> Pipeline:
         api_key=Secret.from_env_var("COHERE_API_KEY")
     )
 
-    protected_embedder = SafeComponent(docs_embedder, DOCS_EMBEDDING_BREAKER)
+    protected_embedder = CachedDocumentEmbedder(
+        LatencyReportingEmbedder(SafeComponent(docs_embedder, DOCS_EMBEDDING_BREAKER)),
+        model=docs_embedder.model,
+    )
 
     text_writer = DocumentWriter(
-        document_store=document_store, policy=DuplicatePolicy.SKIP)
+        document_store=document_store, policy=DuplicatePolicy.OVERWRITE)
 
     pipeline = Pipeline()
     pipeline.add_component("embedder", protected_embedder)
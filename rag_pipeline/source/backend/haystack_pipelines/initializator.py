@@ -1,6 +1,6 @@
 from typing import cast
 from haystack_integrations.document_stores.pgvector import PgvectorDocumentStore
-from .indexing_pipeline import indexing_pipeline, vectorizing_pipeline, splitting_pipeline
+from .indexing_pipeline import vectorizing_pipeline, splitting_pipeline
 from .search_pipeline import search_pipeline
 from .one_request_chat import one_request_chat_pipeline
 from .lang_detector import lang_detection
@@ -31,7 +31,6 @@ DOCUMENT_STORE = PgvectorDocumentStore(
 
 
 # Initialize the document store used in this flow.
-INDEXING_PIPELINE = indexing_pipeline(DOCUMENT_STORE)
 SPLIT_PIPELINE = splitting_pipeline()
 EMBEDDING_PIPELINE = vectorizing_pipeline(DOCUMENT_STORE)
 SEARCH_PIPELINE = search_pipeline(DOCUMENT_STORE)
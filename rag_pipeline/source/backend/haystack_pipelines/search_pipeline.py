@@ -10,6 +10,7 @@ from haystack_integrations.document_stores.pgvector import PgvectorDocumentStore
 from haystack_integrations.components.embedders.cohere import CohereTextEmbedder
 from project_settings import USE_OLLAMA
 from haystack_pipelines.helpers.common import SafeComponent, TEXT_EMBEDDING_BREAKER
+from haystack_pipelines.helpers.embedding_cache import CachedTextEmbedder
 
 
 def search_pipeline(document_store: PgvectorDocumentStore):
@@ -26,7 +27,10 @@ def search_pipeline(document_store: PgvectorDocumentStore):
         api_key=Secret.from_env_var("COHERE_API_KEY")
     )
 
-    safe_embedder = SafeComponent(query_embedder, TEXT_EMBEDDING_BREAKER)
+    safe_embedder = CachedTextEmbedder(
+        SafeComponent(query_embedder, TEXT_EMBEDDING_BREAKER),
+        model=query_embedder.model,
+    )
 
     retriever = PgvectorEmbeddingRetriever(document_store=document_store)
     pipeline = Pipeline()
@@ -1,5 +1,5 @@
 import os
-from typing import cast
+from typing import cast, Optional
 import json
 
 from haystack import Pipeline, Document, component
@@ -10,8 +10,9 @@ from haystack_integrations.components.embedders.ollama import OllamaTextEmbedder
 from haystack_integrations.components.embedders.cohere import CohereTextEmbedder
 from haystack_integrations.components.retrievers.pgvector import PgvectorEmbeddingRetriever
 from haystack_pipelines.helpers.common import serialize_chat_messages, extract_json, pipeline_constructor
-from project_settings import USE_OLLAMA
+from project_settings import USE_OLLAMA, CONTEXT_WINDOW
 from haystack_pipelines.helpers.common import SafeComponent, TEXT_EMBEDDING_BREAKER
+from haystack_pipelines.helpers.embedding_cache import CachedTextEmbedder
 import haystack_pipelines.helpers.templates as tmpl
 
 
@@ -82,50 +83,149 @@ def search_pipeline(document_store: PgvectorDocumentStore):
     @component
     class ContextExtractor:
 
-        def _get_context(self, given_chunk: Document, context_window: int) -> str:
+        def _get_windows(self,
+                         chunks: list[Document],
+                         context_window: int,
+                         ) -> list[tuple[str, int, int]]:
             """
-            Execute get context.
+            Get ``(source_id, first_split_id, last_split_id)`` windows.
+
+            Windows of hits from the same source that overlap or touch are
+            merged, and each window keeps the rank of its best hit.
+            """
+            ranges: dict[str, list[tuple[int, int, int]]] = {}
+            for rank, chunk in enumerate(chunks):
+                split_id = chunk.meta["split_id"]
+                ranges.setdefault(chunk.meta["source_id"], []).append(
+                    (max(0, split_id - context_window), split_id + context_window, rank)
+                )
+
+            windows: list[tuple[int, str, int, int]] = []
+            for source_id, source_ranges in ranges.items():
+                source_ranges.sort()
+                first, last, best_rank = source_ranges[0]
+                for start, end, rank in source_ranges[1:]:
+                    if start <= last + 1:
+                        last = max(last, end)
+                        best_rank = min(best_rank, rank)
+                        continue
+                    windows.append((best_rank, source_id, first, last))
+                    first, last, best_rank = start, end, rank
+                windows.append((best_rank, source_id, first, last))
+
+            return [window[1:] for window in sorted(windows)]
+
+        def _get_precomputed(self,
+                             chunks: list[Document],
+                             context_window: int,
+                             ) -> tuple[dict[tuple[str, int], str], set[tuple[str, int]]]:
+            """
+            Get neighbour contents stored in chunk meta at indexing time.
+
+            :return: Contents by ``(source_id, split_id)`` and the splits
+                whose presence or absence those windows already settle.
+            """
+            contents: dict[tuple[str, int], str] = {}
+            covered: set[tuple[str, int]] = set()
+
+            for chunk in chunks:
+                if chunk.meta.get("window_size") != context_window:
+                    continue
+
+                source_id, split_id = chunk.meta["source_id"], chunk.meta["split_id"]
+                covered.update(
+                    (source_id, i)
+                    for i in range(max(0, split_id - context_window), split_id + context_window + 1)
+                )
+                for offset, content in enumerate(chunk.meta["window_chunks"]):
+                    contents[(source_id, chunk.meta["window_first"] + offset)] = content
+
+            return contents, covered
+
+        def _load_windows(self,
+                          windows: list[tuple[str, int, int]],
+                          ) -> dict[tuple[str, int], str]:
+            """
+            Load every chunk of every window with one document store query.
             """
-            source_id = given_chunk.meta['source_id']
             filters = {
-                "operator": "AND",
+                "operator": "OR",
                 "conditions": [
-                    {"field": "meta.source_id", "operator": "==", "value": source_id}
+                    {
+                        "operator": "AND",
+                        "conditions": [
+                            {"field": "meta.source_id", "operator": "==", "value": source_id},
+                            {"field": "meta.split_id", "operator": ">=", "value": first},
+                            {"field": "meta.split_id", "operator": "<=", "value": last},
+                        ]
+                    }
+                    for source_id, first, last in windows
                 ]
             }
 
-            all_related_chunks = sorted(
-                document_store.filter_documents(filters=filters),
-                key=lambda doc: doc.meta.get("split_idx_start", 0)
-            )
-
-            all_related_text_chunks = cast(list[str], [
-                chunk.content for chunk in all_related_chunks
-            ])
-
-            given_chunk_idx = (
-                0 if given_chunk.content is None else
-                all_related_text_chunks.index(given_chunk.content))
-
-            start_idx = max(0, given_chunk_idx - context_window)
-            end_idx = min(len(all_related_text_chunks),
-                          given_chunk_idx + context_window + 1)
-
-            context = all_related_text_chunks[start_idx:end_idx]
-            return ''.join(context) if context else ''
+            return {
+                (doc.meta["source_id"], doc.meta["split_id"]): doc.content or ""
+                for doc in document_store.filter_documents(filters=filters)
+            }
 
-        @component.output_types(contexts=list[str])
-        def run(self, chunks: list[Document], context_window: int = 2):
-            contexts = []
+        @component.output_types(
+            contexts=list[str],
+            chunk_ids=list[str],
+            document_ids=list[str],
+            query_embedding=Optional[list[float]],
+        )
+        def run(self,
+                chunks: list[Document],
+                context_window: int = CONTEXT_WINDOW,
+                query_embedding: Optional[list[float]] = None,
+                ):
             chunks_sorted = sorted(
                 chunks,
                 key=lambda x: x.score if x.score else 0.0, reverse=True
             )
-            for given_chunk in chunks_sorted:
-                context = self._get_context(given_chunk, context_window)
-                contexts.append(context)
+            # Passed through for callers that cache by the retrieved chunks.
+            sources = {
+                "chunk_ids": [chunk.id for chunk in chunks_sorted],
+                "document_ids": sorted({
+                    str(chunk.meta["parent_doc_id"])
+                    for chunk in chunks_sorted
+                    if chunk.meta.get("parent_doc_id") is not None
+                }),
+                "query_embedding": query_embedding,
+            }
 
-            return {"contexts": contexts}
+            # Chunks indexed without split ordinals are used as they are.
+            located: list[Document] = []
+            contexts: list[str] = []
+            for chunk in chunks_sorted:
+                if "source_id" in chunk.meta and "split_id" in chunk.meta:
+                    located.append(chunk)
+                else:
+                    contexts.append(chunk.content or "")
+
+            windows = self._get_windows(located, context_window)
+            if not windows:
+                return {"contexts": contexts, **sources}
+
+            contents, covered = self._get_precomputed(located, context_window)
+            windows_to_load = [
+                (source_id, first, last)
+                for source_id, first, last in windows
+                if any((source_id, i) not in covered for i in range(first, last + 1))
+            ]
+            if windows_to_load:
+                contents.update(self._load_windows(windows_to_load))
+
+            window_contexts = [
+                "".join(
+                    contents[(source_id, split_id)]
+                    for split_id in range(first, last + 1)
+                    if (source_id, split_id) in contents
+                )
+                for source_id, first, last in windows
+            ]
+
+            return {"contexts": window_contexts + contexts, **sources}
 
     query_embedder = OllamaTextEmbedder(
         model="nomic-embed-text",
@@ -135,7 +235,10 @@ def search_pipeline(document_store: PgvectorDocumentStore):
         api_key=Secret.from_env_var("COHERE_API_KEY")
     )
 
-    safe_embedder = SafeComponent(query_embedder, TEXT_EMBEDDING_BREAKER)
+    safe_embedder = CachedTextEmbedder(
+        SafeComponent(query_embedder, TEXT_EMBEDDING_BREAKER),
+        model=query_embedder.model,
+    )
 
     retriever = PgvectorEmbeddingRetriever(document_store=document_store)
     pipeline = Pipeline()
@@ -146,6 +249,7 @@ def search_pipeline(document_store: PgvectorDocumentStore):
 
     pipeline.connect("query_embedder.embedding", "retriever.query_embedding")
     pipeline.connect("retriever.documents", "context_extractor.chunks")
+    pipeline.connect("query_embedder.embedding", "context_extractor.query_embedding")
     return pipeline
 
 
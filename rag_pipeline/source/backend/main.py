@@ -1,13 +1,21 @@
 from typing import AsyncGenerator, Any
 from contextlib import asynccontextmanager
+from dataclasses import asdict
 
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from logging_setup import setup_logging
 from dependencies.chat_websocket import MultipleConnectionManager
-from db.session import engine
+from db.session import engine, async_engine
+from services.storage.redis_pools import (
+    open_async_redis_pool,
+    close_async_redis_pool,
+    get_async_redis_pool_stats,
+)
+from services.executors import ExecutorSaturatedError, get_executor_stats, shutdown_executors
 from db.init_db import init_database
 from routes import user_auth, user_docs_mgmt, user_self_mgmt, chat
 from haystack_pipelines import initializator as __  # noqa: F401
@@ -34,8 +42,12 @@ origins = [
 async def lifespan(_: FastAPI) -> AsyncGenerator[None, Any]:
     init_database()
     app.state.connection_manager = MultipleConnectionManager()
+    open_async_redis_pool()
     yield
+    await close_async_redis_pool()
+    shutdown_executors()
     engine.dispose()
+    await async_engine.dispose()
 
 
 app = FastAPI(
@@ -60,10 +72,31 @@ app.include_router(chat.router, prefix="/api/v1")
 setup_logging()
 
 
+@app.exception_handler(ExecutorSaturatedError)
+async def executor_saturated(_: Request, __: ExecutorSaturatedError) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Server is busy, try again later"},
+        headers={"Retry-After": "1"},
+    )
+
+
 @app.get("/")
 def root() -> dict[str, str]:
     return {"message": "Hello World"}
 
 
+@app.get("/stats")
+async def stats() -> dict[str, Any]:
+    pool_stats = get_async_redis_pool_stats()
+    return {
+        "redis_pool": None if pool_stats is None else {
+            **asdict(pool_stats),
+            "saturation_pct": pool_stats.saturation_pct,
+        },
+        "executors": [asdict(executor_stats) for executor_stats in get_executor_stats()],
+    }
+
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -3,13 +3,15 @@ from typing import Annotated
 from fastapi import Depends, Query
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from db.session import get_db
+from db.session import get_db, get_async_db
 from models.orm.user import User
 from dependencies.auth import get_current_user_from_token
 from dependencies.documents import validate_file_type_txt
 
-SessionDep = Annotated[Session, Depends(get_db)]
+SessionDep = Annotated[AsyncSession, Depends(get_async_db)]
+SyncSessionDep = Annotated[Session, Depends(get_db)]  # For work done in worker threads
 UserDep = Annotated[User, Depends(get_current_user_from_token)]
 FileTypeTxtDep = Annotated[str, Depends(validate_file_type_txt)]
 FormLoginData = Annotated[OAuth2PasswordRequestForm, Depends()]
@@ -22,6 +22,39 @@ try:
     DEFAULT_TTL_SECONDS = int(config["redis"]["ttl_sec"])
     DEFAULT_TTL_BUFFER_SECONDS = int(config["redis"]["ttl_buffer_sec"])
     DEFAULT_TTL_LOCK_SECONDS = int(config["redis"]["ttl_lock_sec"])
+    REDIS_MAX_CONNECTIONS = int(config["redis"]["max_connections"])
+    REDIS_WORKER_MAX_CONNECTIONS = int(config["redis"]["worker_max_connections"])
+    REDIS_POOL_TIMEOUT = int(config["redis"]["pool_timeout_sec"])
+    REDIS_POOL_SATURATION_WARN_PCT = int(config["redis"]["pool_saturation_warn_pct"])
+
+    QUERY_EMBEDDING_CACHE_SIZE = int(config["embeddings"]["query_cache_size"])
+    QUERY_EMBEDDING_CACHE_TTL = int(config["embeddings"]["query_cache_ttl_sec"])
+    DOC_EMBEDDING_CACHE_ENABLED = config["embeddings"]["doc_cache_enabled"] == "1"
+    DOC_EMBEDDING_CACHE_TTL = int(config["embeddings"]["doc_cache_ttl_sec"])
+
+    ANSWER_CACHE_ENABLED = config["answer_cache"]["enabled"] == "1"
+    ANSWER_CACHE_TTL = int(config["answer_cache"]["ttl_sec"])
+    ANSWER_CACHE_SIMILARITY = float(config["answer_cache"]["similarity"])
+    ANSWER_CACHE_MAX_PER_BUCKET = int(config["answer_cache"]["max_per_bucket"])
+
+    CONTEXT_WINDOW = int(config["indexing"]["context_window"])
+    PRECOMPUTE_CONTEXT_WINDOWS = config["indexing"]["precompute_context_windows"] == "1"
+    EMBEDDING_BATCH_SIZE = int(config["indexing"]["embedding_batch_size"])
+    EMBEDDING_CONCURRENCY = int(config["indexing"]["embedding_concurrency"])
+    EMBEDDING_TOKEN_BUDGET = int(config["indexing"]["embedding_token_budget"])
+    EMBEDDING_MIN_TOKEN_BUDGET = int(config["indexing"]["embedding_min_token_budget"])
+    EMBEDDING_TARGET_LATENCY = float(config["indexing"]["embedding_target_latency_sec"])
+
+    DB_POOL_SIZE = int(config["database"]["pool_size"])
+    DB_MAX_OVERFLOW = int(config["database"]["max_overflow"])
+    DB_POOL_TIMEOUT = int(config["database"]["pool_timeout_sec"])
+
+    LLM_EXECUTOR_WORKERS = int(config["executors"]["llm_workers"])
+    LLM_EXECUTOR_MAX_QUEUE = int(config["executors"]["llm_max_queue"])
+    EMBEDDING_EXECUTOR_WORKERS = int(config["executors"]["embedding_workers"])
+    EMBEDDING_EXECUTOR_MAX_QUEUE = int(config["executors"]["embedding_max_queue"])
+    DB_EXECUTOR_WORKERS = int(config["executors"]["db_workers"])
+    DB_EXECUTOR_MAX_QUEUE = int(config["executors"]["db_max_queue"])
 
     CHAT_WINDOW_SIZE = int(config["chat"]["window_size"])  # Initialize `CHAT_WINDOW_SIZE` using `int`.
     MAX_CONNECTIONS_TOTAL = int(config["chat"]["max_connections_total"])
@@ -34,6 +67,13 @@ try:
     MAX_SEND_TIME_BEFORE_RETRY = int(config["chat"]["max_send_time_before_retry"])
     MAX_BUFFERED_OUTGOING_MESSAGES = int(
         config["chat"]["max_buffered_outgoing_messages"])
+    CHAT_DELIVERY_BACKEND = config["chat"]["delivery_backend"]
+    OUTBOUND_STREAM_MAXLEN = int(config["chat"]["outbound_stream_maxlen"])
+    STREAM_LLM_REPLIES = config["chat"]["stream_replies"] == "1"
+    REPEAT_QUERY_DETECTION = config["chat"]["repeat_detection"]
+    REPEAT_QUERY_SIMILARITY = float(config["chat"]["repeat_similarity"])
+    UNIQUE_QUERY_SIMILARITY = float(config["chat"]["unique_similarity"])
+    LOCAL_LANG_CONFIDENCE = float(config["chat"]["local_lang_confidence"])
 except KeyError as exc:
     raise RuntimeError(
         f"Missing required configuration key/section in '{CONFIG_PATH}': {exc}"
@@ -30,9 +30,9 @@ async def get() -> HTMLResponse:
 async def init_chat(db: SessionDep, chat_passport_in: ChatPassportGetOrCreate) -> InitResponsePublic:
     if not chat_passport_in.id:
         user_ref = chat_passport_in.user_ref or f"anon:{uuid.uuid4()}"
-        return service.create_chat_passport(db, user_ref, chat_passport_in)
+        return await service.create_chat_passport(db, user_ref, chat_passport_in)
 
-    validate.check_chat_passport_or_400(db, chat_passport_in.id)
+    await validate.check_chat_passport_or_400(db, chat_passport_in.id)
 
     return InitResponsePublic(
         chat_passport_id=chat_passport_in.id,
@@ -48,7 +48,7 @@ async def websocket_endpoint(
     chat_passport_id: uuid.UUID,
     is_test_mode: bool = False,
 ) -> None:
-    with db:
+    async with db:
         if not await service.is_valid_db_state(db, chat_passport_id):
             await websocket.close(code=1008)
             return
@@ -1,19 +1,19 @@
 """API endpoints for uploading and indexing documents."""
 from typing import cast
-from fastapi import APIRouter, UploadFile, File, BackgroundTasks, Depends
+from fastapi import APIRouter, UploadFile, File, Depends
 
-from params.request_params import FileTypeTxtDep, SessionDep, UserDep, QueryOffset, QueryLimit
+from params.request_params import FileTypeTxtDep, SessionDep, SyncSessionDep, UserDep, QueryOffset, QueryLimit
 from dependencies.auth import get_current_user_from_token
 from models.schemas.document import QueryContext, QueryKeyword, DocumentContentUpdated
 from .validators.file import get_text_from_txt_file_or_400
 from .validators.document import validate_document_by_id_or_404
 import routes.helpers.response_constants as rc
-from services.haystack.docs_indexing import index_doc_with_separator
 from services.haystack.docs_search import search_document_context, search_documents_keyword
 from services.haystack.docs_delete import delete_document
 from services.api.document import update_document_content_in_sql, fetch_docs, get_doc_status
 from services.celery_tasks.helpers.common import run_celery_task
-from services.celery_tasks.indexing_tasks import vectorize_document_with_progress
+from services.celery_tasks.indexing_tasks import vectorize_document_with_progress, index_documents_bulk
+from services.executors import EMBEDDING_EXECUTOR, DB_EXECUTOR
 
 router = APIRouter(
     prefix="/documents",
@@ -32,12 +32,12 @@ router = APIRouter(
     ).openapi,
 )
 async def update_doc(
-    db: SessionDep,
+    db: SyncSessionDep,
     _: UserDep,
     document_id: int,
     updated_doc: DocumentContentUpdated,
 ) -> None:
-    validate_document_by_id_or_404(db, document_id)
+    await DB_EXECUTOR.run(validate_document_by_id_or_404, db, document_id)
 
     is_content_changed = await update_document_content_in_sql(db, document_id, updated_doc)
 
@@ -61,16 +61,19 @@ async def update_doc(
     ).openapi,
 )
 async def upload_file_mult(
-    db: SessionDep,
     current_user: UserDep,
     _: FileTypeTxtDep,
-    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     similarity: float = 0.9,
 ) -> dict:
     text = get_text_from_txt_file_or_400(file)
 
-    background_tasks.add_task(index_doc_with_separator, db, text, similarity, current_user)
+    run_celery_task(
+        index_documents_bulk,
+        long_text=text,
+        similarity=similarity,
+        user_id=current_user.id,
+    )
 
     return rc.OK_200_MESSAGE_INDEXING_STARTED.response
 
@@ -110,8 +113,8 @@ async def fetch_all_docs(
         + rc.OK_200_MESSAGE_DOCUMENT_DELETED
     ).openapi,
 )
-async def search_context(db: SessionDep, _: UserDep, query: QueryContext) -> dict:
-    return search_document_context(db, query)
+async def search_context(db: SyncSessionDep, _: UserDep, query: QueryContext) -> dict:
+    return await EMBEDDING_EXECUTOR.run(search_document_context, db, query)
 
 
 @router.post(
@@ -123,8 +126,8 @@ async def search_context(db: SessionDep, _: UserDep, query: QueryContext) -> dic
         + rc.OK_200_MESSAGE_DOCUMENT_DELETED
     ).openapi,
 )
-async def search_keyword(db: SessionDep, _: UserDep, query: QueryKeyword) -> dict:
-    return cast(dict, search_documents_keyword(db, query))
+async def search_keyword(db: SyncSessionDep, _: UserDep, query: QueryKeyword) -> dict:
+    return cast(dict, await DB_EXECUTOR.run(search_documents_keyword, db, query))
 
 
 @router.post(
@@ -135,6 +138,6 @@ async def search_keyword(db: SessionDep, _: UserDep, query: QueryKeyword) -> dic
         + rc.ERR_401_INVALID_TOKEN
     ).openapi,
 )
-async def delete(db: SessionDep, _: UserDep, doc_id: int) -> dict:
-    delete_document(db, doc_id)
+async def delete(db: SyncSessionDep, _: UserDep, doc_id: int) -> dict:
+    await DB_EXECUTOR.run(delete_document, db, doc_id)
     return rc.OK_200_MESSAGE_DOCUMENT_DELETED.response
@@ -1,12 +1,12 @@
 from sqlmodel import select
 
 from models.orm.document import DocumentDB
-from params.request_params import SessionDep
+from params.request_params import SyncSessionDep
 import routes.helpers.response_constants as rc
 
 
 def validate_document_by_id_or_404(
-    db: SessionDep,
+    db: SyncSessionDep,
     document_id: int,
 ) -> None:
     """
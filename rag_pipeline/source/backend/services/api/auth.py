@@ -1,8 +1,8 @@
 from datetime import timedelta
 from typing import cast
 
-from sqlalchemy.orm import Session
 from sqlalchemy import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from models.orm.user import User
 from models.schemas.auth import Token
@@ -10,9 +10,9 @@ from services.security import create_access_token
 from project_settings import ACCESS_TOKEN_EXPIRE_MINUTES
 
 
-async def get_user(db: Session, username: str) -> User | None:
+async def get_user(db: AsyncSession, username: str) -> User | None:
     stmt = select(User).filter_by(username=username)
-    return cast(User | None, db.scalar(stmt))
+    return cast(User | None, await db.scalar(stmt))
 
 
 async def login_and_issue_token(user: User) -> Token:
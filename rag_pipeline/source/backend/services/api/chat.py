@@ -8,10 +8,10 @@ import routes.validators.chat as validate
 
 
 async def is_valid_db_state(db: SessionDep, chat_passport_id: uuid.UUID) -> bool:
-    return validate.is_valid_chat_passport(db, chat_passport_id)
+    return await validate.is_valid_chat_passport(db, chat_passport_id)
 
 
-def create_chat_passport(
+async def create_chat_passport(
     db: SessionDep,
     user_ref: str,
     chat_passport_in: ChatPassportGetOrCreate,
@@ -26,7 +26,7 @@ def create_chat_passport(
         status=ChatStatus.ACTIVE,
     )
     db.add(passport)
-    db.commit()
+    await db.commit()
 
     return InitResponsePublic(
         chat_passport_id=passport_id,
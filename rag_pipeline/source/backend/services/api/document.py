@@ -4,9 +4,9 @@ from sqlmodel import select, func
 
 from models.orm.document import DocumentDB, DocStatus
 from models.schemas.document import DocumentContentUpdated
-from params.request_params import SessionDep
-from redis.asyncio import Redis as RedisAsync
-import project_settings as proj_settings
+from params.request_params import SessionDep, SyncSessionDep
+from services.storage.redis_pools import get_async_redis
+from services.executors import DB_EXECUTOR
 import routes.helpers.response_constants as rc
 
 
@@ -29,9 +29,9 @@ async def fetch_docs(db: SessionDep,
         .limit(limit)
     )
 
-    with db:
-        total_count = db.exec(stmt1).one()
-        results = db.exec(stmt2).all()
+    async with db:
+        total_count = (await db.exec(stmt1)).one()
+        results = (await db.exec(stmt2)).all()
 
         documents = []
         for doc in results:
@@ -47,7 +47,7 @@ async def fetch_docs(db: SessionDep,
         }
 
 
-async def update_document_content_in_sql(db: SessionDep,
+async def update_document_content_in_sql(db: SyncSessionDep,
                                          document_id: int,
                                          updated_doc: DocumentContentUpdated
                                          ) -> bool:
@@ -57,6 +57,13 @@ async def update_document_content_in_sql(db: SessionDep,
     :param db: Database session.
     :return: ``True`` when the condition is satisfied, otherwise ``False``.
     """
+    return await DB_EXECUTOR.run(_update_document_content, db, document_id, updated_doc)
+
+
+def _update_document_content(db: SyncSessionDep,
+                             document_id: int,
+                             updated_doc: DocumentContentUpdated
+                             ) -> bool:
     existing_doc = db.get(DocumentDB, document_id)
     assert existing_doc is not None  # Pylance compliance
 
@@ -86,21 +93,21 @@ async def get_doc_status(db: SessionDep, document_id: int) -> dict:
     """
     Get doc status.
     """
-    existing_doc = db.get(DocumentDB, document_id)
+    existing_doc = await db.get(DocumentDB, document_id)
     if not existing_doc:
         rc.ERR_404_NO_DOCUMENT_IN_ORGANIZATION.raise_exception()
 
     assert existing_doc is not None  # Pylance compliance
     # The same SQLAlchemy session may be reused across requests in tests.
     # Refresh to avoid returning stale status after Celery updated the row.
-    db.refresh(existing_doc)
+    await db.refresh(existing_doc)
     if existing_doc.status == DocStatus.READY:
         return {
             "status": DocStatus.READY,
             "progress": 100
         }
 
-    redis = await RedisAsync.from_url(proj_settings.REDIS_URL, decode_responses=True)
+    redis = get_async_redis()
     progress = await redis.get(f"indexing:{document_id}:progress")
     progress = float(progress) if progress else 0
     status = DocStatus.QUEUED if progress < 100 else DocStatus.READY
@@ -1,5 +1,3 @@
-from sqlmodel import Session
-
 from models.schemas.user import UserUpdateSelf
 from models.orm.user import User
 from services.security import get_password_hash
@@ -16,7 +14,7 @@ async def update_user(
 
     user_db.sqlmodel_update(updated_data)
     db.add(user_db)
-    db.commit()
-    db.refresh(user_db)
+    await db.commit()
+    await db.refresh(user_db)
     return user_db
 
@@ -1,10 +1,16 @@
 from celery import Celery
-from celery.signals import after_setup_logger, after_setup_task_logger
+from celery.signals import (
+    after_setup_logger,
+    after_setup_task_logger,
+    worker_process_init,
+    worker_process_shutdown,
+)
 import logging
 
 from project_settings import REDIS_URL, REDIS_URL_BACKEND
 from logging_setup import JsonColoredFormatter, LOGGING_DATE_FORMAT
 from project_settings import IS_DEBUG
+from services.storage.redis_pools import open_sync_redis_pool, close_sync_redis_pool
 
 celery_app = Celery(
     "tasks",
@@ -67,3 +73,19 @@ def _configure_celery_task_logger(logger: logging.Logger, *args: object, **kwarg
         if name.startswith('services.celery_tasks'):
             child_logger = logging.getLogger(name)
             _apply_console_structured_formatter(child_logger)
+
+
+@worker_process_init.connect
+def _init_worker_redis_pool(*args: object, **kwargs: object) -> None:
+    """
+    Open the Redis pool reused by every task of this worker process.
+    """
+    open_sync_redis_pool()
+
+
+@worker_process_shutdown.connect
+def _close_worker_redis_pool(*args: object, **kwargs: object) -> None:
+    """
+    Close the Redis pool of this worker process.
+    """
+    close_sync_redis_pool()
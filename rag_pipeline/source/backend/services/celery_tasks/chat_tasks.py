@@ -56,6 +56,28 @@ def log_chat_message(
     db.add(new_record)
 
 
+@celery_db_task(task_name="chat.log_chat_messages", use_chat_queue=True)
+def log_chat_messages(
+    db: Session,
+    chat_passport_id: UUID,
+    messages: list[tuple[int, str, str]],
+    chat_stage: ChatStage,
+) -> None:
+    """
+    Log a burst of chat messages, given as ``(msg_idx, role, message)``.
+    """
+    db.add_all(
+        ChatLog(
+            chat_passport_id=chat_passport_id,
+            stage=chat_stage,
+            msg_idx=msg_idx,
+            role=role,
+            message=message,
+        )
+        for msg_idx, role, message in messages
+    )
+
+
 @celery_db_task(task_name="chat.update_summary", use_chat_queue=True)
 def update_summary_task(
     db: Session,
@@ -67,17 +89,15 @@ def update_summary_task(
 
     sync_memory = get_chat_memory_celery(chat_passport_id)
 
-    messages: list[ChatMessage] = sync_memory.get_messages_until(
-        idx_summary_cutoff,
-        **logging_context,
-    )
+    batch = sync_memory.read_batch(until_message_idx=idx_summary_cutoff, **logging_context)
+    messages: list[ChatMessage] = batch.messages
 
     if len(messages) < 4:
         return
 
     summary_messages = [ChatMessage.from_system(SUMMARY_PROMPT)]
 
-    existing_summary = sync_memory.get_summary(**logging_context)
+    existing_summary = batch.summary
     if existing_summary:
         summary_messages.append(ChatMessage.from_user(f"Existing summary:\n{existing_summary}"))
 
@@ -140,11 +160,12 @@ def update_user_context(
 
     sync_memory = get_chat_memory_celery(chat_passport_id)
 
-    user_context = sync_memory.get_user_context(**logging_context) or ChatMessage.from_system(
+    batch = sync_memory.read_batch(**logging_context)
+    user_context = batch.user_context or ChatMessage.from_system(
         "No user profile data yet."
     )
 
-    messages: list[ChatMessage] = sync_memory.get_messages(**logging_context)
+    messages: list[ChatMessage] = batch.messages
     user_messages = [m.text for m in messages if m.role == "user" and m.text is not None]
 
     try:
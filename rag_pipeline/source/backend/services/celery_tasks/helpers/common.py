@@ -58,15 +58,19 @@ def hash_to_bigint(value: str) -> int:
     return int(hashlib.sha256(value.encode()).hexdigest(), 16) % (2**63)
 
 
-def celery_db_task(task_name: str, use_chat_queue: bool = False):
+def celery_db_task(task_name: str, use_chat_queue: bool = False, use_transaction: bool = True):
     """
     Декоратор для Celery задач с автоматическим управлением DB-сессией
     и PostgreSQL advisory lock для последовательности задач одного чата.
 
     :param task_name: имя задачи Celery
     :param use_chat_queue: если True, используем pg_advisory_xact_lock по chat_passport_id
+    :param use_transaction: если False, задача сама делает commit (например,
+        чтобы запустить другие задачи после записи строк)
     """
     def decorator(func: Callable[..., Any]):
+        signature = inspect.signature(func)
+
         @celery_app.task(
             name=task_name,
             autoretry_for=(OperationalError, DBAPIError, DisconnectionError),
@@ -77,26 +81,16 @@ def celery_db_task(task_name: str, use_chat_queue: bool = False):
         )
         @wraps(func)
         def wrapper(self: Task, *args: Any, **kwargs: Any) -> Any:
-            signature = inspect.signature(func)
-
             with get_db() as db:
                 # Добавляем db в args перед биндингом
                 bound_args = signature.bind_partial(db, *args, **kwargs)
                 bound_args.apply_defaults()
-                args_with_names = bound_args.arguments
-
-                callee_name = func.__name__
-                caller_name = get_caller_name(2)
-                chat_passport_id = args_with_names.get("chat_passport_id")
-
-                context = LogContext(
-                    chat_passport_id=chat_passport_id,
-                    caller_name=caller_name,
-                    callee_name=callee_name,
-                    chat_stage=args_with_names.get("chat_stage"),
-                ).model_dump()
+                chat_passport_id = bound_args.arguments.get("chat_passport_id")
 
                 try:
+                    if not use_transaction:
+                        return func(db, *args, **kwargs)
+
                     with db.begin():
                         # PostgreSQL advisory lock для последовательности задач чата
                         if chat_passport_id and use_chat_queue:
@@ -112,6 +106,13 @@ def celery_db_task(task_name: str, use_chat_queue: bool = False):
 
                         return func(db, *args, **kwargs)
                 except Exception as e:
+                    context = LogContext(
+                        chat_passport_id=chat_passport_id,
+                        caller_name=get_caller_name(2),
+                        callee_name=func.__name__,
+                        chat_stage=bound_args.arguments.get("chat_stage"),
+                    ).model_dump()
+
                     error_message = f"Ошибка в селери задаче {task_name}: {e}"
                     logger.error(error_message, extra=context, exc_info=True)
                     logfire.error(error_message)
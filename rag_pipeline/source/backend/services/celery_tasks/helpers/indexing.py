@@ -1,18 +1,34 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from hashlib import sha256
+from typing import Any, Mapping
 import time
 import logging
 from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
 
 from aiobreaker import CircuitBreakerError
-from redis import Redis as RedisSync
 from haystack import Document
 from haystack.document_stores.errors import DocumentStoreError
+from haystack.document_stores.types import DuplicatePolicy
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
 from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, select
 
-from project_settings import REDIS_URL
+from models.orm.document import DocumentDB, DocStatus
 from services.common import get_caller_name
 from logging_setup import LogContext
 from services.storage.helpers.storage_decorators import with_retry
-from project_settings import DEFAULT_TTL_SECONDS
+from services.storage.redis_pools import get_sync_redis
+from haystack_pipelines.helpers.context_windows import annotate_context_windows
+from haystack_pipelines.helpers.batching import TokenBudgetBatcher, DOCS_EMBEDDING_BATCHER
+from project_settings import (
+    DEFAULT_TTL_SECONDS,
+    PRECOMPUTE_CONTEXT_WINDOWS,
+    EMBEDDING_CONCURRENCY,
+)
 import haystack_pipelines.initializator as pipes
 
 logger = logging.getLogger(__name__)
@@ -39,29 +55,123 @@ def delete_documents_with_retry(chunk_ids_to_delete: list[str]):
 
 
 @document_store_retry
-def search_documents_with_retry(data: dict) -> dict | None:
-    logging_context = LogContext(
-        callee_name=get_caller_name(2),
-        caller_name=get_caller_name(3),
-    ).model_dump()
+def write_documents_with_retry(chunks: list[Document]):
+    pipes.DOCUMENT_STORE.write_documents(chunks, policy=DuplicatePolicy.OVERWRITE)
 
+
+@document_store_retry
+def search_documents_with_retry(data: dict) -> dict | None:
     try:
         return pipes.CHAT_SEARCH_PIPELINE.run(data)
-    except CircuitBreakerError as e:
-        warn_msg = f"Operation failed: {e}"
-        logger.warning(warn_msg, extra=logging_context)
-        return None
-
     except Exception as e:
+        logging_context = LogContext(
+            callee_name=get_caller_name(2),
+            caller_name=get_caller_name(3),
+        ).model_dump()
+
+        if isinstance(e, CircuitBreakerError):
+            warn_msg = f"Operation failed: {e}"
+            logger.warning(warn_msg, extra=logging_context)
+            return None
+
         err_msg = f"Operation failed: {e}"
         logger.error(err_msg, extra=logging_context)
         raise
 
 
+def return_duplicates(
+    existing_documents: list[DocumentDB],
+    new_texts: list[str],
+    similarity: float = 0.8,
+) -> tuple[list[tuple[DocumentDB, str]], list[str]]:
+    if not new_texts:
+        return [], []
+
+    if not existing_documents:
+        return [], new_texts.copy()
+
+    old_texts = [doc.content for doc in existing_documents]
+
+    vectorizer = TfidfVectorizer()
+    tfidf = vectorizer.fit_transform(old_texts + new_texts)
+
+    n_old = len(old_texts)
+    old_vecs = tfidf[:n_old]  # type: ignore
+    new_vecs = tfidf[n_old:]  # type: ignore
+
+    sim_matrix = cosine_similarity(new_vecs, old_vecs)
+
+    duplicates: list[tuple[DocumentDB, str]] = []
+    unique_texts: list[str] = []
+
+    for i, new_text in enumerate(new_texts):
+        similarities = sim_matrix[i]
+        best_idx: int = similarities.argmax()
+        best_score: float = similarities[best_idx]
+
+        if best_score >= similarity:
+            duplicates.append((existing_documents[best_idx], new_text))
+        else:
+            unique_texts.append(new_text)
+
+    return duplicates, unique_texts
+
+
+def plan_bulk_indexing(db: Session,
+                       long_text: str,
+                       similarity: float,
+                       updated_by: str,
+                       ) -> list[int]:
+    """
+    Write the documents of a bulk upload as QUEUED rows.
+
+    Texts are separated by ``~~~~~~~~~~``. A text similar to a stored
+    document replaces its content, any other text becomes a new document.
+
+    :return: IDs of the documents to index, in upload order.
+    """
+    new_texts = [
+        txt.strip("\n").strip(" ")
+        for txt in long_text.split("~~~~~~~~~~")
+        if txt.strip("\n").strip(" ")
+    ]
+
+    existing_documents = db.exec(select(DocumentDB)).all()
+
+    duplicates, unique_texts = return_duplicates(list(existing_documents), new_texts, similarity)
+
+    documents: list[DocumentDB] = []
+    for old_document, text_to_update in duplicates:
+        old_document.content = text_to_update
+        old_document.status = DocStatus.QUEUED
+        documents.append(old_document)
+
+    time_now = datetime.now(timezone.utc).isoformat()
+    for i, content in enumerate(unique_texts):
+        documents.append(DocumentDB(
+            name=f"{time_now} ({i + 1})",
+            updated_by=updated_by,
+            content=content,
+            status=DocStatus.QUEUED,
+        ))
+
+    db.add_all(documents)
+    db.commit()
+
+    # Two texts may replace the same document; the last one wins.
+    document_ids = list(dict.fromkeys(
+        document.id for document in documents if document.id is not None
+    ))
+    for document_id in document_ids:
+        RedisIndexingManager(document_id).set_upload_progress(0)
+
+    return document_ids
+
+
 class RedisIndexingManager:
     def __init__(self, document_id: int) -> None:
         self.document_id = document_id
-        self.redis = RedisSync.from_url(REDIS_URL, decode_responses=True)
+        self.redis = get_sync_redis()
         self.ttl = DEFAULT_TTL_SECONDS
 
     @property
@@ -110,46 +220,137 @@ def split_document(content: str,
         return None
 
 
+def content_hash(chunk: Document) -> str:
+    return sha256((chunk.content or "").encode("utf-8")).hexdigest()
+
+
+@dataclass
+class ChunkDiff:
+    """
+    Difference between the stored chunks of a document and its new split.
+
+    :param to_embed: New chunks whose content is not in the store.
+    :param to_rewrite: New chunks whose content is stored under another
+        ID or meta; they carry the stored embedding and need no embedding call.
+    :param to_delete: IDs of stored chunks that are not in the new split.
+    :param unchanged: Number of chunks stored exactly as split.
+    """
+    to_embed: list[Document] = field(default_factory=list)
+    to_rewrite: list[Document] = field(default_factory=list)
+    to_delete: list[str] = field(default_factory=list)
+    unchanged: int = 0
+
+
+def diff_chunks(stored_chunks: list[Document], new_chunks: list[Document]) -> ChunkDiff:
+    """
+    Match the new chunks of a document against its stored ones by content hash.
+
+    Chunk IDs hash the content together with the split position, so an
+    edit shifts the IDs of every chunk after it. The embedding depends on
+    the content only, so a shifted chunk is rewritten with its stored
+    embedding instead of being embedded again.
+    """
+    diff = ChunkDiff()
+    stored_by_id = {str(chunk.id): chunk for chunk in stored_chunks}
+    stored_by_hash: dict[str, list[Document]] = {}
+    for chunk in stored_chunks:
+        if chunk.embedding is not None:
+            stored_by_hash.setdefault(content_hash(chunk), []).append(chunk)
+
+    for chunk in new_chunks:
+        stored = stored_by_id.get(str(chunk.id))
+        if stored is not None and stored.meta == chunk.meta and stored.embedding is not None:
+            diff.unchanged += 1
+            continue
+
+        same_content = stored_by_hash.get(content_hash(chunk))
+        if same_content:
+            chunk.embedding = same_content.pop().embedding
+            diff.to_rewrite.append(chunk)
+            continue
+
+        diff.to_embed.append(chunk)
+
+    new_ids = {str(chunk.id) for chunk in new_chunks}
+    diff.to_delete = [chunk_id for chunk_id in stored_by_id if chunk_id not in new_ids]
+    return diff
+
+
 def embed_chunks_with_progress(sync_memory: RedisIndexingManager,
                                chunks_to_index: list[Document],
                                document_id: int,
-                               batch_size: int = 64,
+                               batcher: TokenBudgetBatcher = DOCS_EMBEDDING_BATCHER,
+                               concurrency: int = EMBEDDING_CONCURRENCY,
+                               annotate: bool = True,
                                ) -> bool:
     """
-    Execute embed chunks with progress.
-
+    Embed chunks in batches and write them, reporting progress to Redis.
+
+    Batches are packed by ``batcher`` from the token budget it currently
+    holds, and only here: the pipeline's embedder sends each one as a
+    single request and reports its latency back. Up to ``concurrency`` of
+    them are embedded at once while results are written in batch order, so
+    progress only grows. The embedder calls go through
+    DOCS_EMBEDDING_BREAKER; the first failure stops new batches from being
+    sent.
+
+    :param annotate: Build context windows from ``chunks_to_index``; pass
+        ``False`` when they are a part of a document annotated as a whole.
     :return: ``True`` when the condition is satisfied, otherwise ``False``.
     """
-    logging_context = LogContext(
-        callee_name=get_caller_name(2),
-        caller_name=get_caller_name(3)
-    ).model_dump()
-    logging_context["document_id"] = document_id
-
     try:
+        if PRECOMPUTE_CONTEXT_WINDOWS and annotate:
+            annotate_context_windows(chunks_to_index)
+
+        embedder = pipes.EMBEDDING_PIPELINE.get_component("embedder")
+        writer = pipes.EMBEDDING_PIPELINE.get_component("writer")
+
         total_chunks = len(chunks_to_index)
+        batches = (batch.documents for batch in batcher.batches(chunks_to_index))
         processed = 0
         last_redis_update = 0.0
 
-        for i in range(0, total_chunks, batch_size):
-            batch = chunks_to_index[i:i + batch_size]
-            pipes.EMBEDDING_PIPELINE.run({"embedder": {"documents": batch}})
-
-            processed += len(batch)
-            progress = round(processed / max(total_chunks, 1) * 100, 2)
-            now = time.monotonic()
-            if (now - last_redis_update) >= 0.5 or processed >= total_chunks:
-                sync_memory.set_upload_progress(progress)
-                last_redis_update = now
+        with ThreadPoolExecutor(max_workers=max(1, concurrency),
+                                thread_name_prefix="embedding-batch",
+                                ) as pool:
+            in_flight: deque[Future[Mapping[str, Any]]] = deque(
+                pool.submit(embedder.run, documents=batch)
+                for _, batch in zip(range(max(1, concurrency)), batches)
+            )
+            try:
+                while in_flight:
+                    embedded = in_flight.popleft().result()["documents"]
+
+                    next_batch = next(batches, None)
+                    if next_batch is not None:
+                        in_flight.append(pool.submit(embedder.run, documents=next_batch))
+
+                    writer.run(documents=embedded)
+
+                    processed += len(embedded)
+                    progress = round(processed / max(total_chunks, 1) * 100, 2)
+                    now = time.monotonic()
+                    if (now - last_redis_update) >= 0.5 or processed >= total_chunks:
+                        sync_memory.set_upload_progress(progress)
+                        last_redis_update = now
+            finally:
+                for future in in_flight:
+                    future.cancel()
 
         return True
 
-    except CircuitBreakerError as e:
-        warn_msg = f"Operation failed: {e}"
-        logger.warning(warn_msg, extra=logging_context)
-        return False
-
     except Exception as e:
+        logging_context = LogContext(
+            callee_name=get_caller_name(2),
+            caller_name=get_caller_name(3)
+        ).model_dump()
+        logging_context["document_id"] = document_id
+
+        if isinstance(e, CircuitBreakerError):
+            warn_msg = f"Operation failed: {e}"
+            logger.warning(warn_msg, extra=logging_context)
+            return False
+
         chunk_ids_to_delete = [str(chunk.id) for chunk in chunks_to_index]
         pipes.DOCUMENT_STORE.delete_documents(chunk_ids_to_delete)
 
@@ -1,22 +1,103 @@
 import logging
 
+from celery import chord
 from sqlmodel import Session, select
 
 from models.orm.document import DocStatus, DocumentDB
+from models.orm.user import User
 from services.celery_tasks.common_tasks import update_tokens
 from services.celery_tasks.helpers.common import run_celery_task, celery_db_task
-from services.chat_session.helpers.common import count_tokens
+from services.common import count_tokens
+from services.storage.answer_cache import ANSWER_CACHE
+from haystack_pipelines.helpers.context_windows import annotate_context_windows
+from logging_setup import log_extra
+from project_settings import PRECOMPUTE_CONTEXT_WINDOWS
 from .helpers.indexing import (
     RedisIndexingManager,
     filter_documents_with_retry,
     delete_documents_with_retry,
+    write_documents_with_retry,
     split_document,
+    diff_chunks,
     embed_chunks_with_progress,
+    plan_bulk_indexing,
 )
 
 logger = logging.getLogger(__name__)
 
 
+def reindex_document(document_id: int, content: str) -> DocStatus:
+    """
+    Bring the chunks of a document in line with its content.
+
+    Progress goes to the document's Redis key; the caller stores the
+    returned status.
+    """
+    filters = {"field": "meta.parent_doc_id", "operator": "==", "value": document_id}
+    sync_memory = RedisIndexingManager(document_id)
+
+    sync_memory.set_upload_progress(0)
+
+    stored_chunks = filter_documents_with_retry(filters)
+
+    chunks_to_index = split_document(content, document_id)
+    if chunks_to_index is None:
+        delete_documents_with_retry([str(chunk.id) for chunk in stored_chunks])
+        ANSWER_CACHE.invalidate_documents([document_id])
+        sync_memory.set_upload_progress(100)
+        return DocStatus.FAILED
+
+    if PRECOMPUTE_CONTEXT_WINDOWS:
+        annotate_context_windows(chunks_to_index)
+
+    diff = diff_chunks(stored_chunks, chunks_to_index)
+
+    logger.info(
+        "Re-indexing document %s: %s unchanged, %s rewritten, %s to embed, %s to delete",
+        document_id,
+        diff.unchanged,
+        len(diff.to_rewrite),
+        len(diff.to_embed),
+        len(diff.to_delete),
+        extra=log_extra(
+            event="indexing.chunk_diff",
+            document_id=document_id,
+            unchanged=diff.unchanged,
+            rewritten=len(diff.to_rewrite),
+            embedded=len(diff.to_embed),
+            deleted=len(diff.to_delete),
+        ),
+    )
+
+    if diff.to_rewrite or diff.to_embed or diff.to_delete:
+        ANSWER_CACHE.invalidate_documents([document_id])
+
+    if diff.to_rewrite:
+        write_documents_with_retry(diff.to_rewrite)
+
+    is_success = embed_chunks_with_progress(
+        sync_memory, diff.to_embed, document_id, annotate=False,
+    ) if diff.to_embed else True
+
+    if not is_success:
+        # Leave no stale chunks searchable behind a FAILED document.
+        delete_documents_with_retry(
+            [str(chunk.id) for chunk in [*stored_chunks, *diff.to_rewrite, *diff.to_embed]]
+        )
+        sync_memory.set_upload_progress(100)
+        return DocStatus.FAILED
+
+    if diff.to_delete:
+        delete_documents_with_retry(diff.to_delete)
+
+    tokens_spent = sum(count_tokens(chunk.content) for chunk in diff.to_embed if chunk.content)
+    if tokens_spent:
+        run_celery_task(update_tokens, tokens_spent=tokens_spent)
+
+    sync_memory.set_upload_progress(100)
+    return DocStatus.READY
+
+
 @celery_db_task(task_name="indexing.update_document_content")
 def vectorize_document_with_progress(
     db: Session,
@@ -24,50 +105,104 @@ def vectorize_document_with_progress(
     content: str | None,
     is_content_changed: bool,
 ) -> None:
-    filters = {"field": "meta.parent_doc_id", "operator": "==", "value": document_id}
-
     existing_doc: DocumentDB = db.exec(
         select(DocumentDB).where(DocumentDB.id == document_id)
     ).one()
 
-    sync_memory = RedisIndexingManager(document_id)
-
-    if not is_content_changed:
-        sync_memory.set_upload_progress(100)
+    if not is_content_changed or not content:
+        RedisIndexingManager(document_id).set_upload_progress(100)
         existing_doc.status = DocStatus.READY
         return
 
-    if not content:
-        sync_memory.set_upload_progress(100)
-        existing_doc.status = DocStatus.READY
+    existing_doc.status = reindex_document(document_id, content)
+
+
+@celery_db_task(task_name="indexing.index_document")
+def index_document(db: Session, document_id: int) -> str:
+    """
+    Index one document of a bulk upload.
+
+    Failures are returned as FAILED rather than raised, so that the chord
+    still reaches ``finish_bulk_indexing``.
+    """
+    try:
+        existing_doc = db.get(DocumentDB, document_id)
+        if existing_doc is None:
+            return DocStatus.FAILED.value
+
+        return reindex_document(document_id, existing_doc.content).value
+    except Exception as e:
+        logger.error(
+            f"Operation failed: {e}",
+            extra=log_extra(event="indexing.document.failed", document_id=document_id),
+            exc_info=True,
+        )
+        RedisIndexingManager(document_id).set_upload_progress(100)
+        return DocStatus.FAILED.value
+
+
+@celery_db_task(task_name="indexing.finish_bulk_indexing")
+def finish_bulk_indexing(db: Session, statuses: list[str], document_ids: list[int]) -> None:
+    for document_id, status in zip(document_ids, statuses):
+        existing_doc = db.get(DocumentDB, document_id)
+        if existing_doc is not None:
+            existing_doc.status = DocStatus(status)
+
+    failed = statuses.count(DocStatus.FAILED.value)
+    logger.info(
+        "Bulk indexing finished: %s documents, %s failed",
+        len(document_ids),
+        failed,
+        extra=log_extra(
+            event="indexing.bulk.finished",
+            documents=len(document_ids),
+            failed=failed,
+        ),
+    )
+
+
+@celery_db_task(task_name="indexing.fail_bulk_indexing")
+def fail_bulk_indexing(db: Session, document_ids: list[int]) -> None:
+    """
+    Mark the documents left QUEUED as FAILED when the chord itself broke.
+    """
+    failed = 0
+    for document_id in document_ids:
+        existing_doc = db.get(DocumentDB, document_id)
+        if existing_doc is not None and existing_doc.status == DocStatus.QUEUED:
+            existing_doc.status = DocStatus.FAILED
+            RedisIndexingManager(document_id).set_upload_progress(100)
+            failed += 1
+
+    logger.error(
+        "Bulk indexing did not finish: %s documents marked failed",
+        failed,
+        extra=log_extra(
+            event="indexing.bulk.failed",
+            documents=len(document_ids),
+            failed=failed,
+        ),
+    )
+
+
+def start_bulk_indexing(document_ids: list[int]) -> None:
+    """
+    Index the documents in parallel, one task each, then store their statuses.
+    """
+    if not document_ids:
         return
 
-    sync_memory.set_upload_progress(0)
+    chord(
+        [index_document.si(document_id=document_id) for document_id in document_ids]
+    )(
+        finish_bulk_indexing.s(document_ids=document_ids)
+        .on_error(fail_bulk_indexing.si(document_ids=document_ids))
+    )
 
-    chunks_to_delete = filter_documents_with_retry(filters)
-    chunk_ids_to_delete = [str(chunk.id) for chunk in chunks_to_delete]
-    delete_documents_with_retry(chunk_ids_to_delete)
 
-    chunks_to_index = split_document(content, document_id)
-    if chunks_to_index is None:
-        sync_memory.set_upload_progress(100)
-        existing_doc.status = DocStatus.FAILED
-        return
+@celery_db_task(task_name="indexing.index_documents_bulk", use_transaction=False)
+def index_documents_bulk(db: Session, long_text: str, similarity: float, user_id: int) -> None:
+    current_user = db.get(User, user_id)
+    assert current_user is not None
 
-    if len(chunks_to_index) == 0:
-        sync_memory.set_upload_progress(100)
-        existing_doc.status = DocStatus.READY
-        return
-
-    is_success = embed_chunks_with_progress(sync_memory, chunks_to_index, document_id)
-
-    if not is_success:
-        sync_memory.set_upload_progress(100)
-        existing_doc.status = DocStatus.FAILED
-        return
-
-    tokens_spent = count_tokens(content)
-    run_celery_task(update_tokens, tokens_spent=tokens_spent)
-
-    sync_memory.set_upload_progress(100)
-    existing_doc.status = DocStatus.READY
+    start_bulk_indexing(plan_bulk_indexing(db, long_text, similarity, current_user.name))
@@ -10,7 +10,7 @@ from redis.exceptions import RedisError
 from services.storage.chat_redis import RedisChatMemoryFastAPI
 from services.chat_constants import DEFAULT_CHAT_ERROR_MESSAGE
 from services.celery_app import celery_app
-from logging_setup import LogContext
+from logging_setup import LogContext, log_extra
 from .helpers.common import update_passport_on_chat_stop
 from .helpers.websocket_delivery_manager import WebSocketDeliveryManager
 from .helpers.chat_stage_manager import ChatStageManager
@@ -142,33 +142,18 @@ class ChatSession:
         return True, ""
 
     async def _load_previous_session(self) -> None:
-        chat_stage = await self.memory.get_chat_stage() or self.chat_stage_manager.chat_stage
+        state = await self.memory.get_session_state()
+        chat_stage = state.chat_stage or self.chat_stage_manager.chat_stage
 
         logging_context = LogContext(
             chat_stage=chat_stage).model_dump(exclude_unset=True)
 
-        (
-            chat_summary,
-            user_context,
-            last_msg_index,
-            messages,
-            lang,
-            prev_search_queries,
-        ) = await asyncio.gather(
-            self.memory.get_summary(**logging_context),
-            self.memory.context.get_user_context(**logging_context),
-            self.memory.get_last_message_idx(**logging_context),
-            self.memory.get_messages(**logging_context),
-            self.memory.get_language(**logging_context),
-            self.memory.closure.get_search_queries(**logging_context),
-        )
-
         incomplete_message_history = any(
-            not val for val in [chat_summary, last_msg_index, messages]
+            not val for val in [state.summary, state.last_msg_idx, state.messages]
         )
 
         incomplete_chat_passport_data = any(
-            not val for val in [lang, prev_search_queries])
+            not val for val in [state.lang, state.search_queries])
 
         if incomplete_message_history:
             await recovery.load_and_set_message_history(self, **logging_context)
@@ -176,22 +161,30 @@ class ChatSession:
         if incomplete_chat_passport_data:
             await recovery.load_and_set_lang_and_search_q(self, chat_stage)
 
-        if not user_context:
+        if not state.user_context:
             await recovery.load_and_set_user_context(self, **logging_context)
 
         if IS_DEBUG:
-            chat_summary = await self.memory.get_summary(**logging_context)
-            last_msg_index = await self.memory.get_last_message_idx(**logging_context)
-            prev_search_queries = await self.memory.closure.get_search_queries(**logging_context)
-            user_context = await self.memory.context.get_user_context(**logging_context)
+            state = await self.memory.get_session_state(**logging_context)
 
             logger.debug("LOAD_PREV_SESSION")
-            logger.debug("├ CHAT SUMMARY: %s", chat_summary)
-            logger.debug("├ LAST MSG INDEX: %s", last_msg_index)
-            logger.debug("├ PREV SEARCH QUERIES: %s", prev_search_queries)
-            logger.debug("└ USER CONTEXT: %s", user_context)
+            logger.debug("├ CHAT SUMMARY: %s", state.summary)
+            logger.debug("├ LAST MSG INDEX: %s", state.last_msg_idx)
+            logger.debug("├ PREV SEARCH QUERIES: %s", state.search_queries)
+            logger.debug("└ USER CONTEXT: %s", state.user_context)
 
     async def on_closure(self) -> None:
+        try:
+            await self.delivery.persist_ack()
+        except RedisError as e:
+            logger.warning(
+                f"Operation failed: {e}",
+                extra=log_extra(
+                    event="chat.websocket.ack_lost",
+                    chat_passport_id=self.chat_passport_id,
+                ),
+            )
+
         if not is_app_under_test():
             return
 
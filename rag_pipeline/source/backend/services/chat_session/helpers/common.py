@@ -1,5 +1,4 @@
 from typing import TYPE_CHECKING, Protocol, Any, Type
-import asyncio
 import logging
 from dataclasses import dataclass
 
@@ -8,14 +7,16 @@ from aiobreaker import CircuitBreakerError
 
 from haystack import Pipeline
 from haystack.dataclasses import ChatMessage
-import tiktoken
 
 from haystack_pipelines.helpers.common import serialize_chat_messages
 from models.orm.chat import ChatStage, ChatPassport, ChatStatus
 from services.celery_tasks.common_tasks import update_tokens
 from services.common import get_caller_name
-from logging_setup import LogContext
+from services.executors import LLM_EXECUTOR, ExecutorSaturatedError
+from logging_setup import LogContext, log_extra
+from project_settings import LOCAL_LANG_CONFIDENCE
 from .db_loaders import with_logging
+from .lang_detection import detect_language
 import services.chat_session.helpers.db_loaders as load
 import haystack_pipelines.initializator as pipes
 import services.celery_tasks.chat_tasks as ctask
@@ -25,11 +26,7 @@ logger = logging.getLogger(__name__)
 if TYPE_CHECKING:
     from services.chat_session.chat_session import ChatSession
     from services.chat_session.helpers.chat_stage_manager import ChatStageManager
-
-enc = tiktoken.get_encoding("cl100k_base")
-
-def count_tokens(text: str) -> int:
-    return len(enc.encode(text))
+    from services.chat_session.helpers.streaming import ReplyStream
 
 @dataclass
 class ExpectedKeys:
@@ -37,21 +34,22 @@ class ExpectedKeys:
     variants_of_keys: list[list[str]] | None = None
 
 async def translate(message: str, lang: str) -> str | None:
-    logging_context = LogContext(
-        callee_name=get_caller_name(2),
-        caller_name=get_caller_name(3),
-    ).model_dump()
     try:
-        result = await asyncio.to_thread(
+        result = await LLM_EXECUTOR.run(
             pipes.TRANSLATION_PIPELINE.run,
             {"prompt": {"lang": lang, "message": message}},
         )
-    except CircuitBreakerError as e:
-        warn_msg = f"Operation failed: {e}"
-        logger.warning(warn_msg, extra=logging_context)
-        return None
-
     except Exception as e:
+        logging_context = LogContext(
+            callee_name=get_caller_name(2),
+            caller_name=get_caller_name(3),
+        ).model_dump()
+
+        if isinstance(e, (CircuitBreakerError, ExecutorSaturatedError)):
+            warn_msg = f"Operation failed: {e}"
+            logger.warning(warn_msg, extra=logging_context)
+            return None
+
         err_msg = f"Operation failed: {e}"
         logger.error(err_msg, extra=logging_context)
         raise
@@ -62,22 +60,34 @@ async def translate(message: str, lang: str) -> str | None:
     return str(result["llm"]["replies"][0])
 
 async def detect_lang(chat_messages: list[ChatMessage]) -> str:
-    logging_context = LogContext(
-        callee_name=get_caller_name(2),
-        caller_name=get_caller_name(3),
-    ).model_dump()
-
+    guess = detect_language(" ".join(m.text or "" for m in chat_messages))
+    if guess.lang and guess.confidence >= LOCAL_LANG_CONFIDENCE:
+        return guess.lang
+
+    logger.info(
+        "Local language guess is not confident, asking the LLM",
+        extra=log_extra(
+            event="chat.lang_detection.llm_fallback",
+            guess=guess.lang,
+            confidence=round(guess.confidence, 3),
+        ),
+    )
     try:
-        result = await asyncio.to_thread(
+        result = await LLM_EXECUTOR.run(
             pipes.LANG_DETECTION_PIPELINE.run,
             {"prompt": {"dialog": serialize_chat_messages(chat_messages)}},
         )
-    except CircuitBreakerError as e:
-        warn_msg = f"Operation failed: {e}"
-        logger.warning(warn_msg, extra=logging_context)
-        return "English"
-
     except Exception as e:
+        logging_context = LogContext(
+            callee_name=get_caller_name(2),
+            caller_name=get_caller_name(3),
+        ).model_dump()
+
+        if isinstance(e, (CircuitBreakerError, ExecutorSaturatedError)):
+            warn_msg = f"Operation failed: {e}"
+            logger.warning(warn_msg, extra=logging_context)
+            return "English"
+
         err_msg = f"Operation failed: {e}"
         logger.error(err_msg, extra=logging_context)
         raise
@@ -92,11 +102,6 @@ async def detect_lang(chat_messages: list[ChatMessage]) -> str:
 
     return lang
 
-async def read_chat_stage(obj: "ChatStageManager") -> ChatStage:
-    logging_context = LogContext(chat_stage=None).model_dump(exclude_unset=True)
-
-    return await obj.memory.get_chat_stage(**logging_context) or ChatStage.ANSWERING
-
 async def log_new_assistant_response(
     obj: "ChatStageManager",
     assistant_msg: ChatMessage,
@@ -120,6 +125,7 @@ async def send_and_log_assistant_response(
     message: str,
     messages: list[ChatMessage],
     chat_stage: ChatStage,
+    stream: "ReplyStream | None" = None,
 ) -> tuple[int, list[ChatMessage]]:
     assistant_msg = ChatMessage.from_assistant(message)
     assert assistant_msg.text is not None
@@ -128,7 +134,10 @@ async def send_and_log_assistant_response(
 
     last_assistant_msg_idx = await log_new_assistant_response(obj, assistant_msg, chat_stage)
 
-    await obj.delivery.safe_send_text(assistant_msg.text)
+    if stream:
+        await stream.close(assistant_msg.text)
+    else:
+        await obj.delivery.safe_send_text(assistant_msg.text)
     return last_assistant_msg_idx, updated_messages
 
 class CeleryTaskLike(Protocol):
@@ -143,14 +152,11 @@ def run_celery_task(celery_task: Any, *args: Any, **kwargs: Any) -> None:
 
 @with_logging
 async def update_passport_on_chat_stop(obj: "ChatSession") -> None:
-    def write_db() -> None:
-        with load.get_db_sync() as db:
-            chat_passport = db.get(ChatPassport, obj.chat_passport_id)
-            assert chat_passport is not None
-            chat_passport.status = ChatStatus.ARCHIVED
-            db.commit()
-
-    await asyncio.to_thread(write_db)
+    async with load.get_db_async() as db:
+        chat_passport = await db.get(ChatPassport, obj.chat_passport_id)
+        assert chat_passport is not None
+        chat_passport.status = ChatStatus.ARCHIVED
+        await db.commit()
 
 async def log_chat_stage(obj: "ChatStageManager", chat_stage: ChatStage) -> None:
     await obj.memory.set_chat_stage(chat_stage=chat_stage)
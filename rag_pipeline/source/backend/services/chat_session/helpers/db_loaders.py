@@ -1,15 +1,15 @@
 from uuid import UUID
-from typing import Any, Callable, Awaitable, TypeVar
-from contextlib import contextmanager
+from typing import Any, AsyncIterator, Callable, Awaitable, TypeVar
+from contextlib import asynccontextmanager
 from functools import wraps
 import logging
 import inspect
 
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel.sql.expression import SelectOfScalar
 from sqlalchemy.exc import SQLAlchemyError
 
-from db.session import engine
+from db.session import async_engine
 from logging_setup import LogContext
 from services.common import get_caller_name
 
@@ -21,27 +21,24 @@ T = TypeVar("T")
 def load_with_logging():
     def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
 
+        signature = inspect.signature(func)
+
         @wraps(func)
         async def wrapper(*args: Any, **kwargs: Any) -> T:
-            callee_name = func.__name__
-            caller_name = get_caller_name(2)
-
-            signature = inspect.signature(func)
-            bound_args = signature.bind_partial(*args, **kwargs)
-            bound_args.apply_defaults()
-            args_with_names = bound_args.arguments
-
-            context = LogContext(
-                chat_passport_id=getattr(args[0], "chat_passport_id", None),
-                caller_name=caller_name,
-                callee_name=callee_name,
-                chat_stage=args_with_names.get("chat_stage"),
-            ).model_dump()
-
             try:
                 return await func(*args, **kwargs)
 
             except SQLAlchemyError as e:
+                bound_args = signature.bind_partial(*args, **kwargs)
+                bound_args.apply_defaults()
+
+                context = LogContext(
+                    chat_passport_id=getattr(args[0], "chat_passport_id", None),
+                    caller_name=get_caller_name(2),
+                    callee_name=func.__name__,
+                    chat_stage=bound_args.arguments.get("chat_stage"),
+                ).model_dump()
+
                 sql_text = getattr(e, "statement", None) or "placeholder SQL"
                 logger.exception(
                     f"Database load failed: {sql_text}",
@@ -57,31 +54,28 @@ def load_with_logging():
 with_logging = load_with_logging()
 
 
-def load_db_first(statement: SelectOfScalar):
-    with get_db_sync() as db:
-        return db.exec(statement).first()
+async def load_db_first(statement: SelectOfScalar):
+    async with get_db_async() as db:
+        return (await db.exec(statement)).first()
 
 
-def load_db_all(statement: SelectOfScalar):
-    with get_db_sync() as db:
-        return db.exec(statement).all()
+async def load_db_all(statement: SelectOfScalar):
+    async with get_db_async() as db:
+        return (await db.exec(statement)).all()
 
 
-def get_db_object(obj: type[Any], obj_id: int | UUID) -> Any:
+async def get_db_object(obj: type[Any], obj_id: int | UUID) -> Any:
     """
     Get db object.
     """
-    with get_db_sync() as db:
-        return db.get(obj, obj_id)
+    async with get_db_async() as db:
+        return await db.get(obj, obj_id)
 
 
-@contextmanager
-def get_db_sync():
+@asynccontextmanager
+async def get_db_async() -> AsyncIterator[AsyncSession]:
     """
-    Get db sync.
+    Get db async.
     """
-    db = Session(engine)
-    try:
+    async with AsyncSession(async_engine, expire_on_commit=False) as db:
         yield db
-    finally:
-        db.close()
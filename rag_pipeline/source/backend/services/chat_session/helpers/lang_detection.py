@@ -0,0 +1,172 @@
+"""Local language identification by script and common words."""
+from typing import NamedTuple
+from collections import Counter
+import unicodedata
+import re
+
+_WORDS = re.compile(r"[^\W\d_]+", re.UNICODE)
+
+# Scripts that are written in one language only (for the chat's purposes).
+_SINGLE_LANGUAGE_SCRIPTS = {
+    "GREEK": "Greek",
+    "ARMENIAN": "Armenian",
+    "GEORGIAN": "Georgian",
+    "HEBREW": "Hebrew",
+    "DEVANAGARI": "Hindi",
+    "THAI": "Thai",
+    "HANGUL": "Korean",
+    "HIRAGANA": "Japanese",
+    "KATAKANA": "Japanese",
+    "CJK": "Chinese",
+}
+
+# Frequent short words of each language and the letters only it uses in its script.
+_PROFILES: dict[str, dict[str, tuple[frozenset[str], str]]] = {
+    "CYRILLIC": {
+        "Russian": (frozenset(
+            "и в не на я что с он как а то это по но из у за от так же "
+            "вы мы все для бы если или уже только где когда можно "
+            "его её она они было был была были быть мне меня себя свой "
+            "после через при о об ещё очень тоже теперь сейчас здесь вот "
+            "этот эта эти кто который которая ничего чтобы нужно "
+            "ему ей их него нее вам вас нас тебе тебя сказал сказала "
+            "здравствуйте привет спасибо пожалуйста да нет".split()
+        ), "ыэё"),
+        "Ukrainian": (frozenset(
+            "і в не на я що з він як а це та але із у за від так же "
+            "ви ми все для би якщо або вже тільки де коли можна "
+            "вітаю привіт дякую будь ласка так ні".split()
+        ), "іїєґ"),
+        "Belarusian": (frozenset(
+            "і ў не на я што з ён як а гэта ды але з у за ад так жа "
+            "вы мы усё для калі або ўжо толькі дзе можна дзякуй так не".split()
+        ), "ў"),
+        "Bulgarian": (frozenset(
+            "и в не на аз че с той как а това но от у за така "
+            "вие ние всичко за ако или вече само къде кога може "
+            "здравейте здрасти благодаря моля да не".split()
+        ), ""),
+        "Serbian": (frozenset(
+            "и у не на ја да са он како а то је али из за од тако "
+            "ви ми све за ако или већ само где када може "
+            "здраво хвала молим да не".split()
+        ), "ђћџљњј"),
+    },
+    "LATIN": {
+        "English": (frozenset(
+            "the and is are to of in it you i that this for with on not be have "
+            "do does can what how where when why my your we please thanks thank "
+            "hi hello there yes no".split()
+        ), ""),
+        "German": (frozenset(
+            "der die das und ist sind zu nicht ich du sie es mit ein eine auf "
+            "für wie was wo wann warum mein bitte danke hallo ja nein".split()
+        ), "äöüß"),
+        "French": (frozenset(
+            "le la les et est sont de des du un une je tu vous il elle pas "
+            "pour avec sur que qui comment où quand pourquoi mon merci "
+            "bonjour salut oui non".split()
+        ), "àâçèêëîïôœùû"),
+        "Spanish": (frozenset(
+            "el la los las y es son de del un una yo tú usted no para con "
+            "en que qué cómo dónde cuándo por mi gracias hola sí".split()
+        ), "ñ¿¡áíóú"),
+        "Italian": (frozenset(
+            "il lo la gli le e è sono di del un una io tu lei non per con "
+            "che come dove quando perché mio grazie ciao buongiorno sì".split()
+        ), "òì"),
+        "Portuguese": (frozenset(
+            "o a os as e é são de do da um uma eu você não para com em que "
+            "como onde quando por meu obrigado obrigada olá sim".split()
+        ), "ãõ"),
+        "Polish": (frozenset(
+            "i w nie na jest to że z się jak a do co ja ty pan pani dla "
+            "gdzie kiedy dlaczego mój dziękuję proszę cześć dzień dobry tak".split()
+        ), "ąćęłńśźż"),
+    },
+}
+
+# Words shared by two languages of a script say nothing about either.
+_DISTINCT_WORDS = {
+    script: {
+        lang: words.difference(*(
+            other for other_lang, (other, _) in profiles.items() if other_lang != lang
+        ))
+        for lang, (words, _) in profiles.items()
+    }
+    for script, profiles in _PROFILES.items()
+}
+
+# Russian is the usual Cyrillic language in these chats, so it wins ties.
+# A tie leaves no margin, so the LLM still gets the final say.
+_DEFAULT_LANGUAGES = {"CYRILLIC": "Russian"}
+
+# Marker letters count for more than a common word: they are rarer and surer.
+_LETTER_WEIGHT = 2
+# Evidence at which a profile match is trusted fully.
+_FULL_EVIDENCE = 3
+
+
+class LangGuess(NamedTuple):
+    lang: str | None
+    confidence: float
+
+
+def _script(char: str) -> str | None:
+    try:
+        name = unicodedata.name(char)
+    except ValueError:
+        return None
+    if name.startswith("CJK"):
+        return "CJK"
+    return name.split(" ", 1)[0]
+
+
+def detect_language(text: str) -> LangGuess:
+    """
+    Guess the language of ``text`` without calling the LLM.
+
+    The dominant script decides the language outright when only one
+    language uses it; Cyrillic and Latin are told apart by common words
+    and by letters unique to one language. Confidence is the share of the
+    dominant script scaled by how clearly one profile wins, so mixed or
+    short texts score low and are left to the LLM.
+    """
+    scripts: Counter[str] = Counter(
+        script for script in map(_script, filter(str.isalpha, text)) if script is not None
+    )
+    if not scripts:
+        return LangGuess(None, 0.0)
+
+    script, count = scripts.most_common(1)[0]
+    if scripts["HIRAGANA"] or scripts["KATAKANA"]:
+        # Japanese mixes kana with kanji, Chinese has no kana at all.
+        script = "HIRAGANA"
+        count = sum(scripts[s] for s in ("HIRAGANA", "KATAKANA", "CJK"))
+    share = count / sum(scripts.values())
+
+    if script in _SINGLE_LANGUAGE_SCRIPTS:
+        return LangGuess(_SINGLE_LANGUAGE_SCRIPTS[script], share)
+
+    profiles = _PROFILES.get(script)
+    if profiles is None:
+        return LangGuess(None, 0.0)
+
+    lowered = text.lower()
+    words = _WORDS.findall(lowered)
+    scores = Counter({
+        lang: sum(word in _DISTINCT_WORDS[script][lang] for word in words)
+        + _LETTER_WEIGHT * sum(lowered.count(letter) for letter in letters)
+        for lang, (_, letters) in profiles.items()
+    })
+    (best_lang, best), (_, second) = scores.most_common(2)
+    if best == 0:
+        return LangGuess(None, 0.0)
+
+    default = _DEFAULT_LANGUAGES.get(script)
+    if best == second and scores[default] == best:
+        best_lang = default
+
+    margin = (best - second) / best
+    evidence = min(1.0, (best + 1) / _FULL_EVIDENCE)
+    return LangGuess(best_lang, share * margin * evidence)
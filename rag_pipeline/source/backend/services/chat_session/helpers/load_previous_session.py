@@ -1,6 +1,5 @@
 from typing import TYPE_CHECKING, cast, Optional
 from collections.abc import Sequence
-import asyncio
 import logging
 
 from haystack.dataclasses import ChatMessage
@@ -53,7 +52,7 @@ async def _load_snapshot_from_sql(
             ChatSnapshot.chat_passport_id == obj.chat_passport_id)
     )
 
-    snapshot: ChatSnapshot = await asyncio.to_thread(load.load_db_first, stmt)
+    snapshot: ChatSnapshot = await load.load_db_first(stmt)
 
     return snapshot
 
@@ -70,7 +69,7 @@ async def _load_messages_after_cutoff_index(
         .where(ChatLog.msg_idx > snapshot.msg_idx_summary_cutoff)
     )
 
-    old_messages: Sequence[ChatLog] = await asyncio.to_thread(load.load_db_all, stmt)
+    old_messages: Sequence[ChatLog] = await load.load_db_all(stmt)
 
     return old_messages
 
@@ -86,7 +85,7 @@ async def _load_all_messages(
         .order_by(ChatLog.msg_idx)
     )
 
-    old_messages: Sequence[ChatLog] = await asyncio.to_thread(load.load_db_all, stmt)
+    old_messages: Sequence[ChatLog] = await load.load_db_all(stmt)
 
     return old_messages
 
@@ -146,7 +145,7 @@ async def load_and_set_user_context(
             UserContext.chat_passport_id == obj.chat_passport_id)
     )
 
-    user_context = await asyncio.to_thread(load.load_db_first, stmt)
+    user_context = await load.load_db_first(stmt)
     user_context = cast(Optional[UserContext], user_context)
 
     if user_context:
@@ -161,8 +160,7 @@ async def load_and_set_lang_and_search_q(
     logging_context = LogContext(
         chat_stage=chat_stage).model_dump(exclude_unset=True)
 
-    existing_passport = await asyncio.to_thread(
-        load.get_db_object,
+    existing_passport = await load.get_db_object(
         obj=ChatPassport,
         obj_id=obj.chat_passport_id,
     )
@@ -1,8 +1,6 @@
 from typing import TYPE_CHECKING
-from typing import cast
-import asyncio
+from dataclasses import dataclass, field
 import logging
-import re
 
 from aiobreaker import CircuitBreakerError
 from haystack.dataclasses import ChatMessage
@@ -14,7 +12,16 @@ from services.celery_tasks.helpers.common import run_celery_task
 from services.celery_tasks.common_tasks import update_tokens
 from services.celery_tasks.helpers.indexing import search_documents_with_retry
 from logging_setup import LogContext, log_extra
-from services.common import get_caller_name
+from services.common import get_caller_name, cosine_similarity, count_tokens
+from services.executors import LLM_EXECUTOR, EMBEDDING_EXECUTOR, ExecutorSaturatedError
+from services.storage.answer_cache import ANSWER_CACHE
+from project_settings import (
+    STREAM_LLM_REPLIES,
+    REPEAT_QUERY_DETECTION,
+    REPEAT_QUERY_SIMILARITY,
+    UNIQUE_QUERY_SIMILARITY,
+)
+from .streaming import ReplyStream, strip_think_block
 import services.chat_session.helpers.common as cmn
 import services.celery_tasks.chat_tasks as ctask
 
@@ -25,6 +32,14 @@ logger = logging.getLogger(__name__)
 NO_ANSWER_TEST_MODE_MESSAGE = "The answer is not found, You are now switched to the test mode"
 
 
+@dataclass
+class FoundContexts:
+    contexts: list[str] = field(default_factory=list)
+    chunk_ids: list[str] = field(default_factory=list)
+    document_ids: list[str] = field(default_factory=list)
+    query_embedding: list[float] | None = None
+
+
 async def process_inbox_stage_answering(
     obj: "ChatStageManager",
     messages: list[ChatMessage],
@@ -95,28 +110,40 @@ async def process_inbox_stage_answering(
         search_query=llm_answer["search_query"],
     )
 
-    contexts = await search_chunks(obj, query=QueryContext(query=llm_answer["search_query"], top_k=5))
+    found = await search_chunks(obj, query=QueryContext(query=llm_answer["search_query"], top_k=5))
+    contexts = found.contexts
 
     assistant_text: str
     if not contexts:
         return await _switch_to_test_with_no_answer(obj, messages)
-    else:
-        if obj.is_test_mode:
-            await _send_found_contexts_as_system_message(obj, contexts)
 
+    if obj.is_test_mode:
+        await _send_found_contexts_as_system_message(obj, contexts)
+
+    cached_answer = await ANSWER_CACHE.get(
+        llm_answer["search_query"], found.chunk_ids, lang, found.query_embedding,
+    )
+    stream: ReplyStream | None = None
+    if cached_answer is not None:
+        assistant_text = cached_answer
+        if obj.is_test_mode:
+            await obj.delivery.safe_send_json({"message": "Answer served from cache"})
+    else:
+        data = {
+            "prompt": {
+                "search_query": llm_answer["search_query"],
+                "search_intent": llm_answer["search_intent"],
+                "contexts": contexts,
+                "lang": lang,
+            },
+        }
+        stream = ReplyStream(obj, hold_back="HANDOFF") if STREAM_LLM_REPLIES else None
         try:
-            result = await asyncio.to_thread(
-                pipes.ANSWER_FORMULATION_PIPELINE.run,
-                {
-                    "prompt": {
-                        "search_query": llm_answer["search_query"],
-                        "search_intent": llm_answer["search_intent"],
-                        "contexts": contexts,
-                        "lang": lang,
-                    }
-                },
-            )
-        except CircuitBreakerError as e:
+            if stream:
+                result = await stream.run(pipes.ANSWER_FORMULATION_PIPELINE, data)
+            else:
+                result = await LLM_EXECUTOR.run(pipes.ANSWER_FORMULATION_PIPELINE.run, data)
+        except (CircuitBreakerError, ExecutorSaturatedError) as e:
             logging_context["calee"] = get_caller_name(2)
             logging_context["caller"] = get_caller_name(3)
             warn_msg = f"Operation failed: {e}"
@@ -146,17 +173,26 @@ async def process_inbox_stage_answering(
             await obj.delivery.safe_send_json({"tokens": tokens_spent})
         run_celery_task(update_tokens, tokens_spent=tokens_spent)
 
-        assistant_text = result["llm"]["replies"][0]
-
-    assistant_text = _strip_think_block(assistant_text)
-    if assistant_text.strip().upper() == "HANDOFF":
-        return await _switch_to_test_with_no_answer(obj, messages)
+        assistant_text = strip_think_block(result["llm"]["replies"][0])
+        if assistant_text.strip().upper() == "HANDOFF":
+            return await _switch_to_test_with_no_answer(obj, messages)
+
+        if assistant_text.strip():
+            await ANSWER_CACHE.set(
+                llm_answer["search_query"],
+                found.chunk_ids,
+                found.document_ids,
+                lang,
+                assistant_text,
+                found.query_embedding,
+            )
 
     (last_assistant_msg_idx, updated_messages) = await cmn.send_and_log_assistant_response(
         obj,
         message=assistant_text,
         messages=messages,
         chat_stage=ChatStage.ANSWERING,
+        stream=stream,
     )
 
     await cmn.log_chat_stage(obj, ChatStage.TEST)
@@ -210,8 +246,15 @@ async def _is_repeating_search_query(
     if not search_query_history:
         return False
 
+    if REPEAT_QUERY_DETECTION == "embedding":
+        is_repeating = await _compare_query_embeddings(
+            obj, llm_answer["search_query"], search_query_history,
+        )
+        if is_repeating is not None:
+            return is_repeating
+
     try:
-        result = await asyncio.to_thread(
+        result = await LLM_EXECUTOR.run(
             pipes.SEARCH_QUERIES_COMPARISON_PIPELINE.run,
             {
                 "prompt": {
@@ -220,7 +263,7 @@ async def _is_repeating_search_query(
                 }
             },
         )
-    except CircuitBreakerError as e:
+    except (CircuitBreakerError, ExecutorSaturatedError) as e:
         logging_context["calee"] = get_caller_name(2)
         logging_context["caller"] = get_caller_name(3)
         warn_msg = f"Operation failed: {e}"
@@ -254,36 +297,103 @@ async def _is_repeating_search_query(
     return comparison.lower() == "repeat"
 
 
+async def _compare_query_embeddings(
+    obj: "ChatStageManager",
+    search_query: str,
+    search_query_history: list[str],
+) -> bool | None:
+    """
+    Classify the query as repeated by cosine similarity to previous ones.
+
+    The query embedder of the search pipeline is cached, so the embedding
+    computed here is reused by the search that follows. Embeddings of
+    previous queries are kept next to the search queries in Redis.
+
+    :return: ``None`` when the best similarity falls between the unique
+        and the repeat thresholds, or the embedder is unavailable.
+    """
+    logging_context = LogContext(chat_stage=ChatStage.ANSWERING).model_dump(exclude_unset=True)
+
+    history = list(dict.fromkeys(search_query_history))
+    embeddings = await obj.memory.closure.get_search_query_embeddings(history, **logging_context)
+    missing = [query for query in [*history, search_query] if query not in embeddings]
+
+    embedder = pipes.CHAT_SEARCH_PIPELINE.get_component("query_embedder")
+    try:
+        for query in missing:
+            result = await EMBEDDING_EXECUTOR.run(embedder.run, text=query)
+            embeddings[query] = result["embedding"]
+    except Exception as e:
+        logger.warning(
+            f"Operation failed: {e}",
+            extra=log_extra(
+                event="chat.search_query.embedding_comparison.failed",
+                context=logging_context,
+            ),
+        )
+        return None
+
+    await obj.memory.closure.set_search_query_embeddings(
+        {query: embeddings[query] for query in missing},
+        **logging_context,
+    )
+
+    similarity = max(
+        cosine_similarity(embeddings[search_query], embeddings[query])
+        for query in history
+    )
+    logger.info(
+        "├ SEARCH QUERY SIMILARITY: %.3f",
+        similarity,
+        extra=log_extra(
+            event="chat.search_query.similarity",
+            context=logging_context,
+            similarity=similarity,
+        ),
+    )
+
+    if similarity >= REPEAT_QUERY_SIMILARITY:
+        return True
+    if similarity < UNIQUE_QUERY_SIMILARITY:
+        return False
+    return None
+
+
 async def search_chunks(
     obj: "ChatStageManager",
     query: QueryContext,
-) -> list[str]:
-    result = await asyncio.to_thread(
-        search_documents_with_retry,
-        {
-            "query_embedder": {"text": query.query},
-            "retriever": {
-                "top_k": query.top_k,
+) -> FoundContexts:
+    try:
+        result = await EMBEDDING_EXECUTOR.run(
+            search_documents_with_retry,
+            {
+                "query_embedder": {"text": query.query},
+                "retriever": {
+                    "top_k": query.top_k,
+                },
             },
-        },
-    )
+        )
+    except ExecutorSaturatedError as e:
+        logger.warning(
+            f"Operation failed: {e}",
+            extra=log_extra(event="chat.search.saturated"),
+        )
+        return FoundContexts()
 
     if result is None:
-        return []
+        return FoundContexts()
 
-    tokens_spent = cmn.count_tokens(query.query)
+    tokens_spent = count_tokens(query.query)
     await obj.delivery.safe_send_json({"tokens": tokens_spent})
     run_celery_task(update_tokens, tokens_spent=tokens_spent)
 
-    return cast(list[str], result["context_extractor"]["contexts"])
-
-
-def _strip_think_block(text: str) -> str:
-    """
-    Execute strip think block.
-    """
-    cleaned = re.sub(r"<think>.*?</think>", "", text, flags=re.DOTALL | re.IGNORECASE)
-    return cleaned.strip()
+    extracted = result["context_extractor"]
+    return FoundContexts(
+        contexts=extracted["contexts"],
+        chunk_ids=extracted.get("chunk_ids", []),
+        document_ids=extracted.get("document_ids", []),
+        query_embedding=extracted.get("query_embedding"),
+    )
 
 
 async def _switch_to_test_with_no_answer(
@@ -1,5 +1,4 @@
 from typing import TYPE_CHECKING
-import asyncio
 import logging
 
 from aiobreaker import CircuitBreakerError
@@ -10,10 +9,11 @@ from logging_setup import LogContext, log_extra
 from models.orm.chat import ChatStage
 from services.chat_constants import GREETING_PROMPT
 from services.celery_tasks.helpers.common import run_celery_task
-from .common import detect_lang, read_chat_stage
+from .common import detect_lang
 from services.celery_tasks.common_tasks import update_tokens
 import services.celery_tasks.chat_tasks as ctask
 from services.common import get_caller_name
+from services.executors import LLM_EXECUTOR, ExecutorSaturatedError
 
 if TYPE_CHECKING:
     from services.chat_session.helpers.chat_stage_manager import ChatStageManager
@@ -24,29 +24,28 @@ logger = logging.getLogger(__name__)
 async def process_inbox_stage_adding(
     obj: "ChatStageManager",
 ) -> tuple[ChatStage, list[ChatMessage], str]:
-    chat_stage: ChatStage = await read_chat_stage(obj)
+    state = await obj.memory.get_session_state()
+    chat_stage: ChatStage = state.chat_stage or ChatStage.ANSWERING
 
     logging_context = LogContext(chat_stage=chat_stage).model_dump(exclude_unset=True)
 
-    usr_messages = await obj.memory.drain_inbox(**logging_context)
-    await obj.memory.clear_processing(**logging_context)
+    drained = await obj.memory.drain_inbox_to_messages(**logging_context)
+    usr_messages = [text for _, text in drained]
 
-    for text in usr_messages:
-        user_msg = ChatMessage.from_user(text)
-        user_msg_idx = await obj.memory.append_message(user_msg, **logging_context)
+    # The inbox lock is held, so nothing else appends to the history and
+    # the snapshot can be extended locally instead of being re-read.
+    messages = state.messages
+    messages.extend(ChatMessage.from_user(text) for text in usr_messages)
 
+    if drained:
         run_celery_task(
-            ctask.log_chat_message,
+            ctask.log_chat_messages,
             chat_passport_id=obj.chat_passport_id,
-            msg_idx=user_msg_idx,
-            role=user_msg.role,
-            message=user_msg.text,
+            messages=[(msg_idx, "user", text) for msg_idx, text in drained],
             chat_stage=chat_stage,
         )
 
-    messages = await obj.memory.get_messages(**logging_context)
-
-    lang = await obj.memory.get_language()
+    lang = state.lang
 
     if not lang:
         chat_messages = [ChatMessage.from_user(m) for m in usr_messages]
@@ -88,11 +87,11 @@ async def send_greeting(
     if not assistent_messages and not summary:
         prompt = GREETING_PROMPT.replace("{{ lang }}", lang)
         try:
-            pipeline_result = await asyncio.to_thread(
+            pipeline_result = await LLM_EXECUTOR.run(
                 pipes.ONE_REQUEST_PIPELINE.run,
                 {"llm": {"messages": [ChatMessage.from_system(prompt)]}},
             )
-        except CircuitBreakerError as e:
+        except (CircuitBreakerError, ExecutorSaturatedError) as e:
             logging_context["calee"] = get_caller_name(2)
             logging_context["caller"] = get_caller_name(3)
             warn_msg = f"Operation failed: {e}"
@@ -1,7 +1,5 @@
 from typing import TYPE_CHECKING
-import asyncio
 import logging
-import re
 
 from aiobreaker import CircuitBreakerError
 from haystack.dataclasses import ChatMessage
@@ -11,6 +9,9 @@ from services.chat_constants import DEFAULT_CHAT_NO_ANSWER_MESSAGE
 from services.celery_tasks.helpers.common import run_celery_task
 from logging_setup import LogContext, log_extra
 from services.common import get_caller_name
+from services.executors import LLM_EXECUTOR, ExecutorSaturatedError
+from project_settings import STREAM_LLM_REPLIES
+from .streaming import ReplyStream, strip_think_block
 import haystack_pipelines.initializator as pipes
 import services.chat_session.helpers.common as cmn
 import services.celery_tasks.chat_tasks as ctask
@@ -27,33 +28,45 @@ async def process_inbox_stage_test(
     messages: list[ChatMessage],
     lang: str,
 ) -> int | None:
-    logging_context = LogContext(
-        callee_name=get_caller_name(2),
-        caller_name=get_caller_name(3),
-    ).model_dump()
-
-    logger.debug(
-        f"STAGE: {chat_stage}",
-        extra=log_extra(event="chat.test.enter", context=logging_context),
-    )
-
-    try:
-        pipeline_result = await asyncio.to_thread(
-            pipes.ONE_REQUEST_PIPELINE.run,
-            {"llm": {"messages": messages}},
+    if logger.isEnabledFor(logging.DEBUG):
+        logging_context = LogContext(
+            callee_name=get_caller_name(2),
+            caller_name=get_caller_name(3),
+        ).model_dump()
+        logger.debug(
+            f"STAGE: {chat_stage}",
+            extra=log_extra(event="chat.test.enter", context=logging_context),
         )
-    except CircuitBreakerError as e:
-        warn_msg = f"Operation failed: {e}"
-        logger.warning(
-            warn_msg,
-            extra=log_extra(
-                event="chat.test.circuit_open",
-                context=logging_context,
-            ),
-        )
-        return None
 
+    stream = ReplyStream(obj) if STREAM_LLM_REPLIES else None
+    try:
+        if stream:
+            pipeline_result = await stream.run(
+                pipes.ONE_REQUEST_PIPELINE,
+                {"llm": {"messages": messages}},
+            )
+        else:
+            pipeline_result = await LLM_EXECUTOR.run(
+                pipes.ONE_REQUEST_PIPELINE.run,
+                {"llm": {"messages": messages}},
+            )
     except Exception as e:
+        logging_context = LogContext(
+            callee_name=get_caller_name(2),
+            caller_name=get_caller_name(3),
+        ).model_dump()
+
+        if isinstance(e, (CircuitBreakerError, ExecutorSaturatedError)):
+            warn_msg = f"Operation failed: {e}"
+            logger.warning(
+                warn_msg,
+                extra=log_extra(
+                    event="chat.test.circuit_open",
+                    context=logging_context,
+                ),
+            )
+            return None
+
         err_msg = f"Operation failed: {e}"
         logger.error(
             err_msg,
@@ -68,7 +81,7 @@ async def process_inbox_stage_test(
     tokens_spent = assistant_msg.meta["usage"]["total_tokens"]
     run_celery_task(ctask.update_tokens, tokens_spent=tokens_spent)
 
-    assistant_msg_text = _strip_think_block(assistant_msg.text or "")
+    assistant_msg_text = strip_think_block(assistant_msg.text or "")
     if assistant_msg_text != (assistant_msg.text or ""):
         assistant_msg = ChatMessage.from_assistant(assistant_msg_text)
 
@@ -83,11 +96,9 @@ async def process_inbox_stage_test(
 
     last_assistant_msg_idx = await cmn.log_new_assistant_response(obj, assistant_msg, chat_stage)
 
-    await obj.delivery.safe_send_text(assistant_msg.text)
+    if stream:
+        await stream.close(assistant_msg.text)
+    else:
+        await obj.delivery.safe_send_text(assistant_msg.text)
 
     return last_assistant_msg_idx
-
-
-def _strip_think_block(text: str) -> str:
-    cleaned = re.sub(r"<think>.*?</think>", "", text, flags=re.DOTALL | re.IGNORECASE)
-    return cleaned.strip()
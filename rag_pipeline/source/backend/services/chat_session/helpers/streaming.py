@@ -0,0 +1,179 @@
+"""Forward LLM output to the chat websocket while it is being generated."""
+from typing import TYPE_CHECKING, Any
+from uuid import uuid4
+import asyncio
+import re
+
+from haystack import Pipeline
+from haystack.dataclasses import StreamingChunk
+
+from services.executors import LLM_EXECUTOR
+
+if TYPE_CHECKING:
+    from services.chat_session.helpers.chat_stage_manager import ChatStageManager
+
+THINK_OPEN = "<think>"
+THINK_CLOSE = "</think>"
+_THINK_BLOCK = re.compile(r"<think>.*?</think>", re.DOTALL | re.IGNORECASE)
+
+
+class ThinkBlockFilter:
+    """
+    Drop ``<think>...</think>`` blocks from text that arrives in pieces.
+
+    Tags may be split across pieces, so a tail that could still become a
+    tag is held back until the next piece decides it. Leading whitespace
+    of the visible text is dropped, as the reply is stripped anyway.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._inside = False
+        self._started = False
+
+    def feed(self, text: str) -> str:
+        self._buffer += text
+        visible: list[str] = []
+
+        while True:
+            if self._inside:
+                idx = self._buffer.lower().find(THINK_CLOSE)
+                if idx < 0:
+                    held = _partial_tag_len(self._buffer, THINK_CLOSE)
+                    self._buffer = self._buffer[len(self._buffer) - held:]
+                    break
+                self._buffer = self._buffer[idx + len(THINK_CLOSE):]
+                self._inside = False
+                continue
+
+            idx = self._buffer.lower().find(THINK_OPEN)
+            if idx >= 0:
+                visible.append(self._buffer[:idx])
+                self._buffer = self._buffer[idx + len(THINK_OPEN):]
+                self._inside = True
+                continue
+
+            held = _partial_tag_len(self._buffer, THINK_OPEN)
+            visible.append(self._buffer[:len(self._buffer) - held])
+            self._buffer = self._buffer[len(self._buffer) - held:]
+            break
+
+        return self._emit("".join(visible))
+
+    def flush(self) -> str:
+        """
+        Release held text at the end of the stream.
+
+        An unterminated think block is dropped.
+        """
+        rest = "" if self._inside else self._buffer
+        self._buffer = ""
+        return self._emit(rest)
+
+    def _emit(self, text: str) -> str:
+        if not self._started:
+            text = text.lstrip()
+            self._started = bool(text)
+        return text
+
+
+def _partial_tag_len(text: str, tag: str) -> int:
+    """
+    Get the length of the longest suffix of ``text`` that starts ``tag``.
+    """
+    lowered = text[-(len(tag) - 1):].lower()
+    for size in range(len(lowered), 0, -1):
+        if tag.startswith(lowered[-size:]):
+            return size
+    return 0
+
+
+def strip_think_block(text: str) -> str:
+    """
+    Strip think block.
+
+    Unlike ``ThinkBlockFilter``, an unterminated block is kept, so a reply
+    that only opens ``<think>`` is not lost.
+    """
+    return _THINK_BLOCK.sub("", text).strip()
+
+
+class ReplyStream:
+    """
+    Stream one LLM reply to the websocket as ``{"stream_id", "delta"}`` frames.
+
+    Deltas are sent once and not buffered: a client that misses some gets
+    the whole reply in the closing ``{"stream_id", "done", "text"}`` frame,
+    which goes through the regular delivery with redelivery on reconnect.
+    Text that may turn out to be ``hold_back`` (a control reply such as
+    ``HANDOFF``) is not sent until it is clear that it is not.
+    """
+
+    def __init__(self, obj: "ChatStageManager", hold_back: str = ""):
+        self.delivery = obj.delivery
+        self.stream_id = uuid4().hex
+        self.text = ""
+        self._hold_back = hold_back.lower()
+        self._sent_len = 0
+        self._filter = ThinkBlockFilter()
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue[str | None] = asyncio.Queue()
+
+    @property
+    def is_started(self) -> bool:
+        return self._sent_len > 0
+
+    def callback(self, chunk: StreamingChunk) -> None:
+        """
+        Streaming callback of the generator, called from the worker thread.
+        """
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, chunk.content)
+
+    async def run(self,
+                  pipeline: Pipeline,
+                  data: dict[str, dict[str, Any]],
+                  component: str = "llm",
+                  ) -> dict[str, Any]:
+        """
+        Run ``pipeline`` on the LLM executor, forwarding chunks as they arrive.
+        """
+        data.setdefault(component, {})["streaming_callback"] = self.callback
+        task = asyncio.ensure_future(LLM_EXECUTOR.run(pipeline.run, data))
+        task.add_done_callback(lambda _: self._queue.put_nowait(None))
+
+        while (content := await self._queue.get()) is not None:
+            await self._forward(self._filter.feed(content))
+
+        result: dict[str, Any] = await task
+        await self._forward(self._filter.flush(), is_final=True)
+        return result
+
+    async def close(self, text: str) -> bool:
+        """
+        Send the final reply text, as a closing frame if deltas went out.
+        """
+        if not self.is_started:
+            return await self.delivery.safe_send_text(text)
+
+        return await self.delivery.safe_send_json(
+            {"stream_id": self.stream_id, "done": True, "text": text}
+        )
+
+    async def _forward(self, visible: str, is_final: bool = False) -> None:
+        self.text += visible
+
+        if self._hold_back and not self.is_started:
+            candidate = self.text.strip().lower()
+            is_held = (
+                candidate == self._hold_back if is_final
+                else self._hold_back.startswith(candidate)
+            )
+            if is_held:
+                return
+
+        delta = self.text[self._sent_len:]
+        if not delta:
+            return
+
+        await self.delivery.send_transient_json({"stream_id": self.stream_id, "delta": delta})
+        self._sent_len = len(self.text)
@@ -14,10 +14,14 @@ from starlette.websockets import WebSocketState
 from services.storage.chat_redis import RedisChatMemoryFastAPI
 from models.orm.chat import ChatStage
 from logging_setup import LogContext, log_extra
-from project_settings import MAX_SEND_TIME_BEFORE_RETRY
+from project_settings import MAX_SEND_TIME_BEFORE_RETRY, CHAT_DELIVERY_BACKEND
 
 logger = logging.getLogger(__name__)
 
+PENDING_ACK_BATCH_SIZE = 20
+# Longest a delivered message waits in the outbox for its removal.
+PENDING_ACK_FLUSH_DELAY = 1.0
+
 
 class WebSocketDeliveryManager:
 
@@ -32,6 +36,16 @@ class WebSocketDeliveryManager:
         self.chat_passport_id = chat_passport_id
         self.pending_messages: deque = deque(maxlen=50)
         self._pending_set: set[tuple[str, Any]] = set()
+        # Stream backend: every outgoing message is logged to a Redis Stream
+        # and the client's position in it is tracked by stream ID.
+        self.use_stream = CHAT_DELIVERY_BACKEND == "stream"
+        self._unsaved_ack_id: str | None = None
+        self._stream_gap = False
+        # Outbox backend: only messages that reached Redis need removing,
+        # and their removals are sent in batches.
+        self._pending_acks: list[tuple[str, Any]] = []
+        self._ack_flush_task: asyncio.Task | None = None
+        self.avoided_ack_round_trips = 0
 
     def ws_connected(self) -> bool:
         return (
@@ -100,6 +114,18 @@ class WebSocketDeliveryManager:
         if payload is None:
             return False
 
+        if self.use_stream:
+            return await self._safe_send_via_stream(
+                payload,
+                sender,
+                retry_count=retry_count,
+                backoff_base=backoff_base,
+                caller_name=caller_name,
+                chat_stage=chat_stage,
+            )
+
+        is_persisted = False
+
         for attempt in range(retry_count):
             if not self.ws_connected():
                 if use_buffer_on_fail:
@@ -124,17 +150,17 @@ class WebSocketDeliveryManager:
                         payload=payload,
                         chat_stage=chat_stage,
                     )
+                    is_persisted = True
 
                 await asyncio.sleep(backoff_base * (attempt + 1))
                 continue
 
             try:
                 await asyncio.wait_for(sender(payload), timeout=MAX_SEND_TIME_BEFORE_RETRY)
-                await self.memory.pop_pending_message(
-                    sender_name=sender.__name__,
-                    payload=payload,
-                    chat_stage=chat_stage,
-                )
+                if is_persisted:
+                    await self._queue_ack(sender.__name__, payload, chat_stage)
+                else:
+                    self.avoided_ack_round_trips += 1
                 return True
 
             except asyncio.TimeoutError as e:
@@ -175,6 +201,188 @@ class WebSocketDeliveryManager:
 
         return False
 
+    async def _safe_send_via_stream(
+        self,
+        payload: str | dict[str, str],
+        sender: Callable[[Any], Awaitable[None]],
+        *,
+        retry_count: int,
+        backoff_base: float,
+        caller_name: str | None = None,
+        chat_stage: ChatStage | None = None,
+    ) -> bool:
+        """
+        Execute safe send via stream.
+
+        The message is logged before sending, so a failed send needs no
+        buffering: it is replayed from the client's last-acked ID.
+
+        :param chat_stage: Current chat stage used for logging and state handling.
+        :return: ``True`` when the condition is satisfied, otherwise ``False``.
+        """
+        stream_id = await self.memory.outbound.append(
+            sender_name=self._stream_sender_name(sender),
+            payload=payload,
+            ack_id=self._unsaved_ack_id,
+            chat_stage=chat_stage,
+        )
+        self._unsaved_ack_id = None
+
+        # Once a message is missed, later ones go through the replay to keep
+        # the client's view of the stream gap-free and ordered.
+        if self._stream_gap:
+            return self.ws_connected() and await self._replay_stream(chat_stage)
+
+        for attempt in range(retry_count):
+            if not self.ws_connected():
+                await asyncio.sleep(backoff_base * (attempt + 1))
+                continue
+
+            try:
+                await asyncio.wait_for(sender(payload), timeout=MAX_SEND_TIME_BEFORE_RETRY)
+                self._unsaved_ack_id = stream_id
+                return True
+
+            except (asyncio.TimeoutError, RuntimeError) as e:
+                logger.warning(
+                    f"Operation failed: {e}",
+                    extra=log_extra(
+                        event="chat.websocket.stream.send_failed",
+                        chat_passport_id=self.chat_passport_id,
+                        caller_name=caller_name,
+                        chat_stage=chat_stage,
+                    ),
+                )
+                if attempt < retry_count - 1:
+                    await asyncio.sleep(backoff_base * (attempt + 1))
+
+        self._stream_gap = True
+        return False
+
+    def _stream_sender_name(self, sender: Callable[[Any], Awaitable[None]]) -> str:
+        """
+        Name the websocket method to replay an entry with.
+
+        The name is fixed rather than taken from ``sender.__name__``, which
+        is not the method name for wrapped or mocked senders.
+        """
+        return "send_json" if sender == self.websocket.send_json else "send_text"
+
+    async def _replay_stream(self, chat_stage: ChatStage | None = None) -> bool:
+        """
+        Send every stream entry after the client's last-acked ID.
+
+        :return: ``True`` when the client caught up with the stream.
+        """
+        await self.persist_ack(chat_stage=chat_stage)
+        _, entries = await self.memory.outbound.replay(chat_stage=chat_stage)
+
+        delivered_id: str | None = None
+        self._stream_gap = False
+
+        for stream_id, sender_name, payload in entries:
+            if not self.ws_connected():
+                self._stream_gap = True
+                break
+
+            sender = (
+                self.websocket.send_json if sender_name == "send_json"
+                else self.websocket.send_text
+            )
+            try:
+                await asyncio.wait_for(sender(payload), timeout=MAX_SEND_TIME_BEFORE_RETRY)
+            except (RuntimeError, asyncio.TimeoutError) as e:
+                logger.warning(
+                    f"Operation failed: {e}",
+                    extra=log_extra(
+                        event="chat.websocket.stream.replay_failed",
+                        chat_passport_id=self.chat_passport_id,
+                        chat_stage=chat_stage,
+                    ),
+                )
+                self._stream_gap = True
+                break
+
+            delivered_id = stream_id
+
+        if delivered_id:
+            await self.memory.outbound.ack(delivered_id, chat_stage=chat_stage)
+
+        return not self._stream_gap
+
+    async def persist_ack(self, chat_stage: ChatStage | None = None) -> None:
+        """
+        Store acknowledgements that are not in Redis yet.
+
+        :param chat_stage: Current chat stage used for logging and state handling.
+        """
+        await self._flush_acks(chat_stage)
+
+        if self._unsaved_ack_id is None:
+            return
+
+        ack_id, self._unsaved_ack_id = self._unsaved_ack_id, None
+        await self.memory.outbound.ack(ack_id, chat_stage=chat_stage)
+
+    async def _queue_ack(self,
+                         sender_name: str,
+                         payload: Any,
+                         chat_stage: ChatStage | None = None) -> None:
+        """
+        Queue removal of a delivered message from the pending outbox.
+
+        :param chat_stage: Current chat stage used for logging and state handling.
+        """
+        self._pending_acks.append((sender_name, payload))
+        if len(self._pending_acks) >= PENDING_ACK_BATCH_SIZE:
+            await self._flush_acks(chat_stage)
+        elif self._ack_flush_task is None:
+            self._ack_flush_task = asyncio.create_task(self._flush_acks_later(chat_stage))
+
+    async def _flush_acks_later(self, chat_stage: ChatStage | None = None) -> None:
+        """
+        Flush queued acks after ``PENDING_ACK_FLUSH_DELAY``, so they do not
+        wait for a full batch for the whole connection.
+
+        :param chat_stage: Current chat stage used for logging and state handling.
+        """
+        await asyncio.sleep(PENDING_ACK_FLUSH_DELAY)
+        self._ack_flush_task = None
+        try:
+            await self._flush_acks(chat_stage)
+        except RedisError as e:
+            logger.warning(
+                f"Operation failed: {e}",
+                extra=log_extra(
+                    event="chat.websocket.ack_flush.redis_unavailable",
+                    chat_passport_id=self.chat_passport_id,
+                ),
+            )
+
+    async def _flush_acks(self, chat_stage: ChatStage | None = None) -> None:
+        """
+        Remove every queued delivered message from the pending outbox.
+
+        Removals go in batches of ``PENDING_ACK_BATCH_SIZE``, as a replayed
+        backlog can be too large for one script call. Acks that were not
+        sent stay queued.
+
+        :param chat_stage: Current chat stage used for logging and state handling.
+        """
+        if self._ack_flush_task is not None:
+            self._ack_flush_task.cancel()
+            self._ack_flush_task = None
+
+        acks, self._pending_acks = self._pending_acks, []
+        for start in range(0, len(acks), PENDING_ACK_BATCH_SIZE):
+            try:
+                await self.memory.pop_pending_messages(
+                    acks[start:start + PENDING_ACK_BATCH_SIZE], chat_stage=chat_stage,
+                )
+            except RedisError:
+                self._pending_acks[:0] = acks[start:]
+                raise
+
     async def flush_pending_messages(self) -> None:
         """Flush buffered pending messages after reconnection."""
         logging_context = LogContext(
@@ -182,6 +390,10 @@ class WebSocketDeliveryManager:
         ).model_dump(exclude_unset=True)
 
         try:
+            if self.use_stream:
+                await self._replay_stream()
+                return
+
             pending_from_redis = await self.memory.get_pending_messages(chat_stage=None)
 
             for sender_name, payload in pending_from_redis:
@@ -211,11 +423,7 @@ class WebSocketDeliveryManager:
 
                 try:
                     await asyncio.wait_for(sender(payload), timeout=MAX_SEND_TIME_BEFORE_RETRY)
-                    await self.memory.pop_pending_message(
-                        sender_name=sender_name,
-                        payload=payload,
-                        chat_stage=None,
-                    )
+                    self._pending_acks.append((sender_name, payload))
 
                 except (RuntimeError, asyncio.TimeoutError) as e:
                     logger.warning(
@@ -229,6 +437,8 @@ class WebSocketDeliveryManager:
                     self.pending_messages.appendleft((sender_name, payload))
                     self._pending_set.add((sender_name, payload))
                     break
+
+            await self._flush_acks()
         except RedisError as e:
             error_msg = f"Operation failed: {e}"
             logger.warning(
@@ -251,3 +461,15 @@ class WebSocketDeliveryManager:
             data,
             self.websocket.send_json,
         )
+
+    async def send_transient_json(self, data: dict) -> bool:
+        """
+        Send a frame once, without retries or redelivery (e.g. a streamed delta).
+        """
+        if not self.ws_connected():
+            return False
+        try:
+            await asyncio.wait_for(self.websocket.send_json(data), timeout=MAX_SEND_TIME_BEFORE_RETRY)
+        except (RuntimeError, asyncio.TimeoutError):
+            return False
+        return True
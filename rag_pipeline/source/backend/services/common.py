@@ -1,43 +1,78 @@
-from typing import Optional
-from types import FrameType
+from typing import Optional, Sequence
+from types import CodeType, FrameType
 import inspect
+import math
+
+import tiktoken
+
+
+_SKIP_NAMES = frozenset({
+    'run_until_complete', 'call_and_report',
+    'pytest_pyfunc_call', 'pytest_runtest_call',
+    '_execute', '_run_module_code', 'runtestprotocol',
+    'inner', 'run', '__call__', 'run_forever',
+    'pytest_runtest_protocol', 'pytest_runtestloop',
+    'wrap_session', 'async_wrapper',
+    'run_path', '<lambda>', '_run_once', 'main',
+    'from_call', '_run', '<module>',
+    '_hookexec', '_main',
+    '_run_code', 'runtest', '_run_module_as_main',
+    '_multicall', 'pytest_cmdline_main', 'run_file'
+})
+
+# Qualified name per code object, ``None`` for frames that are skipped.
+_frame_names: dict[CodeType, Optional[str]] = {}
+
+
+def _frame_name(frame: FrameType) -> Optional[str]:
+    code = frame.f_code
+    try:
+        return _frame_names[code]
+    except KeyError:
+        pass
+
+    function_name = code.co_name
+    if function_name in _SKIP_NAMES or "tenacity" in code.co_filename:
+        name = None
+    else:
+        module = frame.f_globals.get("__name__", "")
+        name = f"{module}.{function_name}"
+
+    _frame_names[code] = name
+    return name
 
 
 def get_caller_name(depth: int = 0) -> str:
     """
     Get caller name.
-    """
-
-    skip_names = {
-        'run_until_complete', 'call_and_report',
-        'pytest_pyfunc_call', 'pytest_runtest_call',
-        '_execute', '_run_module_code', 'runtestprotocol',
-        'inner', 'run', '__call__', 'run_forever',
-        'pytest_runtest_protocol', 'pytest_runtestloop',
-        'wrap_session', 'async_wrapper',
-        'run_path', '<lambda>', '_run_once', 'main',
-        'from_call', '_run', '<module>',
-        '_hookexec', '_main',
-        '_run_code', 'runtest', '_run_module_as_main',
-        '_multicall', 'pytest_cmdline_main', 'run_file'
-    }
 
+    Frames are counted from this function itself, skipping runner and
+    wrapper frames. Names are cached per code object, so a lookup is a
+    handful of dict hits. Call it only on paths that emit a log record.
+    """
     frame: Optional[FrameType] = inspect.currentframe()
     filtered_depth = 0
 
     while frame:
-        function_name = frame.f_code.co_name
-        filename = frame.f_code.co_filename
-
-        if (
-            function_name not in skip_names
-            and "tenacity" not in filename
-        ):
+        name = _frame_name(frame)
+        if name is not None:
             if filtered_depth == depth:
-                module = frame.f_globals.get("__name__", "")
-                return f"{module}.{function_name}"
+                return name
             filtered_depth += 1
 
         frame = frame.f_back
 
     return "<unknown>"
+
+
+enc = tiktoken.get_encoding("cl100k_base")
+
+
+def count_tokens(text: str) -> int:
+    return len(enc.encode(text))
+
+
+def cosine_similarity(a: Sequence[float], b: Sequence[float]) -> float:
+    dot = math.fsum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(math.fsum(x * x for x in a)) * math.sqrt(math.fsum(y * y for y in b))
+    return dot / norm if norm else 0.0
@@ -0,0 +1,166 @@
+"""Named bounded thread pools for blocking work called from the event loop."""
+from typing import Any, Callable, TypeVar
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+import threading
+import asyncio
+import logging
+
+from logging_setup import log_extra
+import project_settings as proj_settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ExecutorSaturatedError(RuntimeError):
+    """Raised when an executor with admission control has a full queue."""
+
+    def __init__(self, name: str, queued: int):
+        super().__init__(f"Executor '{name}' is saturated: {queued} calls queued")
+        self.name = name
+        self.queued = queued
+
+
+@dataclass
+class ExecutorStats:
+    name: str
+    max_workers: int
+    max_queue: int
+    in_flight: int
+    queued: int
+    peak_queued: int
+    rejected: int
+
+
+class BoundedExecutor:
+    """
+    Named thread pool that caps how many blocking calls run at once.
+
+    ``max_queue`` enables admission control: once that many calls wait
+    for a free worker, new calls fail fast with ``ExecutorSaturatedError``
+    instead of piling up. ``0`` keeps the queue unbounded.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int = 0):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix=f"{name}-executor",
+        )
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._queued = 0
+        self._peak_queued = 0
+        self._rejected = 0
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run a blocking call in the pool without blocking the event loop.
+        """
+        self._admit()
+        ticket = _Ticket()
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                self._pool, partial(self._call, ticket, partial(func, *args, **kwargs))
+            )
+        except asyncio.CancelledError:
+            self._abandon(ticket)
+            raise
+
+    def stats(self) -> ExecutorStats:
+        with self._lock:
+            return ExecutorStats(
+                name=self.name,
+                max_workers=self.max_workers,
+                max_queue=self.max_queue,
+                in_flight=self._in_flight,
+                queued=self._queued,
+                peak_queued=self._peak_queued,
+                rejected=self._rejected,
+            )
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _admit(self) -> None:
+        with self._lock:
+            pending = self._queued
+            if self.max_queue and pending >= self.max_queue:
+                self._rejected += 1
+            else:
+                self._queued += 1
+                self._peak_queued = max(self._peak_queued, self._queued)
+                return
+
+        logger.warning(
+            "Executor queue is full, call rejected",
+            extra=log_extra(
+                event="executor.saturated",
+                executor=self.name,
+                queued=pending,
+                max_queue=self.max_queue,
+            ),
+        )
+        raise ExecutorSaturatedError(self.name, pending)
+
+    def _call(self, ticket: "_Ticket", func: Callable[[], T]) -> T:
+        with self._lock:
+            if ticket.abandoned:
+                raise asyncio.CancelledError()
+            ticket.started = True
+            self._queued -= 1
+            self._in_flight += 1
+        try:
+            return func()
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def _abandon(self, ticket: "_Ticket") -> None:
+        # A call cancelled before a worker picked it up never reaches ``_call``.
+        with self._lock:
+            if not ticket.started:
+                ticket.abandoned = True
+                self._queued -= 1
+
+
+class _Ticket:
+    __slots__ = ("started", "abandoned")
+
+    def __init__(self) -> None:
+        self.started = False
+        self.abandoned = False
+
+
+# LLM generation: slow, bounded by the Ollama/Cohere backend.
+LLM_EXECUTOR = BoundedExecutor(
+    "llm", proj_settings.LLM_EXECUTOR_WORKERS, proj_settings.LLM_EXECUTOR_MAX_QUEUE,
+)
+# Query embedding and vector search.
+EMBEDDING_EXECUTOR = BoundedExecutor(
+    "embedding", proj_settings.EMBEDDING_EXECUTOR_WORKERS, proj_settings.EMBEDDING_EXECUTOR_MAX_QUEUE,
+)
+# Sync SQL and document store calls that have no async driver.
+DB_EXECUTOR = BoundedExecutor(
+    "db", proj_settings.DB_EXECUTOR_WORKERS, proj_settings.DB_EXECUTOR_MAX_QUEUE,
+)
+
+EXECUTORS = (LLM_EXECUTOR, EMBEDDING_EXECUTOR, DB_EXECUTOR)
+
+
+def get_executor_stats() -> list[ExecutorStats]:
+    """
+    Get queue-depth metrics of every named executor.
+    """
+    return [executor.stats() for executor in EXECUTORS]
+
+
+def shutdown_executors() -> None:
+    for executor in EXECUTORS:
+        executor.shutdown()
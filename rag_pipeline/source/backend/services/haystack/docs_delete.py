@@ -1,10 +1,11 @@
-from params.request_params import SessionDep
+from params.request_params import SyncSessionDep
 from models.orm.document import DocumentDB
 import routes.helpers.response_constants as rc
 from services.celery_tasks.helpers.indexing import filter_documents_with_retry, delete_documents_with_retry
+from services.storage.answer_cache import ANSWER_CACHE
 
 
-def delete_document(db: SessionDep,
+def delete_document(db: SyncSessionDep,
                     doc_id: int):
     """
     Delete document.
@@ -25,6 +26,7 @@ def delete_document(db: SessionDep,
     chunk_ids_to_delete = [chunk.id for chunk in chunks]
     if chunk_ids_to_delete:
         delete_documents_with_retry(chunk_ids_to_delete)
+    ANSWER_CACHE.invalidate_documents([doc_id])
 
     if document:
         db.delete(document)
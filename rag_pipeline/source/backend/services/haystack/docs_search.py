@@ -7,8 +7,8 @@ from sqlmodel import select, func
 from haystack_pipelines.initializator import SEARCH_PIPELINE
 from models.schemas.document import QueryContext, QueryKeyword
 from models.orm.document import DocumentDB
-from params.request_params import SessionDep
-from services.chat_session.helpers.common import count_tokens
+from params.request_params import SyncSessionDep
+from services.common import count_tokens
 from services.celery_tasks.helpers.common import run_celery_task
 from services.celery_tasks.common_tasks import update_tokens
 from logging_setup import LogContext
@@ -17,12 +17,7 @@ from services.common import get_caller_name
 logger = logging.getLogger(__name__)
 
 
-def search_document_context(db: SessionDep, query: QueryContext) -> dict:
-    logging_context = LogContext(
-        callee_name=get_caller_name(2),
-        caller_name=get_caller_name(3),
-    ).model_dump()
-
+def search_document_context(db: SyncSessionDep, query: QueryContext) -> dict:
     try:
         pipeline_result: dict = SEARCH_PIPELINE.run(
             {
@@ -31,12 +26,17 @@ def search_document_context(db: SessionDep, query: QueryContext) -> dict:
             }
         )
 
-    except CircuitBreakerError as e:
-        warn_msg = f"Operation failed: {e}"
-        logger.warning(warn_msg, extra=logging_context)
-        return {"total_count": query.top_k, "offset": 0, "documents": []}
-
     except Exception as e:
+        logging_context = LogContext(
+            callee_name=get_caller_name(2),
+            caller_name=get_caller_name(3),
+        ).model_dump()
+
+        if isinstance(e, CircuitBreakerError):
+            warn_msg = f"Operation failed: {e}"
+            logger.warning(warn_msg, extra=logging_context)
+            return {"total_count": query.top_k, "offset": 0, "documents": []}
+
         err_msg = f"Operation failed: {e}"
         logger.warning(err_msg, extra=logging_context)
         raise
@@ -65,7 +65,7 @@ def search_document_context(db: SessionDep, query: QueryContext) -> dict:
     return {"total_count": query.top_k, "offset": 0, "documents": documents}
 
 
-def search_documents_keyword(db: SessionDep, query: QueryKeyword):
+def search_documents_keyword(db: SyncSessionDep, query: QueryKeyword):
     stmt1 = (
         select(func.count())
         .select_from(DocumentDB)
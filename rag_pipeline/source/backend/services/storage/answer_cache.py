@@ -0,0 +1,185 @@
+"""Cache of ANSWERING stage replies shared by every chat."""
+from typing import Awaitable, Iterable, Optional, Sequence, cast
+from hashlib import sha256
+import logging
+import json
+import re
+
+from redis.exceptions import RedisError
+
+from logging_setup import log_extra
+from services.common import cosine_similarity
+from .redis_pools import get_async_redis, get_sync_redis
+from project_settings import (
+    ANSWER_CACHE_ENABLED,
+    ANSWER_CACHE_TTL,
+    ANSWER_CACHE_SIMILARITY,
+    ANSWER_CACHE_MAX_PER_BUCKET,
+)
+
+logger = logging.getLogger(__name__)
+
+_PUNCTUATION = re.compile(r"[^\w\s]", re.UNICODE)
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    return _SPACES.sub(" ", _PUNCTUATION.sub(" ", query.lower())).strip()
+
+
+class AnswerCache:
+    """
+    Answers keyed by the retrieved chunks, the language and the query.
+
+    A bucket holds the answers given for one set of chunk IDs in one
+    language. Chunk IDs are content hashes, so they also pin the version
+    of every chunk. Inside a bucket an answer is found by the normalized
+    query, or by the query embedding within ``similarity`` of a cached
+    one. Each referenced document keeps a set of its buckets, so that
+    re-indexing or deleting it drops every answer built on it.
+    """
+
+    def __init__(self,
+                 enabled: bool = ANSWER_CACHE_ENABLED,
+                 ttl_seconds: int = ANSWER_CACHE_TTL,
+                 similarity: float = ANSWER_CACHE_SIMILARITY,
+                 max_per_bucket: int = ANSWER_CACHE_MAX_PER_BUCKET,
+                 key_prefix: str = "answer_cache",
+                 ):
+        self.enabled = enabled
+        self.ttl = ttl_seconds
+        self.similarity = similarity
+        self.max_per_bucket = max_per_bucket
+        self.prefix = key_prefix
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    def bucket_key(self, chunk_ids: Iterable[str], lang: str) -> str:
+        digest = sha256("\n".join(sorted(chunk_ids)).encode("utf-8")).hexdigest()
+        return f"{self.prefix}:{lang.lower()}:{digest}"
+
+    def document_key(self, document_id: int | str) -> str:
+        return f"{self.prefix}:doc:{document_id}"
+
+    async def get(self,
+                  query: str,
+                  chunk_ids: Sequence[str],
+                  lang: str,
+                  query_embedding: Optional[Sequence[float]] = None,
+                  ) -> Optional[str]:
+        """
+        Get a cached answer for the query over these chunks.
+        """
+        if not self.enabled or not chunk_ids:
+            return None
+
+        bucket = self.bucket_key(chunk_ids, lang)
+        redis = get_async_redis()
+        try:
+            raw = await cast(Awaitable[Optional[str]],
+                             redis.hget(bucket, normalize_query(query)))
+            if raw is not None:
+                self.exact_hits += 1
+                return str(json.loads(raw)["answer"])
+
+            if query_embedding is None or self.similarity >= 1:
+                self.misses += 1
+                return None
+
+            entries = await cast(Awaitable[list[str]], redis.hvals(bucket))
+        except RedisError as e:
+            self._log_redis_error(e)
+            return None
+
+        best_answer, best_score = None, self.similarity
+        for raw in entries:
+            entry = json.loads(raw)
+            if not entry.get("embedding"):
+                continue
+            score = cosine_similarity(query_embedding, entry["embedding"])
+            if score >= best_score:
+                best_answer, best_score = entry["answer"], score
+
+        if best_answer is None:
+            self.misses += 1
+            return None
+
+        self.semantic_hits += 1
+        return str(best_answer)
+
+    async def set(self,
+                  query: str,
+                  chunk_ids: Sequence[str],
+                  document_ids: Iterable[str],
+                  lang: str,
+                  answer: str,
+                  query_embedding: Optional[Sequence[float]] = None,
+                  ) -> None:
+        """
+        Store an answer and register its bucket with every source document.
+        """
+        if not self.enabled or not chunk_ids:
+            return
+
+        bucket = self.bucket_key(chunk_ids, lang)
+        entry = json.dumps(
+            {"answer": answer, "embedding": list(query_embedding or [])},
+            ensure_ascii=False,
+        )
+        redis = get_async_redis()
+        try:
+            if await cast(Awaitable[int], redis.hlen(bucket)) >= self.max_per_bucket:
+                return
+
+            pipe = redis.pipeline(transaction=False)
+            pipe.hset(bucket, normalize_query(query), entry)
+            pipe.expire(bucket, self.ttl)
+            for document_id in set(document_ids):
+                pipe.sadd(self.document_key(document_id), bucket)
+                pipe.expire(self.document_key(document_id), self.ttl)
+            await pipe.execute()
+        except RedisError as e:
+            self._log_redis_error(e)
+
+    def invalidate_documents(self, document_ids: Iterable[int | str]) -> int:
+        """
+        Drop every cached answer built on the documents (sync, for workers).
+
+        :return: Number of buckets removed.
+        """
+        doc_keys = [self.document_key(document_id) for document_id in document_ids]
+        if not doc_keys:
+            return 0
+
+        redis = get_sync_redis()
+        try:
+            pipe = redis.pipeline(transaction=False)
+            for doc_key in doc_keys:
+                pipe.smembers(doc_key)
+            buckets = set().union(*pipe.execute())
+
+            if buckets:
+                redis.delete(*buckets)
+            redis.delete(*doc_keys)
+        except RedisError as e:
+            self._log_redis_error(e)
+            return 0
+
+        return len(buckets)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "exact_hits": self.exact_hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+        }
+
+    def _log_redis_error(self, e: RedisError) -> None:
+        logger.warning(
+            f"Answer cache unavailable: {e}",
+            extra=log_extra(event="answer_cache.redis_unavailable"),
+        )
+
+
+ANSWER_CACHE = AnswerCache()
@@ -1,12 +1,10 @@
 from uuid import UUID
-from redis.asyncio import Redis as RedisAsync
-from redis import Redis as RedisSync
 
 from .helpers.async_redis_manager import RedisChatMemoryFastAPI
 from .helpers.sync_redis_manager import RedisChatMemoryCelery
+from .redis_pools import get_async_redis, get_sync_redis
 from project_settings import (
     CHAT_WINDOW_SIZE,
-    REDIS_URL,
     DEFAULT_TTL_SECONDS,
     DEFAULT_TTL_BUFFER_SECONDS
 )
@@ -17,8 +15,11 @@ async def get_chat_memory_fastapi(
 ) -> RedisChatMemoryFastAPI:
     """
     Get chat memory fastapi.
+
+    All managers share the process-wide connection pool opened in the
+    FastAPI lifespan instead of creating a pool per WebSocket connection.
     """
-    redis = await RedisAsync.from_url(REDIS_URL, decode_responses=True)
+    redis = get_async_redis()
     return RedisChatMemoryFastAPI(
         redis,
         chat_passport_id=chat_passport_id,
@@ -34,7 +35,7 @@ def get_chat_memory_celery(
     """
     Get chat memory celery.
     """
-    redis = RedisSync.from_url(REDIS_URL, decode_responses=True)
+    redis = get_sync_redis()
     return RedisChatMemoryCelery(
         redis,
         chat_passport_id=chat_passport_id,
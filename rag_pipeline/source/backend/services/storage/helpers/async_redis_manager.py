@@ -1,21 +1,27 @@
 from typing import Optional, Any, TypeVar
 from uuid import UUID
+from dataclasses import dataclass, field
 import logging
 import json
 
-from logging_setup import LogContext
 from redis.asyncio import Redis as RedisAsync
 from haystack.dataclasses import ChatMessage
 
 from models.orm.chat import ChatStage
 from .storage_decorators import with_retry, no_retry
 from .storage_root_class_async import BaseRedisAsyncManager
+from .storage_scripts import (
+    APPEND_MESSAGE,
+    DRAIN_INBOX_TO_MESSAGES,
+    ADD_PENDING_MESSAGE,
+    ACK_PENDING_MESSAGES,
+)
 from .storage_lock_manager import RedisLockManagerFastAPI
 from .storage_context_manager import RedisUserContextyFastAPI
 from .storage_classification_manager import RedisClassifStageFastAPI
 from .storage_extraction_manager import RedisExtraxctStageFastAPI
 from .storage_last_stages_manager import RedisLastStagesFastAPI
-from services.chat_constants import SYSTEM_PROMPT_CHAT_INIT
+from .storage_outbound_stream_manager import RedisOutboundStreamFastAPI
 from project_settings import (
     CHAT_WINDOW_SIZE,
     DEFAULT_TTL_SECONDS,
@@ -29,6 +35,18 @@ no_retry_async = no_retry(is_async=True)
 T = TypeVar("T")
 
 
+@dataclass
+class SessionState:
+    """Chat session keys read from Redis in one round-trip."""
+    chat_stage: Optional[str] = None
+    summary: Optional[str] = None
+    user_context: Optional[ChatMessage] = None
+    last_msg_idx: int = 0
+    messages: list[ChatMessage] = field(default_factory=list)
+    lang: Optional[str] = None
+    search_queries: list[str] = field(default_factory=list)
+
+
 class RedisChatMemoryFastAPI(BaseRedisAsyncManager):
     """Base class for Redis-backed chat memory operations."""
 
@@ -52,6 +70,7 @@ class RedisChatMemoryFastAPI(BaseRedisAsyncManager):
         self.classify = RedisClassifStageFastAPI(*args)
         self.extract = RedisExtraxctStageFastAPI(*args)
         self.closure = RedisLastStagesFastAPI(*args)
+        self.outbound = RedisOutboundStreamFastAPI(*args)
 
     @with_retry_async
     async def set_start_msg_index(self,
@@ -78,24 +97,13 @@ class RedisChatMemoryFastAPI(BaseRedisAsyncManager):
         :param chat_stage: Current chat stage used for logging and state handling.
         """
 
-        lua_script = """
-        local idx = redis.call("INCR", KEYS[1])
-        redis.call("EXPIRE", KEYS[1], ARGV[2])
-        redis.call("ZADD", KEYS[2], idx, ARGV[1])
-        redis.call("EXPIRE", KEYS[2], ARGV[2])
-        return idx
-        """
-
         payload = self._serialize_message(message)
 
-        msg_idx = await self._typefix(self.redis.eval(
-            lua_script,
-            2,
-            self._message_idx_key,
-            self._messages_key,
-            payload,
-            self.ttl,
-        ))
+        msg_idx = await self._run_script(
+            APPEND_MESSAGE,
+            [self._message_idx_key, self._messages_key],
+            [payload, self.ttl],
+        )
         return int(msg_idx)
 
     @with_retry_async
@@ -105,35 +113,54 @@ class RedisChatMemoryFastAPI(BaseRedisAsyncManager):
         """
         Get messages.
         """
-        logging_context = LogContext(
-            chat_stage=chat_stage,
-        ).model_dump(exclude_unset=True)
-
-        messages: list[ChatMessage] = []
-
-        prompt = ChatMessage.from_system(SYSTEM_PROMPT_CHAT_INIT)
-        messages.append(prompt)
-
-        user_context = await self.context.get_user_context(**logging_context)
-        if user_context:
-            messages.append(user_context)
-
-        summary = await self.get_summary(**logging_context)
-        if summary:
-            messages.append(
-                ChatMessage.from_system(
-                    f"Conversation summary so far:\n{summary}"
-                )
-            )
-
         raw = await self.redis.zrange(self._messages_key, 0, -1,)
 
-        messages = [
+        return [
             self._deserialize_message(r, chat_stage)
             for r in raw
         ]
 
-        return messages
+    @with_retry_async
+    async def get_session_state(self,
+                                chat_stage: ChatStage | str | None = None
+                                ) -> SessionState:
+        """
+        Get session state.
+
+        Reads every key needed to resume or continue a chat in a single
+        MULTI/EXEC, so the snapshot is consistent and costs one round-trip.
+        """
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.get(self._chat_stage_key)
+        pipe.get(self._summary_key)
+        pipe.get(self._user_context_key)
+        pipe.get(self._message_idx_key)
+        pipe.zrange(self._messages_key, 0, -1)
+        pipe.get(self._lang_key)
+        pipe.lrange(self._search_queries_key, 0, -1)
+
+        (
+            stored_stage,
+            summary,
+            user_context,
+            last_msg_idx,
+            raw_messages,
+            lang,
+            search_queries,
+        ) = await pipe.execute()
+
+        return SessionState(
+            chat_stage=stored_stage,
+            summary=summary,
+            user_context=ChatMessage.from_system(user_context) if user_context else None,
+            last_msg_idx=int(last_msg_idx) if last_msg_idx else 0,
+            messages=[
+                self._deserialize_message(r, chat_stage)
+                for r in raw_messages
+            ],
+            lang=lang,
+            search_queries=search_queries,
+        )
 
     @with_retry_async
     async def add_to_inbox(self,
@@ -159,31 +186,31 @@ class RedisChatMemoryFastAPI(BaseRedisAsyncManager):
         return await self._typefix(self.redis.llen(self._inbox_key)) > 0
 
     @with_retry_async
-    async def drain_inbox(self,
-                          chat_stage: ChatStage | str | None = None
-                          ) -> list[str]:
+    async def drain_inbox_to_messages(self,
+                                      chat_stage: ChatStage | str | None = None
+                                      ) -> list[tuple[int, str]]:
         """
-        Execute drain inbox.
-
-        :param chat_stage: Current chat stage used for logging and state handling.
-        """
-        inbox = self._inbox_key
-        processing = self._processing_key
-
-        messages: list[str] = []
+        Move every inbox message to the message history in one call.
 
-        while True:
-            msg = await self.redis.lmove(
-                inbox,
-                processing,
-                src="LEFT",
-                dest="RIGHT"
-            )
-            if msg is None:
-                break
-            messages.append(msg)
+        The script empties the inbox, reserves a contiguous block of message
+        indices with a single INCRBY and adds each message as a user turn.
 
-        return messages
+        :param chat_stage: Current chat stage used for logging and state handling.
+        :return: ``(msg_idx, text)`` pairs in arrival order.
+        """
+        result = await self._run_script(
+            DRAIN_INBOX_TO_MESSAGES,
+            [self._inbox_key, self._message_idx_key, self._messages_key],
+            [self.ttl],
+        )
+        if not result:
+            return []
+
+        first_idx = int(result[0])
+        return [
+            (first_idx + offset, text)
+            for offset, text in enumerate(result[1:])
+        ]
 
     @with_retry_async
     async def get_inbox_size(self,
@@ -195,17 +222,6 @@ class RedisChatMemoryFastAPI(BaseRedisAsyncManager):
         key = self._inbox_key
         return await self._get_list_len(key)
 
-    @with_retry_async
-    async def clear_processing(self,
-                               chat_stage: ChatStage | str | None = None
-                               ):
-        """
-        Execute clear processing.
-
-        :param chat_stage: Current chat stage used for logging and state handling.
-        """
-        await self.redis.delete(self._processing_key)
-
     @with_retry_async
     async def get_last_message_idx(self,
                                    chat_stage: ChatStage | str | None = None):
@@ -292,24 +308,16 @@ class RedisChatMemoryFastAPI(BaseRedisAsyncManager):
         """
         Execute add pending message.
 
+        The outbox is a ZSET scored by an insertion counter, so the payload
+        itself is the dedupe key and ordering survives removals.
+
         :param chat_stage: Current chat stage used for logging and state handling.
         """
-        key = self._pending_messages_key
-
-        # Serialize payload to compact JSON.
-        value = json.dumps(
-            {"sender": sender_name, "payload": payload}, ensure_ascii=False)
-
-        existing = await self._typefix(self.redis.lrange(key, 0, -1))
-        if isinstance(existing, list):
-            existing_strs = [
-                e.decode("utf-8") if isinstance(e, bytes) else e for e in existing]
-            if value in existing_strs:
-                return  # Return the result to the caller.
-
-        await self._typefix(self.redis.rpush(key, value))
-        # Set TTL for the buffered pending message list.
-        await self.redis.expire(key, self.ttl_buffer)
+        await self._run_script(
+            ADD_PENDING_MESSAGE,
+            [self._pending_messages_key, self._pending_seq_key],
+            [self._serialize_pending(sender_name, payload), self.ttl_buffer],
+        )
 
     @with_retry_async
     async def get_pending_messages(self,
@@ -318,13 +326,10 @@ class RedisChatMemoryFastAPI(BaseRedisAsyncManager):
         """
         Get pending messages.
         """
-        key = self._pending_messages_key
-        items = await self._typefix(self.redis.lrange(key, 0, -1))
+        items = await self.redis.zrange(self._pending_messages_key, 0, -1)
         result = []
 
         for i in items:
-            if isinstance(i, bytes):
-                i = i.decode("utf-8")
             obj = json.loads(i)
             result.append((obj["sender"], obj["payload"]))
 
@@ -341,8 +346,35 @@ class RedisChatMemoryFastAPI(BaseRedisAsyncManager):
 
         :param chat_stage: Current chat stage used for logging and state handling.
         """
-        key = self._pending_messages_key
-        value = json.dumps(
-            {"sender": sender_name, "payload": payload}, ensure_ascii=False)
+        await self._run_script(
+            ACK_PENDING_MESSAGES,
+            [self._pending_messages_key, self._pending_seq_key],
+            [self._serialize_pending(sender_name, payload)],
+        )
+
+    @no_retry_async
+    async def pop_pending_messages(self,
+                                   items: list[tuple[str, Any]],
+                                   chat_stage: ChatStage | str | None = None,
+                                   ):
+        """
+        Acknowledge several pending messages in one call.
+
+        :param items: ``(sender_name, payload)`` pairs to remove.
+        :param chat_stage: Current chat stage used for logging and state handling.
+        """
+        if not items:
+            return
+
+        await self._run_script(
+            ACK_PENDING_MESSAGES,
+            [self._pending_messages_key, self._pending_seq_key],
+            [self._serialize_pending(sender_name, payload) for sender_name, payload in items],
+        )
 
-        await self._typefix(self.redis.lrem(key, 1, value))
+    def _serialize_pending(self, sender_name: str, payload: Any) -> str:
+        """
+        Serialize pending.
+        """
+        return json.dumps(
+            {"sender": sender_name, "payload": payload}, ensure_ascii=False)
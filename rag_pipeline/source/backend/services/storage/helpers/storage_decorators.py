@@ -1,14 +1,10 @@
 
-from typing import Any, Callable, Union, NoReturn, TypeVar, Awaitable
+from typing import Any, Callable, Union, NoReturn, TypeVar
+from dataclasses import dataclass
+import asyncio
 import logging
 import inspect
-from tenacity import (
-    retry,
-    stop_after_attempt,
-    wait_exponential,
-    retry_if_exception,
-    RetryCallState,
-)
+import time
 import json
 from functools import wraps
 
@@ -52,19 +48,6 @@ CriticalErrors = (
 )
 
 
-def _is_transient_error(exc: BaseException) -> bool:
-    if isinstance(exc, (AuthenticationError, ResponseError)):
-        return False
-
-    return isinstance(exc, (
-        ConnectionError,
-        TimeoutError,
-        BusyLoadingError,
-        ClusterDownError,
-        TryAgainError,
-    ))
-
-
 def log_and_raise_exception(error_msg: str,
                             context: LogContext,
                             e: RedisError | KeyError | json.JSONDecodeError | ValueError
@@ -76,89 +59,156 @@ def log_and_raise_exception(error_msg: str,
     raise e
 
 
-def with_retry(is_async: bool = True):
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Retry schedule shared by every decorated storage method."""
+    attempts: int
+    backoff_sec: tuple[float, ...]
+
+    @classmethod
+    def exponential(cls,
+                    attempts: int,
+                    multiplier: float,
+                    min_sec: float,
+                    max_sec: float,
+                    ) -> "RetryPolicy":
+        """
+        Precompute exponential backoff delays between attempts.
+        """
+        return cls(
+            attempts=attempts,
+            backoff_sec=tuple(
+                min(max(multiplier * 2 ** i, min_sec), max_sec)
+                for i in range(attempts - 1)
+            ),
+        )
+
+
+REDIS_RETRY_POLICY = RetryPolicy.exponential(
+    attempts=3,
+    multiplier=0.5,
+    min_sec=0.5,
+    max_sec=5,
+)
+
+
+def _context_builder(func: Callable[..., Any],
+                     caller_depth: int,
+                     ) -> Callable[[tuple[Any, ...], dict[str, Any]], LogContext]:
+    """
+    Resolve ``chat_stage`` position once so that the logging context is
+    only built when an error is actually reported.
+    """
+    callee_name = func.__name__
+    parameters = inspect.signature(func).parameters
+    param_names = list(parameters)
+
+    stage_idx: int | None = None
+    stage_default: Any = None
+    if "chat_stage" in parameters:
+        stage_idx = param_names.index("chat_stage")
+        default = parameters["chat_stage"].default
+        stage_default = None if default is inspect.Parameter.empty else default
+
+    def build_context(args: tuple[Any, ...], kwargs: dict[str, Any]) -> LogContext:
+        chat_stage = stage_default
+        if stage_idx is not None:
+            if "chat_stage" in kwargs:
+                chat_stage = kwargs["chat_stage"]
+            elif stage_idx < len(args):
+                chat_stage = args[stage_idx]
+
+        return LogContext(
+            # args[0] = self
+            chat_passport_id=(
+                args[0].chat_passport_id
+                if len(args) and hasattr(args[0], "chat_passport_id")
+                else None
+            ),
+            caller_name=get_caller_name(caller_depth),
+            callee_name=callee_name,
+            chat_stage=chat_stage,
+        )
+
+    return build_context
+
+
+def _log_retry(exc: BaseException, context: LogContext) -> None:
+    logger.warning(
+        str(exc) or "Transient Redis error",
+        extra=context.model_dump(),
+    )
+
+
+async def _retry_async(func: Callable[..., Any],
+                       args: tuple[Any, ...],
+                       kwargs: dict[str, Any],
+                       error: BaseException,
+                       context: LogContext,
+                       policy: RetryPolicy,
+                       ) -> Any:
+    for delay in policy.backoff_sec:
+        _log_retry(error, context)
+        await asyncio.sleep(delay)
+        try:
+            return await func(*args, **kwargs)
+        except CriticalErrors as e:
+            log_and_raise_exception(f"Operation failed: {e}", context, e)
+        except TransientErrors as e:
+            error = e
+
+    raise error
+
+
+def _retry_sync(func: Callable[..., Any],
+                args: tuple[Any, ...],
+                kwargs: dict[str, Any],
+                error: BaseException,
+                context: LogContext,
+                policy: RetryPolicy,
+                ) -> Any:
+    for delay in policy.backoff_sec:
+        _log_retry(error, context)
+        time.sleep(delay)
+        try:
+            return func(*args, **kwargs)
+        except CriticalErrors as e:
+            log_and_raise_exception(f"Operation failed: {e}", context, e)
+        except TransientErrors as e:
+            error = e
+
+    raise error
+
+
+def with_retry(is_async: bool = True, policy: RetryPolicy = REDIS_RETRY_POLICY):
+    """
+    Retry transient Redis errors according to ``policy``.
+
+    The happy path is a plain call: the signature is inspected once at
+    decoration time, while the logging context and caller lookup are built
+    only after an error.
+    """
     def decorator(func: Callable[..., Any]):
+        # get_caller_name frames: itself, build_context, [wrapper], caller.
+        build_context = _context_builder(func, caller_depth=2 if is_async else 3)
 
         @wraps(func)
         async def async_wrapper(*args: Any, **kwargs: Any):
-            return await _execute(func, args, kwargs, is_async=True)
+            try:
+                return await func(*args, **kwargs)
+            except CriticalErrors as e:
+                log_and_raise_exception(f"Operation failed: {e}", build_context(args, kwargs), e)
+            except TransientErrors as e:
+                return await _retry_async(func, args, kwargs, e, build_context(args, kwargs), policy)
 
         @wraps(func)
         def sync_wrapper(*args: Any, **kwargs: Any):
-            return _execute(func, args, kwargs, is_async=False)
-
-        def _execute(
-            func: Callable[..., Any],
-            args: tuple[Any, ...],
-            kwargs: dict[str, Any],
-            is_async: bool
-        ) -> T | Awaitable[T]:
-            callee_name = func.__name__
-            caller_name = get_caller_name(1 if is_async else 2)
-
-            signature = inspect.signature(func)
-            bound_args = signature.bind_partial(*args, **kwargs)
-            bound_args.apply_defaults()
-            args_with_names = bound_args.arguments
-            chat_passport_id = (
-                args[0].chat_passport_id
-                if len(args) and hasattr(args[0], "chat_passport_id")
-                else None
-            )
-
-            context = LogContext(
-                # args[0] = self
-                chat_passport_id=chat_passport_id,
-                caller_name=caller_name,
-                callee_name=callee_name,
-                chat_stage=args_with_names.get("chat_stage"),
-            )
-
-            def before_sleep_with_context(
-                retry_state: RetryCallState
-            ) -> None:
-                exc = (
-                    retry_state.outcome.exception()
-                    if retry_state.outcome
-                    else None
-                )
-
-                error_message = str(exc) if exc else "Transient Redis error"
-
-                logger.warning(
-                    error_message,
-                    extra=context.model_dump(),
-                )
-
-            redis_retry = retry(
-                retry=retry_if_exception(_is_transient_error),
-                stop=stop_after_attempt(3),
-                wait=wait_exponential(
-                    multiplier=0.5,
-                    min=0.5,
-                    max=5,
-                ),
-                before_sleep=before_sleep_with_context,
-                reraise=True,
-            )
-
-            @redis_retry
-            async def async_call():
-                try:
-                    return await func(*args, **kwargs)
-                except CriticalErrors as e:
-                    error_msg = f"Operation failed: {e}"
-                    log_and_raise_exception(error_msg, context, e)
-
-            @redis_retry
-            def sync_call():
-                try:
-                    return func(*args, **kwargs)
-                except CriticalErrors as e:
-                    error_msg = f"Operation failed: {e}"
-                    log_and_raise_exception(error_msg, context, e)
-
-            return async_call() if is_async else sync_call()
+            try:
+                return func(*args, **kwargs)
+            except CriticalErrors as e:
+                log_and_raise_exception(f"Operation failed: {e}", build_context(args, kwargs), e)
+            except TransientErrors as e:
+                return _retry_sync(func, args, kwargs, e, build_context(args, kwargs), policy)
 
         return async_wrapper if is_async else sync_wrapper
 
@@ -171,39 +221,22 @@ def no_retry(is_async: bool = True):
     """
 
     def decorator(func: Callable[..., Any]):
+        build_context = _context_builder(func, caller_depth=2 if is_async else 3)
 
         @wraps(func)
-        def sync_wrapper(*args: Any, **kwargs: Any):
-            callee_name = func.__name__
-            caller_name = get_caller_name(4)
-
-            signature = inspect.signature(func)
-            bound_args = signature.bind_partial(*args, **kwargs)
-            bound_args.apply_defaults()
-            # OrderedDict {arg_name: value}
-            args_with_names = bound_args.arguments
-
-            # Build logging context for error reporting.
-            context = LogContext(
-                # args[0] == self
-                chat_passport_id=args[0].chat_passport_id,
-                caller_name=caller_name,
-                callee_name=callee_name,
-                chat_stage=args_with_names.get("chat_stage"),
-            )
+        async def async_wrapper(*args: Any, **kwargs: Any):
+            try:
+                return await func(*args, **kwargs)
+            except RedisError as e:
+                log_and_raise_exception(f"Operation failed: {e}", build_context(args, kwargs), e)
 
+        @wraps(func)
+        def sync_wrapper(*args: Any, **kwargs: Any):
             try:
                 return func(*args, **kwargs)
-
             except RedisError as e:
-                error_msg = f"Operation failed: {e}"
-                log_and_raise_exception(error_msg, context, e)
-
-        if is_async:
-            async def async_wrapper(*args: Any, **kwargs: Any):
-                return await sync_wrapper(*args, **kwargs)
-            return async_wrapper
+                log_and_raise_exception(f"Operation failed: {e}", build_context(args, kwargs), e)
 
-        return sync_wrapper
+        return async_wrapper if is_async else sync_wrapper
 
     return decorator
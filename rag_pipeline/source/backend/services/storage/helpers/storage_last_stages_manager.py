@@ -1,4 +1,5 @@
 from uuid import UUID
+import json
 
 from redis.asyncio import Redis as RedisAsync
 
@@ -72,3 +73,39 @@ class RedisLastStagesFastAPI(BaseRedisAsyncManager):
         """
         key = self._search_queries_key
         return await self._typefix(self.redis.lrange(key, 0, -1))
+
+    @with_retry_async
+    async def set_search_query_embeddings(self,
+                                          embeddings: dict[str, list[float]],
+                                          chat_stage: ChatStage | str | None = None,
+                                          ) -> None:
+        """
+        Store embeddings of search queries, keyed by query text.
+
+        :param chat_stage: Current chat stage used for logging and state handling.
+        """
+        if not embeddings:
+            return
+        key = self._search_query_embeddings_key
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.hset(key, mapping={q: json.dumps(e) for q, e in embeddings.items()})
+            pipe.expire(key, self.ttl)
+            await pipe.execute()
+
+    @with_retry_async
+    async def get_search_query_embeddings(self,
+                                          search_queries: list[str],
+                                          chat_stage: ChatStage | str | None = None,
+                                          ) -> dict[str, list[float]]:
+        """
+        Get stored embeddings of the given search queries.
+        """
+        if not search_queries:
+            return {}
+        key = self._search_query_embeddings_key
+        raw = await self._typefix(self.redis.hmget(key, search_queries))
+        return {
+            query: json.loads(value)
+            for query, value in zip(search_queries, raw)
+            if value is not None
+        }
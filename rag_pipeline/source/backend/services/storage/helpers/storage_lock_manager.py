@@ -7,6 +7,7 @@ from redis.asyncio import Redis as RedisAsync
 from models.orm.chat import ChatStage
 from .storage_root_class_async import BaseRedisAsyncManager
 from .storage_decorators import with_retry
+from .storage_scripts import RELEASE_LOCK
 from project_settings import (
     CHAT_WINDOW_SIZE,
     DEFAULT_TTL_LOCK_SECONDS,
@@ -76,20 +77,10 @@ class RedisLockManagerFastAPI(BaseRedisAsyncManager):
         if self._lock_token is None:
             return False
 
-        release_script = """
-        if redis.call("GET", KEYS[1]) == ARGV[1] then
-            return redis.call("DEL", KEYS[1])
-        else
-            return 0
-        end
-        """
-        deleted = await self._typefix(
-            self.redis.eval(
-                release_script,
-                1,
-                self._lock_key,
-                self._lock_token,
-            )
+        deleted = await self._run_script(
+            RELEASE_LOCK,
+            [self._lock_key],
+            [self._lock_token],
         )
         self._lock_token = None
         return bool(deleted)
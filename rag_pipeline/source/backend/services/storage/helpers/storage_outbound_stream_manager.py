@@ -0,0 +1,106 @@
+from typing import Any, Optional
+from uuid import UUID
+import json
+
+from redis.asyncio import Redis as RedisAsync
+
+from models.orm.chat import ChatStage
+from .storage_decorators import with_retry, no_retry
+from .storage_root_class_async import BaseRedisAsyncManager
+from .storage_scripts import REPLAY_OUTBOUND_STREAM
+from project_settings import (
+    CHAT_WINDOW_SIZE,
+    DEFAULT_TTL_SECONDS,
+    DEFAULT_TTL_BUFFER_SECONDS,
+    OUTBOUND_STREAM_MAXLEN,
+)
+
+with_retry_async = with_retry(is_async=True)
+no_retry_async = no_retry(is_async=True)
+
+
+class RedisOutboundStreamFastAPI(BaseRedisAsyncManager):
+    """Redis Stream log of outgoing messages with the client's last-acked ID."""
+
+    def __init__(self,
+                 redis: RedisAsync,
+                 chat_passport_id: UUID,
+                 window_size: int = CHAT_WINDOW_SIZE,
+                 ttl_seconds: int = DEFAULT_TTL_SECONDS,
+                 ttl_buffer_seconds: int = DEFAULT_TTL_BUFFER_SECONDS,
+                 ):
+
+        args = (redis, chat_passport_id, window_size,
+                ttl_seconds, ttl_buffer_seconds)
+
+        super().__init__(*args)
+        self.redis = redis
+        self.ttl = ttl_seconds
+        self.ttl_buffer = ttl_buffer_seconds
+        self.maxlen = OUTBOUND_STREAM_MAXLEN
+
+    @no_retry_async
+    async def append(self,
+                     sender_name: str,
+                     payload: dict | str,
+                     ack_id: Optional[str] = None,
+                     chat_stage: ChatStage | str | None = None,
+                     ) -> str:
+        """
+        Append outgoing message to the stream.
+
+        A pending acknowledgement is written in the same pipeline, so
+        delivery costs one round-trip per message.
+
+        :param ack_id: Last delivered stream ID not yet stored in Redis.
+        :param chat_stage: Current chat stage used for logging and state handling.
+        :return: Stream ID of the new entry.
+        """
+        pipe = self.redis.pipeline(transaction=False)
+        if ack_id:
+            pipe.set(self._outbound_ack_key, ack_id, ex=self.ttl_buffer)
+        pipe.xadd(
+            self._outbound_stream_key,
+            {"sender": sender_name, "payload": json.dumps(payload, ensure_ascii=False)},
+            maxlen=self.maxlen,
+            approximate=True,
+        )
+        pipe.expire(self._outbound_stream_key, self.ttl_buffer)
+
+        results = await pipe.execute()
+        return results[-2]
+
+    @with_retry_async
+    async def ack(self,
+                  ack_id: str,
+                  chat_stage: ChatStage | str | None = None,
+                  ) -> None:
+        """
+        Store the last stream ID delivered to the client.
+
+        :param chat_stage: Current chat stage used for logging and state handling.
+        """
+        await self.redis.set(self._outbound_ack_key, ack_id, ex=self.ttl_buffer)
+
+    @with_retry_async
+    async def replay(self,
+                     chat_stage: ChatStage | str | None = None,
+                     ) -> tuple[Optional[str], list[tuple[str, str, Any]]]:
+        """
+        Read the last-acked ID and every entry after it in one call.
+
+        :param chat_stage: Current chat stage used for logging and state handling.
+        :return: Last-acked ID and ``(stream_id, sender, payload)`` entries.
+        """
+        last_acked, entries = await self._run_script(
+            REPLAY_OUTBOUND_STREAM,
+            [self._outbound_stream_key, self._outbound_ack_key],
+            [],
+        )
+
+        result = []
+        for stream_id, flat_fields in entries:
+            fields = dict(zip(flat_fields[::2], flat_fields[1::2]))
+            result.append((stream_id, fields["sender"], json.loads(fields["payload"])))
+
+        return last_acked, result
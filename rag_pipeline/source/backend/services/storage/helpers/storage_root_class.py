@@ -42,21 +42,13 @@ class BaseChatMemory:
 
     def _deserialize_message(self,
                              raw: str,
-                             chat_stage: ChatStage | None = None
+                             chat_stage: ChatStage | str | None = None
                              ) -> ChatMessage:
         """
         Deserialize message.
 
         :param chat_stage: Current chat stage used for logging and state handling.
         """
-        # Build logging context for error reporting.
-        context = LogContext(
-            chat_passport_id=self.chat_passport_id,
-            caller_name=get_caller_name(2),
-            callee_name=get_caller_name(1),
-            chat_stage=chat_stage,
-        )
-
         try:
             data = json.loads(raw)
             role = data["role"]
@@ -73,6 +65,13 @@ class BaseChatMemory:
             raise ValueError(error_msg)
 
         except (KeyError, ValueError, json.JSONDecodeError) as e:
+            # Build logging context for error reporting.
+            context = LogContext(
+                chat_passport_id=self.chat_passport_id,
+                caller_name=get_caller_name(2),
+                callee_name=get_caller_name(1),
+                chat_stage=chat_stage,
+            )
             error_msg = "Failed to deserialize chat message from storage"
             log_and_raise_exception(error_msg, context, e)
 
@@ -124,6 +123,22 @@ class BaseChatMemory:
     def _search_queries_key(self) -> str:
         return f"{self.prefix}:{self.chat_passport_id}:search_queries"
 
+    @property
+    def _search_query_embeddings_key(self) -> str:
+        return f"{self.prefix}:{self.chat_passport_id}:search_query_embeddings"
+
     @property
     def _pending_messages_key(self) -> str:
-        return f"{self.prefix}:{self.chat_passport_id}:pending"
+        return f"{self.prefix}:{self.chat_passport_id}:outbox"
+
+    @property
+    def _pending_seq_key(self) -> str:
+        return f"{self.prefix}:{self.chat_passport_id}:outbox_seq"
+
+    @property
+    def _outbound_stream_key(self) -> str:
+        return f"{self.prefix}:{self.chat_passport_id}:outbound"
+
+    @property
+    def _outbound_ack_key(self) -> str:
+        return f"{self.prefix}:{self.chat_passport_id}:outbound_ack"
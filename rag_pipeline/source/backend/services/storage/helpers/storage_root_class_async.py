@@ -1,10 +1,11 @@
 from uuid import UUID
-from typing import TypeVar, Union, Awaitable
+from typing import Any, Sequence, TypeVar, Union, Awaitable
 import inspect
 
 from redis.asyncio import Redis as RedisAsync
 
 from .storage_root_class import BaseChatMemory
+from .storage_scripts import ADD_TO_LIST, LuaScript, run_script_async
 from project_settings import (
     CHAT_WINDOW_SIZE,
     DEFAULT_TTL_SECONDS,
@@ -37,6 +38,16 @@ class BaseRedisAsyncManager(BaseChatMemory):
             return await result
         return result
 
+    async def _run_script(self,
+                          script: LuaScript,
+                          keys: Sequence[str],
+                          args: Sequence[Any],
+                          ) -> Any:
+        """
+        Execute registered script via EVALSHA.
+        """
+        return await run_script_async(self.redis, script, keys, args)
+
     async def _set_list(self, key: str, elements: list[str]) -> None:
         """
         Execute set list.
@@ -58,11 +69,4 @@ class BaseRedisAsyncManager(BaseChatMemory):
         """
         Execute add to list.
         """
-        ADD_SCRIPT = """
-        redis.call("RPUSH", KEYS[1], ARGV[1])
-        if redis.call("TTL", KEYS[1]) == -1 then
-            redis.call("EXPIRE", KEYS[1], ARGV[2])
-        end
-        return 1
-        """
-        await self._typefix(self.redis.eval(ADD_SCRIPT, 1, key, element, self.ttl))
+        await self._run_script(ADD_TO_LIST, [key], [element, self.ttl])
@@ -0,0 +1,141 @@
+"""Lua scripts of the storage layer, called by SHA1 with EVALSHA."""
+from typing import Any, Awaitable, Sequence, cast
+from dataclasses import dataclass, field
+from hashlib import sha1
+import textwrap
+
+from redis.asyncio import Redis as RedisAsync
+from redis.exceptions import NoScriptError
+
+
+@dataclass(frozen=True)
+class LuaScript:
+    name: str
+    source: str
+    sha: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "sha", sha1(self.source.encode("utf-8")).hexdigest())
+
+
+SCRIPTS: dict[str, LuaScript] = {}
+
+
+def register_script(name: str, source: str) -> LuaScript:
+    """
+    Register script.
+    """
+    script = LuaScript(name=name, source=textwrap.dedent(source).strip())
+    SCRIPTS[name] = script
+    return script
+
+
+APPEND_MESSAGE = register_script("append_message", """
+    local idx = redis.call("INCR", KEYS[1])
+    redis.call("EXPIRE", KEYS[1], ARGV[2])
+    redis.call("ZADD", KEYS[2], idx, ARGV[1])
+    redis.call("EXPIRE", KEYS[2], ARGV[2])
+    return idx
+""")
+
+ADD_TO_LIST = register_script("add_to_list", """
+    redis.call("RPUSH", KEYS[1], ARGV[1])
+    if redis.call("TTL", KEYS[1]) == -1 then
+        redis.call("EXPIRE", KEYS[1], ARGV[2])
+    end
+    return 1
+""")
+
+RELEASE_LOCK = register_script("release_lock", """
+    if redis.call("GET", KEYS[1]) == ARGV[1] then
+        return redis.call("DEL", KEYS[1])
+    else
+        return 0
+    end
+""")
+
+DRAIN_INBOX_TO_MESSAGES = register_script("drain_inbox_to_messages", r"""
+    -- Escape like json.dumps(..., ensure_ascii=False) in _serialize_message;
+    -- cjson.encode would also escape "/" and DEL.
+    local JSON_ESCAPES = {
+        ['"'] = '\\"', ['\\'] = '\\\\',
+        ['\b'] = '\\b', ['\f'] = '\\f', ['\n'] = '\\n', ['\r'] = '\\r', ['\t'] = '\\t',
+    }
+
+    local function json_string(text)
+        local escaped = text:gsub('[%z\1-\31"\\]', function(c)
+            return JSON_ESCAPES[c] or string.format('\\u%04x', c:byte())
+        end)
+        return '"' .. escaped .. '"'
+    end
+
+    local inbox = redis.call("LRANGE", KEYS[1], 0, -1)
+    local n = #inbox
+    if n == 0 then
+        return {}
+    end
+    redis.call("DEL", KEYS[1])
+
+    local first_idx = redis.call("INCRBY", KEYS[2], n) - n + 1
+    redis.call("EXPIRE", KEYS[2], ARGV[1])
+
+    for i, text in ipairs(inbox) do
+        local payload = '{"role": "user", "content": ' .. json_string(text) .. '}'
+        redis.call("ZADD", KEYS[3], first_idx + i - 1, payload)
+    end
+    redis.call("EXPIRE", KEYS[3], ARGV[1])
+
+    table.insert(inbox, 1, first_idx)
+    return inbox
+""")
+
+ADD_PENDING_MESSAGE = register_script("add_pending_message", """
+    if redis.call("ZSCORE", KEYS[1], ARGV[1]) then
+        return 0
+    end
+    local seq = redis.call("INCR", KEYS[2])
+    redis.call("ZADD", KEYS[1], seq, ARGV[1])
+    redis.call("EXPIRE", KEYS[1], ARGV[2])
+    redis.call("EXPIRE", KEYS[2], ARGV[2])
+    return 1
+""")
+
+ACK_PENDING_MESSAGES = register_script("ack_pending_messages", """
+    local removed = redis.call("ZREM", KEYS[1], unpack(ARGV))
+    if redis.call("EXISTS", KEYS[1]) == 0 then
+        redis.call("DEL", KEYS[2])
+    end
+    return removed
+""")
+
+REPLAY_OUTBOUND_STREAM = register_script("replay_outbound_stream", """
+    local last_acked = redis.call("GET", KEYS[2])
+    local entries
+    if last_acked then
+        entries = redis.call("XRANGE", KEYS[1], last_acked, "+")
+        if #entries > 0 and entries[1][1] == last_acked then
+            table.remove(entries, 1)
+        end
+    else
+        entries = redis.call("XRANGE", KEYS[1], "-", "+")
+    end
+    return {last_acked, entries}
+""")
+
+
+async def run_script_async(redis: RedisAsync,
+                           script: LuaScript,
+                           keys: Sequence[str],
+                           args: Sequence[Any],
+                           ) -> Any:
+    """
+    Run script by SHA, loading it first if the server does not know it yet.
+
+    The script cache is empty after a Redis restart or failover, so a
+    NOSCRIPT reply is expected once per server and is not an error.
+    """
+    try:
+        return await cast(Awaitable[Any], redis.evalsha(script.sha, len(keys), *keys, *args))
+    except NoScriptError:
+        await cast(Awaitable[str], redis.script_load(script.source))
+        return await cast(Awaitable[Any], redis.evalsha(script.sha, len(keys), *keys, *args))
@@ -1,5 +1,6 @@
 from typing import Optional, cast
 from uuid import UUID
+from dataclasses import dataclass, field
 import logging
 
 from redis import Redis as RedisSync
@@ -8,7 +9,6 @@ from haystack.dataclasses import ChatMessage
 from models.orm.chat import ChatStage
 from .storage_root_class import BaseChatMemory
 from .storage_decorators import with_retry
-from logging_setup import LogContext
 from project_settings import CHAT_WINDOW_SIZE, DEFAULT_TTL_SECONDS
 from services.chat_constants import SYSTEM_PROMPT_CHAT_INIT
 
@@ -16,6 +16,14 @@ logger = logging.getLogger(__name__)
 with_retry_sync = with_retry(is_async=False)
 
 
+@dataclass
+class ChatMemoryBatch:
+    """User context, summary and message history read in one round-trip."""
+    user_context: Optional[ChatMessage] = None
+    summary: Optional[str] = None
+    messages: list[ChatMessage] = field(default_factory=list)
+
+
 class RedisChatMemoryCelery(BaseChatMemory):
     """Base class for Redis-backed chat memory operations."""
 
@@ -58,25 +66,6 @@ class RedisChatMemoryCelery(BaseChatMemory):
             return None
         return ChatMessage.from_system(message)
 
-    @with_retry_sync
-    def get_messages_until(self,
-                           until_message_idx: int,
-                           chat_stage: ChatStage | None = None,
-                           ) -> list[ChatMessage]:
-        """
-        Get messages until.
-        """
-        raw = cast(list[str], self.redis.zrangebyscore(
-            self._messages_key,
-            min=0,
-            max=until_message_idx,
-        ))
-
-        return [
-            self._deserialize_message(r, chat_stage=chat_stage)
-            for r in raw
-        ]
-
     @with_retry_sync
     def trim_messages_until(self,
                             until_message_idx: int,
@@ -118,6 +107,36 @@ class RedisChatMemoryCelery(BaseChatMemory):
             list[tuple[str, str]],
             self.redis.zrange(messages_key, 0, -1, withscores=True))
 
+    @with_retry_sync
+    def read_batch(self,
+                   until_message_idx: int | None = None,
+                   chat_stage: ChatStage | None = None,
+                   ) -> ChatMemoryBatch:
+        """
+        Read user context, summary and messages in one pipelined round-trip.
+
+        :param until_message_idx: Message index boundary, ``None`` reads all messages.
+        :param chat_stage: Current chat stage used for logging and state handling.
+        """
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.get(self._user_context_key)
+        pipe.get(self._summary_key)
+        if until_message_idx is None:
+            pipe.zrange(self._messages_key, 0, -1)
+        else:
+            pipe.zrangebyscore(self._messages_key, min=0, max=until_message_idx)
+
+        user_context, summary, raw = pipe.execute()
+
+        return ChatMemoryBatch(
+            user_context=ChatMessage.from_system(user_context) if user_context else None,
+            summary=summary,
+            messages=[
+                self._deserialize_message(r, chat_stage)
+                for r in cast(list[str], raw)
+            ],
+        )
+
     @with_retry_sync
     def get_messages(self,
                      chat_stage: ChatStage | None = None,
@@ -125,33 +144,24 @@ class RedisChatMemoryCelery(BaseChatMemory):
         """
         Get messages.
         """
-        logging_context = LogContext(
-            chat_stage=chat_stage,
-        ).model_dump(exclude_unset=True)
+        batch = self.read_batch(chat_stage=chat_stage)
 
         messages: list[ChatMessage] = []
 
         prompt = ChatMessage.from_system(SYSTEM_PROMPT_CHAT_INIT)
         messages.append(prompt)
 
-        user_context: ChatMessage = self.get_user_context(**logging_context)
-
-        if user_context:
-            messages.append(user_context)
+        if batch.user_context:
+            messages.append(batch.user_context)
 
-        summary = self.get_summary(**logging_context)
-        if summary:
+        if batch.summary:
             messages.append(
                 ChatMessage.from_system(
-                    f"Conversation summary so far:\n{summary}"
+                    f"Conversation summary so far:\n{batch.summary}"
                 )
             )
 
-        raw = cast(list[str], self.redis.zrange(self._messages_key, 0, -1))
-
-        for r in raw:
-            messages.append(
-                self._deserialize_message(r, chat_stage))
+        messages.extend(batch.messages)
 
         return messages
 
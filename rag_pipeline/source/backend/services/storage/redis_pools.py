@@ -0,0 +1,164 @@
+"""Process-wide Redis connection pools shared by chat memory managers."""
+from dataclasses import dataclass
+from weakref import WeakKeyDictionary
+import asyncio
+import logging
+
+from redis import Redis as RedisSync
+from redis import BlockingConnectionPool as SyncBlockingConnectionPool
+from redis.asyncio import Redis as RedisAsync
+from redis.asyncio import BlockingConnectionPool as AsyncBlockingConnectionPool
+
+from logging_setup import log_extra
+import project_settings as proj_settings
+
+logger = logging.getLogger(__name__)
+
+_sync_pool: SyncBlockingConnectionPool | None = None
+
+
+@dataclass
+class _AsyncPool:
+    pool: AsyncBlockingConnectionPool
+    peak_in_use: int = 0
+
+
+# Async connections belong to the event loop that opened them, so each
+# loop gets its own pool. The server runs one loop; tests run several.
+_async_pools: "WeakKeyDictionary[asyncio.AbstractEventLoop, _AsyncPool]" = WeakKeyDictionary()
+
+
+@dataclass
+class RedisPoolStats:
+    max_connections: int
+    in_use: int
+    idle: int
+    peak_in_use: int
+
+    @property
+    def saturation_pct(self) -> float:
+        return round(self.in_use / max(self.max_connections, 1) * 100, 2)
+
+
+def open_async_redis_pool() -> AsyncBlockingConnectionPool:
+    """
+    Create the async pool of the running loop (called from the FastAPI lifespan).
+
+    A blocking pool is used so that under saturation callers wait up to
+    ``REDIS_POOL_TIMEOUT`` seconds for a free connection instead of
+    opening new ones past ``REDIS_MAX_CONNECTIONS``.
+    """
+    return _get_async_pool().pool
+
+
+async def close_async_redis_pool() -> None:
+    """
+    Disconnect every pooled connection of the running loop (called on FastAPI shutdown).
+    """
+    entry = _async_pools.pop(asyncio.get_running_loop(), None)
+    if entry is not None:
+        await entry.pool.aclose()
+
+
+def get_async_redis() -> RedisAsync:
+    """
+    Get an async client borrowing connections from the running loop's pool.
+
+    The client does not own the pool, so it needs no explicit closing.
+    """
+    entry = _get_async_pool()
+    _track_async_pool_saturation(entry)
+    return RedisAsync(connection_pool=entry.pool)
+
+
+def _get_async_pool() -> _AsyncPool:
+    loop = asyncio.get_running_loop()
+    entry = _async_pools.get(loop)
+    if entry is None:
+        entry = _AsyncPool(AsyncBlockingConnectionPool.from_url(
+            proj_settings.REDIS_URL,
+            max_connections=proj_settings.REDIS_MAX_CONNECTIONS,
+            timeout=proj_settings.REDIS_POOL_TIMEOUT,
+            decode_responses=True,
+        ))
+        _async_pools[loop] = entry
+    return entry
+
+
+def open_sync_redis_pool() -> SyncBlockingConnectionPool:
+    """
+    Create the per-process sync pool (called on Celery ``worker_process_init``).
+    """
+    global _sync_pool
+
+    if _sync_pool is None:
+        _sync_pool = SyncBlockingConnectionPool.from_url(
+            proj_settings.REDIS_URL,
+            max_connections=proj_settings.REDIS_WORKER_MAX_CONNECTIONS,
+            timeout=proj_settings.REDIS_POOL_TIMEOUT,
+            decode_responses=True,
+        )
+    return _sync_pool
+
+
+def close_sync_redis_pool() -> None:
+    """
+    Disconnect every pooled connection (called on worker process shutdown).
+    """
+    global _sync_pool
+
+    if _sync_pool is None:
+        return
+
+    pool, _sync_pool = _sync_pool, None
+    pool.disconnect()
+
+
+def get_sync_redis() -> RedisSync:
+    """
+    Get a sync client borrowing connections from the per-process pool.
+    """
+    pool = _sync_pool or open_sync_redis_pool()
+    return RedisSync(connection_pool=pool)
+
+
+def get_async_redis_pool_stats() -> RedisPoolStats | None:
+    """
+    Get saturation metrics of the running loop's async pool.
+    """
+    try:
+        entry = _async_pools.get(asyncio.get_running_loop())
+    except RuntimeError:
+        return None
+    if entry is None:
+        return None
+    return _collect_stats(entry.pool, entry.peak_in_use)
+
+
+def _collect_stats(pool: AsyncBlockingConnectionPool, peak_in_use: int) -> RedisPoolStats:
+    in_use = len(getattr(pool, "_in_use_connections", ()))
+    idle = len(getattr(pool, "_available_connections", ()))
+    return RedisPoolStats(
+        max_connections=pool.max_connections,
+        in_use=in_use,
+        idle=idle,
+        peak_in_use=max(peak_in_use, in_use),
+    )
+
+
+def _track_async_pool_saturation(entry: _AsyncPool) -> None:
+    stats = _collect_stats(entry.pool, entry.peak_in_use)
+    entry.peak_in_use = stats.peak_in_use
+
+    if stats.saturation_pct >= proj_settings.REDIS_POOL_SATURATION_WARN_PCT:
+        logger.warning(
+            "Redis connection pool is close to saturation",
+            extra=log_extra(
+                event="redis.pool.saturated",
+                max_connections=stats.max_connections,
+                in_use=stats.in_use,
+                idle=stats.idle,
+                peak_in_use=stats.peak_in_use,
+                saturation_pct=stats.saturation_pct,
+            ),
+        )
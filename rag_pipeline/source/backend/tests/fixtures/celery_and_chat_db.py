@@ -1,10 +1,11 @@
-from contextlib import contextmanager
+from contextlib import contextmanager, asynccontextmanager
 import pytest
 from pytest import MonkeyPatch
 from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from project_settings import REDIS_URL_TEST
-from fixtures.common import engine_tests
+from fixtures.common import engine_tests, engine_tests_async
 
 
 @pytest.fixture(scope="function", autouse=True)
@@ -42,12 +43,9 @@ def patch_chat_session_get_db_async(monkeypatch: MonkeyPatch):
     """Patch chat session get db async."""
     import services.chat_session.helpers.db_loaders as db_loader_module
 
-    @contextmanager
-    def get_db_sync_tests():
-        db = Session(engine_tests)
-        try:
+    @asynccontextmanager
+    async def get_db_async_tests():
+        async with AsyncSession(engine_tests_async, expire_on_commit=False) as db:
             yield db
-        finally:
-            db.close()
 
-    monkeypatch.setattr(db_loader_module, "get_db_sync", get_db_sync_tests)
+    monkeypatch.setattr(db_loader_module, "get_db_async", get_db_async_tests)
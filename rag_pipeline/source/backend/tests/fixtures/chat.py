@@ -8,7 +8,6 @@ from fastapi.testclient import TestClient
 from sqlmodel import Session
 from haystack.dataclasses import ChatMessage
 
-from models.orm.chat import ChatStage
 from services.chat_constants import SUMMARY_PROMPT, GREETING_PROMPT
 from services.storage.chat_redis import get_chat_memory_fastapi
 from services.storage.helpers.async_redis_manager import RedisChatMemoryFastAPI
@@ -31,21 +30,6 @@ def valid_chat_passport_id(db_tests: Session, client: TestClient) -> str:
     return response.json()["chat_passport_id"]
 
 
-@pytest.fixture(autouse=True)
-def fake_chat_stage(monkeypatch: MonkeyPatch):
-    """Fake chat stage."""
-    import services.chat_session.helpers.common as chat_session_helpers_common_module
-
-    async def fake_read_chat_stage(*args: Any, **kwargs: Any):
-        return ChatStage.TEST
-
-    monkeypatch.setattr(
-        chat_session_helpers_common_module,
-        "read_chat_stage",
-        fake_read_chat_stage
-    )
-
-
 class FakeChatMessage(ChatMessage):
     def __init__(self, *args: Any, **kwargs: Any):
         super().__init__(*args, **kwargs)
@@ -1,6 +1,10 @@
 import os
 from pydantic import BaseModel
 from sqlmodel import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from db.session import to_async_database_url
 
 
 class DocStoreParams(BaseModel):
@@ -15,3 +19,10 @@ engine_tests = create_engine(
     echo=True,
     pool_pre_ping=True,
 )
+
+# NullPool: the test client and pytest-asyncio run separate event loops,
+# and asyncpg connections cannot be shared between loops.
+engine_tests_async = create_async_engine(
+    to_async_database_url(TEST_DATABASE_URL),
+    poolclass=NullPool,
+)
@@ -2,9 +2,10 @@ import pytest
 from pytest import MonkeyPatch
 from fastapi.testclient import TestClient
 from sqlmodel import SQLModel, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from db.session import get_db
-from fixtures.common import engine_tests
+from db.session import get_db, get_async_db
+from fixtures.common import engine_tests, engine_tests_async
 
 
 @pytest.fixture
@@ -29,7 +30,12 @@ def client(db_tests: Session):
     def override_get_db():
         yield db_tests
 
+    async def override_get_async_db():
+        async with AsyncSession(engine_tests_async, expire_on_commit=False) as db:
+            yield db
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     with TestClient(app) as client:
         yield client
     app.dependency_overrides.clear()
@@ -47,12 +47,6 @@ def document_store_test(monkeypatch: MonkeyPatch):
         DOCUMENT_STORE_TESTS
     )
 
-    monkeypatch.setattr(
-        pipes,
-        "INDEXING_PIPELINE",
-        pipes.indexing_pipeline(DOCUMENT_STORE_TESTS),
-    )
-
     monkeypatch.setattr(
         pipes,
         "CHAT_SEARCH_PIPELINE",
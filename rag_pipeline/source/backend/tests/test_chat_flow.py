@@ -5,6 +5,7 @@ import pytest
 from unittest.mock import AsyncMock
 from sqlmodel import Session, select
 from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketState
 from services.storage.chat_redis import get_chat_memory_celery
 from models.orm.chat import ChatLog, UserContext, ChatSnapshot
 from tests.helpers.common import extract_redis_content
@@ -248,3 +249,160 @@ class TestUnits:
         pending = await chat_session_test.memory.get_pending_messages(chat_passport_id)
         assert len(pending) == 1
         assert pending[0] == ('AsyncMock', 'hello')
+
+    @pytest.mark.asyncio
+    async def test_stream_delivery_replays_missed_messages_in_order(
+        self,
+        chat_session_test: "ChatSession",
+    ):
+        """Test stream delivery replays from the last-acked ID."""
+        delivery = chat_session_test.delivery
+        delivery.use_stream = True
+        chat_session_test.websocket.client_state = WebSocketState.CONNECTED
+        chat_session_test.websocket.application_state = WebSocketState.CONNECTED
+
+        chat_session_test.websocket.send_text = AsyncMock(
+            side_effect=RuntimeError("connection lost")
+        )
+        assert await delivery.safe_send_text("hello") is False
+
+        chat_session_test.websocket.send_text = AsyncMock()
+        assert await delivery.safe_send_text("again") is True
+
+        sent = [c.args[0] for c in chat_session_test.websocket.send_text.call_args_list]
+        assert sent == ["hello", "again"]
+
+        last_acked, entries = await chat_session_test.memory.outbound.replay()
+        assert last_acked is not None
+        assert entries == []
+
+    @pytest.mark.asyncio
+    async def test_outbox_acks_skip_unbuffered_and_batch_flushed(
+        self,
+        chat_session_test: "ChatSession",
+    ):
+        """Test healthy sends pay no ack and flushed ones are acked at once."""
+        delivery = chat_session_test.delivery
+        memory = chat_session_test.memory
+        for payload in ["one", "two"]:
+            await memory.add_pending_message("send_text", payload)
+
+        chat_session_test.websocket.client_state = WebSocketState.CONNECTED
+        chat_session_test.websocket.application_state = WebSocketState.CONNECTED
+        memory.pop_pending_messages = AsyncMock(wraps=memory.pop_pending_messages)
+
+        for text in ["a", "b", "c"]:
+            assert await delivery.safe_send_text(text) is True
+        assert delivery.avoided_ack_round_trips == 3
+        memory.pop_pending_messages.assert_not_called()
+
+        await delivery.flush_pending_messages()
+
+        memory.pop_pending_messages.assert_awaited_once()
+        assert await memory.get_pending_messages() == []
+
+    @pytest.mark.asyncio
+    async def test_outbox_acks_flushed_in_chunks_and_on_timer(
+        self,
+        chat_session_test: "ChatSession",
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """Test a large replayed backlog is acked in chunks and a lone ack is not left queued."""
+        import asyncio
+        import services.chat_session.helpers.websocket_delivery_manager as wdm
+
+        delivery = chat_session_test.delivery
+        memory = chat_session_test.memory
+        for i in range(45):
+            await memory.add_pending_message("send_text", f"message {i}")
+
+        chat_session_test.websocket.client_state = WebSocketState.CONNECTED
+        chat_session_test.websocket.application_state = WebSocketState.CONNECTED
+        chat_session_test.websocket.send_text = AsyncMock()
+        memory.pop_pending_messages = AsyncMock(wraps=memory.pop_pending_messages)
+
+        await delivery.flush_pending_messages()
+
+        assert [len(c.args[0]) for c in memory.pop_pending_messages.call_args_list] == [20, 20, 5]
+        assert await memory.get_pending_messages() == []
+
+        monkeypatch.setattr(wdm, "PENDING_ACK_FLUSH_DELAY", 0.05)
+        await memory.add_pending_message("send_text", "late")
+        await delivery._queue_ack("send_text", "late")
+        assert await memory.get_pending_messages() == [("send_text", "late")]
+
+        await asyncio.sleep(0.1)
+        assert await memory.get_pending_messages() == []
+
+    @pytest.mark.asyncio
+    async def test_reply_stream_forwards_visible_chunks(
+        self,
+        chat_session_test: "ChatSession",
+    ):
+        """Test streamed deltas skip think blocks and end with the full reply."""
+        from haystack.dataclasses import StreamingChunk
+        from services.chat_session.helpers.streaming import ReplyStream
+
+        class FakePipeline:
+            def run(self, data: dict) -> dict:
+                callback = data["llm"]["streaming_callback"]
+                for piece in ["<thi", "nk>plan", "ning</th", "ink>\n\nHel", "lo", " there"]:
+                    callback(StreamingChunk(content=piece))
+                return {"llm": {"replies": ["<think>planning</think>\n\nHello there"]}}
+
+        chat_session_test.websocket.client_state = WebSocketState.CONNECTED
+        chat_session_test.websocket.application_state = WebSocketState.CONNECTED
+        chat_session_test.websocket.send_json = AsyncMock()
+
+        stream = ReplyStream(chat_session_test, hold_back="HANDOFF")
+        await stream.run(cast(Any, FakePipeline()), {"llm": {}})
+        await stream.close("Hello there")
+
+        frames = [c.args[0] for c in chat_session_test.websocket.send_json.call_args_list]
+        deltas = "".join(f.get("delta", "") for f in frames)
+        assert deltas == "Hello there"
+        assert frames[-1] == {"stream_id": stream.stream_id, "done": True, "text": "Hello there"}
+
+    def test_strip_think_block_keeps_unterminated_block(self):
+        """Test an unclosed think tag does not swallow the reply."""
+        from services.chat_session.helpers.streaming import strip_think_block
+
+        assert strip_think_block("<think>plan</think>\n\nAnswer text") == "Answer text"
+        assert strip_think_block("<think>plan... Answer text") == "<think>plan... Answer text"
+
+    @pytest.mark.asyncio
+    async def test_repeat_query_detected_by_embeddings(
+        self,
+        chat_session_test: "ChatSession",
+        monkeypatch: pytest.MonkeyPatch,
+    ):
+        """Test clear cases skip the LLM and ambiguous ones defer to it."""
+        import haystack_pipelines.initializator as pipes
+        from services.chat_session.helpers.stage_answering import _compare_query_embeddings
+
+        vectors = {
+            "reset password": [1.0, 0.0],
+            "password reset": [0.99, 0.05],
+            "pricing plans": [0.0, 1.0],
+            "password pricing": [0.85, 0.5],
+        }
+        calls: list[str] = []
+
+        class FakeEmbedder:
+            def run(self, text: str) -> dict:
+                calls.append(text)
+                return {"embedding": vectors[text]}
+
+        class FakePipeline:
+            def get_component(self, name: str) -> FakeEmbedder:
+                return FakeEmbedder()
+
+        monkeypatch.setattr(pipes, "CHAT_SEARCH_PIPELINE", FakePipeline())
+        history = ["reset password"]
+
+        assert await _compare_query_embeddings(chat_session_test, "password reset", history) is True
+        assert await _compare_query_embeddings(chat_session_test, "pricing plans", history) is False
+        assert await _compare_query_embeddings(chat_session_test, "password pricing", history) is None
+
+        # Previous queries are embedded once and then read from Redis.
+        assert calls == ["reset password", "password reset", "pricing plans", "password pricing"]
@@ -3,8 +3,13 @@ from sqlmodel import Session, select
 from fastapi.testclient import TestClient
 import pytest
 from starlette.websockets import WebSocketDisconnect
+from haystack.dataclasses import ChatMessage
 from conftest import register_required_chat_components
 
+from models.orm.chat import ChatStage
+from services.storage.helpers.async_redis_manager import RedisChatMemoryFastAPI
+from services.storage.helpers.storage_scripts import APPEND_MESSAGE
+
 
 class TestWebsocket:
     """Test suite for websocket."""
@@ -96,3 +101,111 @@ class TestChatFlow:
             "Fake LLM response #3",
             "Fake LLM response #4",
         ]
+
+
+class TestSessionState:
+    """Test suite for session state snapshot."""
+
+    @pytest.mark.asyncio
+    async def test_session_state_single_round_trip(self, fake_memory: RedisChatMemoryFastAPI):
+        """Test session state reads every key in one pipeline."""
+        await fake_memory.append_message(ChatMessage.from_user("Hello"))
+        await fake_memory.append_message(ChatMessage.from_assistant("Hi"))
+        await fake_memory.set_language("English")
+        await fake_memory.context.set_user_context("Likes jokes")
+        await fake_memory.closure.set_search_queries(["jokes"])
+        await fake_memory.set_summary_idx_cutoff_and_stage(
+            summary="Greetings",
+            msg_idx_summary_cutoff=2,
+            chat_stage=ChatStage.TEST,
+        )
+
+        state = await fake_memory.get_session_state()
+
+        assert state.chat_stage == ChatStage.TEST
+        assert state.summary == "Greetings"
+        assert state.user_context is not None
+        assert state.user_context.text == "Likes jokes"
+        assert state.last_msg_idx == 2
+        assert [m.text for m in state.messages] == ["Hello", "Hi"]
+        assert state.lang == "English"
+        assert state.search_queries == ["jokes"]
+
+    @pytest.mark.asyncio
+    async def test_drain_inbox_to_messages(self, fake_memory: RedisChatMemoryFastAPI):
+        """Test inbox burst is appended with contiguous indices."""
+        await fake_memory.append_message(ChatMessage.from_assistant("Hi"))
+        burst = ["Hello", 'He said "hi"', "Привет / 你好"]
+        for text in burst:
+            await fake_memory.add_to_inbox(text)
+
+        drained = await fake_memory.drain_inbox_to_messages()
+
+        assert drained == [(2, burst[0]), (3, burst[1]), (4, burst[2])]
+        assert await fake_memory.get_inbox_size() == 0
+        assert await fake_memory.get_last_message_idx() == 4
+
+        messages = await fake_memory.get_messages()
+        assert [(m.role.value, m.text) for m in messages[1:]] == [("user", t) for t in burst]
+        assert await fake_memory.drain_inbox_to_messages() == []
+
+    @pytest.mark.asyncio
+    async def test_drained_payload_matches_serialize_message(
+        self,
+        fake_memory: RedisChatMemoryFastAPI,
+    ):
+        """Test the script stores the same bytes as ``_serialize_message``."""
+        burst = [
+            "a/b \\/ c",
+            'quote " and backslash \\',
+            "tab\t newline\n bell\x07 nul\x00 del\x7f",
+            "Привет / 你好 😀",
+            "\\u007f is not DEL",
+        ]
+        for text in burst:
+            await fake_memory.add_to_inbox(text)
+
+        await fake_memory.drain_inbox_to_messages()
+
+        stored = await fake_memory.redis.zrange(fake_memory._messages_key, 0, -1)
+        assert stored[-len(burst):] == [
+            fake_memory._serialize_message(ChatMessage.from_user(text)) for text in burst
+        ]
+
+
+class TestStorageScripts:
+    """Test suite for EVALSHA script registry."""
+
+    @pytest.mark.asyncio
+    async def test_noscript_fallback_async(self, fake_memory: RedisChatMemoryFastAPI):
+        """Test scripts are reloaded after the server script cache is flushed."""
+        await fake_memory.redis.script_flush()
+
+        first_idx = await fake_memory.append_message(ChatMessage.from_user("Hello"))
+        second_idx = await fake_memory.append_message(ChatMessage.from_user("Again"))
+
+        assert (first_idx, second_idx) == (1, 2)
+        assert await fake_memory.redis.script_exists(APPEND_MESSAGE.sha) == [True]
+
+    @pytest.mark.asyncio
+    async def test_pending_outbox_dedupe_and_order(self, fake_memory: RedisChatMemoryFastAPI):
+        """Test pending outbox keeps first-insertion order without duplicates."""
+        for payload in ["first", {"message": "second"}, "first", "third"]:
+            await fake_memory.add_pending_message("send_text", payload)
+
+        assert await fake_memory.get_pending_messages() == [
+            ("send_text", "first"),
+            ("send_text", {"message": "second"}),
+            ("send_text", "third"),
+        ]
+
+        await fake_memory.pop_pending_message("send_text", {"message": "second"})
+        await fake_memory.add_pending_message("send_text", "fourth")
+
+        pending = await fake_memory.get_pending_messages()
+        assert [payload for _, payload in pending] == ["first", "third", "fourth"]
+
+        for _, payload in pending:
+            await fake_memory.pop_pending_message("send_text", payload)
+
+        assert not await fake_memory.redis.exists(fake_memory._pending_seq_key)
@@ -1,13 +1,25 @@
 from typing import Any
 import os
+import pytest
 from fastapi.testclient import TestClient
 from sqlmodel import Session, select
 from pytest import MonkeyPatch
+from haystack import Document
 from models.orm.user import User
 from models.orm.document import DocumentDB
 from models.orm.tokens import TokenStats
 from services.haystack.docs_indexing import index_doc_with_separator
 from services.celery_tasks.helpers.indexing import filter_documents_with_retry
+from haystack_pipelines.helpers.context_windows import annotate_context_windows
+from haystack_pipelines.helpers.embedding_cache import (
+    QueryEmbeddingCache,
+    CachedTextEmbedder,
+    DocumentEmbeddingStore,
+    CachedDocumentEmbedder,
+)
+from haystack_pipelines.helpers.batching import TokenBudgetBatcher, LatencyReportingEmbedder
+from services.storage.redis_pools import get_sync_redis
+from services.storage.answer_cache import AnswerCache
 import routes.user_docs_mgmt as docs_mgt_module
 
 
@@ -29,7 +41,7 @@ class TestUploadMultiple:
                  ):
         """Test 401."""
         monkeypatch.setattr(
-            "routes.user_docs_mgmt.index_doc_with_separator",
+            "routes.user_docs_mgmt.run_celery_task",
             fake_background_task,
         )
 
@@ -49,7 +61,7 @@ class TestUploadMultiple:
                  ):
         """Test 200."""
         monkeypatch.setattr(
-            "routes.user_docs_mgmt.index_doc_with_separator",
+            "routes.user_docs_mgmt.run_celery_task",
             fake_background_task,
         )
 
@@ -71,7 +83,7 @@ class TestUploadMultiple:
         """Test invalid file format 400."""
 
         monkeypatch.setattr(
-            "routes.user_docs_mgmt.index_doc_with_separator",
+            "routes.user_docs_mgmt.run_celery_task",
             fake_background_task,
         )
 
@@ -184,3 +196,204 @@ def test_rewrite_file_with_separator_to_db_similarity_high(
     ).all()
 
     assert len(rows_first_write) == len(rows_second_write) - 1
+
+
+class TestQueryEmbeddingCache:
+    """Test suite for query embedding cache."""
+
+    def test_repeated_query_skips_embedder(self):
+        """Test repeated query skips embedder."""
+        calls: list[str] = []
+
+        class FakeEmbedder:
+            def run(self, text: str):
+                calls.append(text)
+                return {"embedding": [0.1, 0.2], "meta": {"model": "fake"}}
+
+        cache = QueryEmbeddingCache(max_items=8, ttl_seconds=60, key_prefix="test_query_embedding")
+        embedder = CachedTextEmbedder(FakeEmbedder(), model="fake", cache=cache)
+
+        for _ in range(3):
+            assert embedder.run(text="How to reset password?")["embedding"] == [0.1, 0.2]
+
+        cache.clear()
+        assert embedder.run(text="How to reset password?")["embedding"] == [0.1, 0.2]
+
+        assert calls == ["How to reset password?"]
+        assert cache.stats() == {"local_hits": 2, "redis_hits": 1, "misses": 1, "size": 1}
+
+        get_sync_redis().delete(cache.key("fake", "How to reset password?"))
+
+
+class TestDocumentEmbeddingStore:
+    """Test suite for the content-addressed chunk embedding store."""
+
+    def test_duplicate_chunks_embedded_once_per_model(self):
+        """Test identical chunk texts reach the embedder once per model."""
+        calls: list[list[str]] = []
+
+        class FakeEmbedder:
+            def run(self, documents: list[Document]):
+                calls.append([doc.content for doc in documents])
+                return {
+                    "documents": [Document(content=doc.content, embedding=[float(len(doc.content))])
+                                  for doc in documents],
+                    "meta": {"model": "fake"},
+                }
+
+        store = DocumentEmbeddingStore(enabled=True, ttl_seconds=60, key_prefix="test_doc_embedding")
+        embedder = CachedDocumentEmbedder(FakeEmbedder(), model="fake-a", store=store)
+        other_model = CachedDocumentEmbedder(FakeEmbedder(), model="fake-b", store=store)
+
+        first = embedder.run(documents=[Document(content=t) for t in ["hi", "footer", "hi"]])
+        second = embedder.run(documents=[Document(content=t) for t in ["footer", "new"]])
+        other_model.run(documents=[Document(content="footer")])
+
+        assert [doc.embedding for doc in first["documents"]] == [[2.0], [6.0], [2.0]]
+        assert [doc.embedding for doc in second["documents"]] == [[6.0], [3.0]]
+        assert calls == [["hi", "footer"], ["new"], ["footer"]]
+        assert store.stats() == {"hits": 1, "misses": 5}
+
+        get_sync_redis().delete(*(store.key(model, text)
+                                  for model in ("fake-a", "fake-b")
+                                  for text in ("hi", "footer", "new")))
+
+
+class TestTokenBudgetBatcher:
+    """Test suite for token-budgeted embedding batches."""
+
+    def test_batches_packed_by_tokens(self):
+        """Test short chunks share a request and a long one goes alone."""
+        batcher = TokenBudgetBatcher(max_token_budget=50, min_token_budget=10, max_batch_size=4)
+        docs = [Document(content="short text") for _ in range(8)]
+        docs.insert(2, Document(content="long " * 80))
+
+        sizes = [len(batch.documents) for batch in batcher.batches(docs)]
+
+        assert sizes == [2, 1, 4, 2]
+        assert all(batch.tokens <= 50 for batch in batcher.batches(docs) if len(batch.documents) > 1)
+
+    def test_budget_follows_latency_and_errors(self):
+        """Test slow or failed requests shrink the budget and fast full ones grow it."""
+        batcher = TokenBudgetBatcher(max_token_budget=1000, min_token_budget=100, target_latency=1.0)
+        calls: list[int] = []
+
+        class FlakyEmbedder:
+            def run(self, documents: list[Document]):
+                calls.append(len(documents))
+                if len(calls) == 1:
+                    raise TimeoutError("Simulated timeout")
+                return {"documents": documents, "meta": {}}
+
+        embedder = LatencyReportingEmbedder(FlakyEmbedder(), batcher=batcher)
+        with pytest.raises(TimeoutError):
+            embedder.run(documents=[Document(content="text")])
+        assert batcher.token_budget == 500
+
+        batcher.record(tokens=500, latency=2.0)
+        assert batcher.token_budget == 250
+
+        batcher.record(tokens=240, latency=0.1)
+        batcher.record(tokens=10, latency=0.1)
+        assert batcher.token_budget == 312
+
+        for _ in range(20):
+            batcher.record(tokens=batcher.token_budget, latency=0.1)
+        assert batcher.token_budget == 1000
+
+        # The embedder sends what the caller packed as one request.
+        small_batcher = TokenBudgetBatcher(max_token_budget=100, min_token_budget=10)
+        LatencyReportingEmbedder(FlakyEmbedder(), batcher=small_batcher).run(
+            documents=[Document(content="word " * 400) for _ in range(3)],
+        )
+        assert calls[-1] == 3
+
+
+class TestAnswerCache:
+    """Test suite for the ANSWERING stage answer cache."""
+
+    @pytest.mark.asyncio
+    async def test_exact_semantic_hits_and_invalidation(self):
+        """Test paraphrases hit the cache until a source document changes."""
+        cache = AnswerCache(enabled=True, ttl_seconds=60, similarity=0.9,
+                            max_per_bucket=8, key_prefix="test_answer_cache")
+        chunk_ids = ["chunk-b", "chunk-a"]
+
+        assert await cache.get("How to reset password?", chunk_ids, "English") is None
+        await cache.set("How to reset password?", chunk_ids, ["7"], "English",
+                        "Use the reset link.", query_embedding=[1.0, 0.0])
+
+        assert await cache.get("how to reset  password", chunk_ids[::-1], "English") == "Use the reset link."
+        assert await cache.get("Password reset?", chunk_ids, "English",
+                               query_embedding=[0.99, 0.05]) == "Use the reset link."
+        assert await cache.get("Password reset?", chunk_ids, "English",
+                               query_embedding=[0.0, 1.0]) is None
+        assert await cache.get("How to reset password?", chunk_ids, "German") is None
+
+        assert cache.invalidate_documents([7]) == 1
+        assert await cache.get("How to reset password?", chunk_ids, "English") is None
+        assert cache.stats() == {"exact_hits": 1, "semantic_hits": 1, "misses": 4}
+
+
+class TestContextExtractor:
+    """Test suite for context window expansion."""
+
+    def test_windows_loaded_in_one_query(self, monkeypatch: MonkeyPatch):
+        """Test overlapping windows are merged and fetched at once."""
+        import haystack_pipelines.initializator as pipes
+
+        stored = [
+            Document(content=f"{source}{i}", meta={"source_id": source, "split_id": i})
+            for source, size in [("a", 10), ("b", 5)]
+            for i in range(size)
+        ]
+        queries: list[dict] = []
+
+        def fake_filter_documents(filters: dict) -> list[Document]:
+            queries.append(filters)
+            ranges = [
+                tuple(c["value"] for c in window["conditions"])
+                for window in filters["conditions"]
+            ]
+            return [
+                doc for doc in stored
+                if any(doc.meta["source_id"] == source and first <= doc.meta["split_id"] <= last
+                       for source, first, last in ranges)
+            ]
+
+        monkeypatch.setattr(pipes.DOCUMENT_STORE, "filter_documents", fake_filter_documents)
+        extractor = pipes.srs.search_pipeline(pipes.DOCUMENT_STORE).get_component("context_extractor")
+
+        hits = [
+            Document(content="a3", meta={"source_id": "a", "split_id": 3}, score=0.7),
+            Document(content="b0", meta={"source_id": "b", "split_id": 0}, score=0.8),
+            Document(content="a5", meta={"source_id": "a", "split_id": 5}, score=0.9),
+            Document(content="legacy", meta={}, score=0.1),
+        ]
+
+        contexts = extractor.run(chunks=hits, context_window=2)["contexts"]
+
+        assert len(queries) == 1
+        assert contexts == ["a1a2a3a4a5a6a7", "b0b1b2", "legacy"]
+
+    def test_precomputed_windows_skip_store(self, monkeypatch: MonkeyPatch):
+        """Test precomputed windows need no document store reads."""
+        import haystack_pipelines.initializator as pipes
+
+        chunks = annotate_context_windows(
+            [Document(content=f"a{i}", meta={"source_id": "a", "split_id": i}) for i in range(10)],
+            context_window=2,
+        )
+        assert chunks[0].meta["window_first"] == 0
+        assert chunks[0].meta["window_chunks"] == ["a0", "a1", "a2"]
+
+        def fail_filter_documents(filters: dict) -> list[Document]:
+            raise AssertionError("document store must not be read")
+
+        monkeypatch.setattr(pipes.DOCUMENT_STORE, "filter_documents", fail_filter_documents)
+        extractor = pipes.srs.search_pipeline(pipes.DOCUMENT_STORE).get_component("context_extractor")
+
+        chunks[3].score, chunks[5].score, chunks[9].score = 0.7, 0.9, 0.8
+        contexts = extractor.run(chunks=[chunks[3], chunks[5], chunks[9]], context_window=2)["contexts"]
+
+        assert contexts == ["a1a2a3a4a5a6a7a8a9"]
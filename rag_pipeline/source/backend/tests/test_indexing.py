@@ -7,11 +7,15 @@ from models.orm.document import DocumentDB
 from pytest import MonkeyPatch
 
 from models.orm.document import DocStatus
-from services.haystack.docs_indexing import (
-    index_doc_with_separator,
+from services.haystack.docs_indexing import index_doc_with_separator
+from haystack import Document
+from services.celery_tasks.helpers.indexing import (
+    diff_chunks,
     filter_documents_with_retry,
+    plan_bulk_indexing,
 )
 from redis import Redis as RedisSync
+from pathlib import Path
 import project_settings as proj_settings
 
 
@@ -62,6 +66,57 @@ class TestSingleFile:
 
         assert progress == "100"
 
+    def test_bulk_upload_sets_status_per_document(self,
+                                                  db_tests: Session,
+                                                  txtfile_with_separator: str,
+                                                  fake_user: User):
+        """Every document of a bulk upload gets its own status and progress."""
+        document_ids = index_doc_with_separator(
+            db_tests,
+            txtfile_with_separator,
+            similarity=0.9,
+            current_user=fake_user,
+        )
+
+        assert len(document_ids) > 1
+
+        redis = RedisSync.from_url(proj_settings.REDIS_URL, decode_responses=True)
+        for document_id in document_ids:
+            document = db_tests.get(DocumentDB, document_id)
+            assert document is not None
+            assert document.status == DocStatus.READY
+            assert redis.get(f"indexing:{document_id}:progress") == "100"
+
+            filters = {"field": "meta.parent_doc_id", "operator": "==", "value": document_id}
+            assert len(filter_documents_with_retry(filters))
+
+    def test_bulk_indexing_failures_end_as_failed(self,
+                                                  db_tests: Session,
+                                                  txtfile_with_separator: str,
+                                                  fake_user: User,
+                                                  monkeypatch: MonkeyPatch):
+        """A failing document task and a broken chord both leave FAILED, not QUEUED."""
+        import services.celery_tasks.indexing_tasks as indexing_tasks
+
+        document_ids = plan_bulk_indexing(db_tests, txtfile_with_separator, 0.9, fake_user.name)
+
+        def broken_reindex(*args: Any, **kwargs: Any):
+            raise RuntimeError("embedder is down")
+
+        monkeypatch.setattr(indexing_tasks, "reindex_document", broken_reindex)
+        assert indexing_tasks.index_document(document_id=document_ids[0]) == DocStatus.FAILED.value
+
+        ready_doc = db_tests.get(DocumentDB, document_ids[0])
+        assert ready_doc is not None
+        ready_doc.status = DocStatus.READY
+        db_tests.commit()
+
+        indexing_tasks.fail_bulk_indexing(document_ids=document_ids)
+
+        db_tests.expire_all()
+        statuses = [db_tests.get(DocumentDB, document_id).status for document_id in document_ids]
+        assert statuses == [DocStatus.READY] + [DocStatus.FAILED] * (len(document_ids) - 1)
+
     def test_read_progress(self,
                            db_tests: Session,
                            client: TestClient,
@@ -175,7 +230,8 @@ class TestSingleFile:
 
         import services.celery_tasks.helpers.indexing as loc
         monkeypatch.setattr(
-            f"{loc.__name__}.pipes.EMBEDDING_PIPELINE.run",
+            loc.pipes.EMBEDDING_PIPELINE.get_component("embedder"),
+            "run",
             crash_split
         )
 
@@ -195,3 +251,80 @@ class TestSingleFile:
 
         chunks = filter_documents_with_retry(filters)
         assert len(chunks) == 0
+
+    def test_small_edit_embeds_only_changed_chunk(
+        self,
+        db_tests: Session,
+        client: TestClient,
+        txtfile_with_separator: str,
+        fake_user: User,
+        hdr_user: dict[str, str],
+        monkeypatch: MonkeyPatch,
+    ):
+        """Editing one word of a long document re-embeds one chunk only."""
+        index_doc_with_separator(
+            db_tests,
+            txtfile_with_separator,
+            similarity=0.9,
+            current_user=fake_user,
+        )
+        document: DocumentDB = db_tests.exec(select(DocumentDB)).first()
+
+        words = Path("tests", "data", "tolstoy.txt").read_text(encoding="utf-8").split()[2000:3000]
+        client.patch(
+            f"/api/v1/documents/update/content/{document.id}/",
+            json={"content": " ".join(words)},
+            headers=hdr_user,
+        )
+
+        filters = {
+            "field": "meta.parent_doc_id",
+            "operator": "==",
+            "value": document.id
+        }
+        chunks_before = filter_documents_with_retry(filters)
+        assert len(chunks_before) > 3
+
+        import services.celery_tasks.helpers.indexing as loc
+        embedded: list[str] = []
+        embedder = loc.pipes.EMBEDDING_PIPELINE.get_component("embedder")
+        original_run = embedder.run
+
+        def counting_run(documents: list, **kwargs: Any):
+            embedded.extend(doc.content for doc in documents)
+            return original_run(documents=documents, **kwargs)
+
+        monkeypatch.setattr(embedder, "run", counting_run)
+
+        words[len(words) // 2] = "ИЗМЕНЕНО"
+        client.patch(
+            f"/api/v1/documents/update/content/{document.id}/",
+            json={"content": " ".join(words)},
+            headers=hdr_user,
+        )
+
+        assert len(embedded) == 1
+        assert "ИЗМЕНЕНО" in embedded[0]
+
+        chunks_after = filter_documents_with_retry(filters)
+        assert len(chunks_after) == len(chunks_before)
+        assert sum("ИЗМЕНЕНО" in (chunk.content or "") for chunk in chunks_after) == 1
+
+    def test_chunk_without_embedding_is_embedded_not_deleted(self):
+        """A stored chunk left without an embedding is embedded again under its ID."""
+        meta = {"parent_doc_id": 1}
+        stored = [
+            Document(id="kept", content="kept", meta=meta, embedding=[0.1, 0.2]),
+            Document(id="broken", content="broken", meta=meta),
+            Document(id="gone", content="gone", meta=meta, embedding=[0.3, 0.4]),
+        ]
+        new = [
+            Document(id="kept", content="kept", meta=meta),
+            Document(id="broken", content="broken", meta=meta),
+        ]
+
+        diff = diff_chunks(stored, new)
+
+        assert diff.unchanged == 1
+        assert [chunk.id for chunk in diff.to_embed] == ["broken"]
+        assert diff.to_delete == ["gone"]
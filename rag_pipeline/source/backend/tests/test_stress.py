@@ -1,9 +1,11 @@
 """Module description."""
 import pytest
 from concurrent.futures import ThreadPoolExecutor
-from time import perf_counter
+from time import perf_counter, sleep
 from uuid import UUID
 import statistics
+import asyncio
+import json
 from contextlib import ExitStack
 
 from fastapi.testclient import TestClient
@@ -15,6 +17,18 @@ from services.celery_tasks.chat_tasks import update_tokens
 from models.orm.tokens import TokenStats
 from conftest import register_required_chat_components
 from services.celery_tasks.helpers.common import celery_db_task
+from services.storage.helpers.async_redis_manager import RedisChatMemoryFastAPI
+from services.storage.helpers.storage_decorators import with_retry
+from services.storage.redis_pools import get_async_redis, get_async_redis_pool_stats
+from redis.exceptions import ConnectionError as RedisConnectionError
+from haystack.dataclasses import ChatMessage
+from services.executors import BoundedExecutor, ExecutorSaturatedError
+from services.chat_session.helpers.lang_detection import detect_language
+from services.celery_tasks.helpers.indexing import RedisIndexingManager, embed_chunks_with_progress
+from haystack_pipelines.helpers.batching import TokenBudgetBatcher
+from haystack import Document
+from aiobreaker import CircuitBreakerError
+from project_settings import LOCAL_LANG_CONFIDENCE
 
 
 @celery_db_task(task_name="test.update_tokens", use_chat_queue=True)
@@ -163,3 +177,261 @@ class TestLocks:
         expected = initial_tokens + 70 * connections
         assert token_stats is not None
         assert token_stats.tokens_spent == expected
+
+
+class TestStorageOverhead:
+    """Test suite for storage decorators overhead."""
+
+    @staticmethod
+    async def best_per_call(call, iterations: int, repeats: int = 5) -> float:
+        """Best of ``repeats`` runs, in seconds per call."""
+        runs = []
+        for _ in range(repeats):
+            start = perf_counter()
+            for _ in range(iterations):
+                await call()
+            runs.append((perf_counter() - start) / iterations)
+        return min(runs)
+
+    @pytest.mark.asyncio
+    async def test_with_retry_overhead(self):
+        """The retry decorator adds well under a Redis round-trip to a call."""
+        async def stub(self: object) -> int:
+            return 1
+
+        decorated = with_retry()(stub)
+
+        raw_latency = await self.best_per_call(lambda: stub(None), 10_000)
+        decorated_latency = await self.best_per_call(lambda: decorated(None), 10_000)
+
+        assert decorated_latency - raw_latency < 5e-6
+
+    @pytest.mark.asyncio
+    async def test_deserialize_message_overhead(self, fake_memory: RedisChatMemoryFastAPI):
+        """Deserializing history costs little more than building the messages."""
+        raw = [
+            fake_memory._serialize_message(ChatMessage.from_user(f"message {i}"))
+            for i in range(200)
+        ]
+
+        async def build_directly():
+            return [ChatMessage.from_user(json.loads(r)["content"]) for r in raw]
+
+        async def deserialize():
+            return [fake_memory._deserialize_message(r) for r in raw]
+
+        raw_latency = await self.best_per_call(build_directly, 50)
+        history_latency = await self.best_per_call(deserialize, 50)
+
+        assert (history_latency - raw_latency) / len(raw) < 5e-6
+
+
+class TestRedisPool:
+    """Test suite for the shared async Redis pool."""
+
+    @pytest.mark.asyncio
+    async def test_pool_is_shared_within_loop_only(self):
+        """Clients of one loop share a pool, another loop gets its own."""
+        async def pool_of_loop():
+            return get_async_redis().connection_pool
+
+        pool = get_async_redis().connection_pool
+        assert get_async_redis().connection_pool is pool
+        assert await asyncio.to_thread(asyncio.run, pool_of_loop()) is not pool
+
+    @pytest.mark.asyncio
+    async def test_saturated_pool_waits_then_fails(self, monkeypatch: pytest.MonkeyPatch):
+        """Calls past ``max_connections`` wait for the pool timeout, not a new socket."""
+        import project_settings as proj_settings
+        monkeypatch.setattr(proj_settings, "REDIS_MAX_CONNECTIONS", 2)
+        monkeypatch.setattr(proj_settings, "REDIS_POOL_TIMEOUT", 0.2)
+
+        blocking = [
+            asyncio.create_task(get_async_redis().blpop(["test:pool:empty"], timeout=1))
+            for _ in range(2)
+        ]
+        await asyncio.sleep(0.1)
+
+        stats = get_async_redis_pool_stats()
+        assert stats is not None
+        assert (stats.in_use, stats.max_connections, stats.saturation_pct) == (2, 2, 100)
+
+        start = perf_counter()
+        with pytest.raises(RedisConnectionError):
+            await get_async_redis().ping()
+        assert perf_counter() - start >= 0.2
+
+        await asyncio.gather(*blocking)
+        stats = get_async_redis_pool_stats()
+        assert stats is not None
+        assert (stats.in_use, stats.peak_in_use) == (0, 2)
+
+
+class TestExecutors:
+    """Test suite for named bounded executors."""
+
+    @pytest.mark.asyncio
+    async def test_slow_pool_does_not_starve_other_pool(self):
+        """A saturated LLM pool leaves DB calls running at full speed."""
+        llm = BoundedExecutor("test-llm", max_workers=2)
+        db = BoundedExecutor("test-db", max_workers=2)
+
+        slow_calls = [asyncio.create_task(llm.run(sleep, 0.5)) for _ in range(6)]
+        await asyncio.sleep(0.05)
+
+        start = perf_counter()
+        await asyncio.gather(*(db.run(sum, [i, 1]) for i in range(10)))
+        db_latency = perf_counter() - start
+
+        assert llm.stats().in_flight == 2
+        assert llm.stats().queued == 4
+        assert db_latency < 0.25
+
+        await asyncio.gather(*slow_calls)
+        assert llm.stats().queued == 0
+        assert llm.stats().peak_queued >= 4
+
+    @pytest.mark.asyncio
+    async def test_admission_control_rejects_when_queue_full(self):
+        """Calls over ``max_queue`` fail fast instead of waiting."""
+        llm = BoundedExecutor("test-llm", max_workers=1, max_queue=2)
+
+        running = [asyncio.create_task(llm.run(sleep, 0.3)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        queued = asyncio.create_task(llm.run(sleep, 0.01))
+        await asyncio.sleep(0)
+
+        with pytest.raises(ExecutorSaturatedError):
+            await llm.run(sleep, 0.01)
+        assert llm.stats().rejected == 1
+
+        await asyncio.gather(*running, queued)
+        assert llm.stats().queued == 0
+        assert llm.stats().in_flight == 0
+
+    def test_stats_endpoint_reports_executors(self, client: TestClient):
+        """Queue depths of the named executors are served on ``/stats``."""
+        response = client.get("/stats")
+
+        assert response.status_code == 200
+        executors = response.json()["executors"]
+        assert [e["name"] for e in executors] == ["llm", "embedding", "db"]
+        assert {"in_flight", "queued", "peak_queued", "rejected"} <= set(executors[0])
+
+
+class TestLangDetection:
+    """Test suite for the local language detection fast path."""
+
+    @pytest.mark.asyncio
+    async def test_dialogue_queries_skip_llm(self,
+                                             txtfile_with_separator: str,
+                                             updated_txtfile_with_separator: str,
+                                             monkeypatch: pytest.MonkeyPatch,
+                                             ):
+        """First messages of the test dialogues are detected without the LLM."""
+        import haystack_pipelines.initializator as pipes
+        from services.chat_session.helpers.common import detect_lang
+
+        class FailingPipeline:
+            def run(self, *args, **kwargs):
+                raise AssertionError("LLM must not be called")
+
+        monkeypatch.setattr(pipes, "LANG_DETECTION_PIPELINE", FailingPipeline())
+
+        long_text = f"{txtfile_with_separator}~~~~~~~~~~{updated_txtfile_with_separator}"
+        queries = [json.loads(txt)["query"] for txt in long_text.split("~~~~~~~~~~")]
+
+        for query in queries:
+            assert await detect_lang([ChatMessage.from_user(query)]) == "Russian"
+
+    def test_local_detection_latency(self):
+        """Paragraphs of a long mixed-language text are mostly settled locally and fast."""
+        with open("tests/data/tolstoy.txt", encoding="utf-8") as f:
+            paragraphs = [line.strip() for line in f if len(line.strip()) > 20]
+
+        start = perf_counter()
+        guesses = [detect_language(paragraph) for paragraph in paragraphs]
+        mean_latency = (perf_counter() - start) / len(paragraphs)
+
+        local = [g for g in guesses if g.lang and g.confidence >= LOCAL_LANG_CONFIDENCE]
+        # French-Russian paragraphs and ones with no Russian-only word go to the LLM.
+        assert len(local) / len(guesses) > 0.75
+        assert {g.lang for g in local} <= {"Russian", "French"}
+        assert mean_latency < 0.002
+
+    @pytest.mark.parametrize("text, lang", [
+        ("Як скинути пароль", None),
+        ("Как да сменя паролата", None),
+        ("Сайн байна уу", None),
+        ("Пароль", None),
+        ("Дякую, як мені змінити пароль?", "Ukrainian"),
+        ("Благодаря, къде мога да сменя паролата си?", "Bulgarian"),
+        ("Спасибо, где можно сменить пароль?", "Russian"),
+    ])
+    def test_cyrillic_needs_evidence(self, text: str, lang: str | None):
+        """Cyrillic text is not taken for Russian unless its words or letters say so."""
+        guess = detect_language(text)
+
+        if lang is None:
+            assert guess.confidence < LOCAL_LANG_CONFIDENCE
+        else:
+            assert guess.lang == lang
+            assert guess.confidence >= LOCAL_LANG_CONFIDENCE
+
+
+class TestConcurrentEmbedding:
+    """Test suite for concurrent embedding batches."""
+
+    @pytest.fixture
+    def fake_embedding_pipeline(self, monkeypatch: pytest.MonkeyPatch):
+        """Embedder with a fixed per-batch latency and a recording writer."""
+        import haystack_pipelines.initializator as pipes
+
+        state: dict = {"written": [], "calls": 0, "fail_at": None}
+
+        def embed(documents: list[Document]):
+            state["calls"] += 1
+            if state["calls"] == state["fail_at"]:
+                raise CircuitBreakerError("Simulated open breaker")
+            sleep(0.05)
+            for doc in documents:
+                doc.embedding = [0.1, 0.2]
+            return {"documents": documents, "meta": {}}
+
+        def write(documents: list[Document]):
+            state["written"].extend(doc.content for doc in documents)
+            return {"documents_written": len(documents)}
+
+        monkeypatch.setattr(pipes.EMBEDDING_PIPELINE.get_component("embedder"), "run", embed)
+        monkeypatch.setattr(pipes.EMBEDDING_PIPELINE.get_component("writer"), "run", write)
+        return state
+
+    def test_batches_in_flight_speed_up_and_keep_order(self, fake_embedding_pipeline: dict):
+        """K batches in flight cut latency while chunks are written in order."""
+        chunks = [Document(content=f"chunk {i}") for i in range(16 * 8)]
+        memory = RedisIndexingManager(999)
+
+        latencies = {}
+        for concurrency in (1, 4):
+            fake_embedding_pipeline["written"].clear()
+            start = perf_counter()
+            assert embed_chunks_with_progress(memory, chunks, 999,
+                                              batcher=TokenBudgetBatcher(max_batch_size=8),
+                                              concurrency=concurrency, annotate=False)
+            latencies[concurrency] = perf_counter() - start
+
+            assert fake_embedding_pipeline["written"] == [c.content for c in chunks]
+            assert memory.redis.get(memory._progress_key) == "100.0"
+
+        assert latencies[4] < latencies[1] / 2
+
+    def test_open_breaker_stops_new_batches(self, fake_embedding_pipeline: dict):
+        """A breaker failure stops the run without sending the remaining batches."""
+        chunks = [Document(content=f"chunk {i}") for i in range(16 * 8)]
+        fake_embedding_pipeline["fail_at"] = 3
+
+        assert not embed_chunks_with_progress(RedisIndexingManager(999), chunks, 999,
+                                              batcher=TokenBudgetBatcher(max_batch_size=8),
+                                              concurrency=4, annotate=False)
+        assert fake_embedding_pipeline["calls"] < 8
+        assert len(fake_embedding_pipeline["written"]) < len(chunks)